@@ -2,16 +2,43 @@
 Celery 应用配置
 """
 
+import orjson
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure
-from app.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
+from celery.signals import (
+    task_prerun,
+    task_postrun,
+    task_failure,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from kombu.serialization import register
+from app.config import (
+    CELERY_BROKER_URL,
+    CELERY_RESULT_BACKEND,
+    MODEL_PATH,
+    WHISPERX_COMPUTE_TYPE,
+    WHISPERX_DEVICE,
+    WHISPERX_MODEL,
+    WHISPERX_PRELOAD,
+    ensure_workspace_dirs,
+)
 from app.core.utils.logger import setup_logger
 from app.services.task_manager import get_task_manager
 from app.core.constants import TaskStatus
+from app.celery.loop import close_loop, get_loop
 
 logger = setup_logger("celery_app")
 task_manager = get_task_manager()
 
+# 注册基于 orjson 的序列化器（任务参数均为 model_dump() 生成的 JSON 兼容字典）
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
+
 # 创建 Celery 应用
 celery_app = Celery(
     "ai_subtitle_learner",
@@ -26,24 +53,28 @@ celery_app.conf.update(
     task_acks_late=True,
     # Worker 预取任务数（防止任务堆积在 Worker 中）
     worker_prefetch_multiplier=1,
-    # 任务序列化
-    task_serializer="pickle",
-    result_serializer="pickle",
-    accept_content=["pickle", "json"],
+    # Worker 子进程启动超时（启动时需要预加载 ASR 模型，默认 4 秒不够）
+    worker_proc_alive_timeout=300,
+    # 任务序列化（orjson 比 pickle 更快更小，且避免反序列化任意对象）
+    task_serializer="orjson",
+    result_serializer="orjson",
+    accept_content=["orjson", "json"],
     # 时区
     timezone="UTC",
     enable_utc=True,
     # 任务重试配置
     task_default_retry_delay=60,  # 默认重试延迟 60 秒
     task_max_retries=3,  # 最大重试次数
-    # 任务超时
-    task_time_limit=3600,  # 任务硬超时 1 小时
-    task_soft_time_limit=3300,  # 任务软超时 55 分钟
-    # 结果过期时间
+    # 任务超时按任务类型在各任务装饰器上单独设置（time_limit/soft_time_limit）
+    # 任务状态由 task_manager 维护，不需要写入结果后端
+    task_ignore_result=True,
+    # 结果过期时间（仅对显式设置 ignore_result=False 的任务生效）
     result_expires=3600,  # 结果保留 1 小时
     # 死信队列配置
     task_reject_on_worker_lost=True,
     task_acks_on_failure_or_timeout=False,
+    # 与 broker 断开时取消正在执行的长任务（acks_late 下任务会被重新投递）
+    worker_cancel_long_running_tasks_on_connection_loss=True,
     # 路由配置
     task_routes={
         "app.celery.tasks.video.*": {"queue": "video"},
@@ -57,6 +88,45 @@ celery_app.conf.update(
 )
 
 
+@worker_process_init.connect
+def worker_process_init_handler(**kwds):
+    """Worker 子进程启动时创建持久事件循环，并预加载 ASR 模型"""
+    ensure_workspace_dirs()
+
+    # 创建进程内共享的事件循环，所有任务复用
+    get_loop()
+
+    if not WHISPERX_PRELOAD:
+        return
+
+    try:
+        from app.core.asr import preload_model
+
+        logger.info(
+            f"[Celery] 预加载 WhisperX 模型: model={WHISPERX_MODEL}, "
+            f"device={WHISPERX_DEVICE}, compute_type={WHISPERX_COMPUTE_TYPE}"
+        )
+        preload_model(
+            model=WHISPERX_MODEL,
+            device=WHISPERX_DEVICE,
+            compute_type=WHISPERX_COMPUTE_TYPE,
+            model_dir=str(MODEL_PATH / "whisperx"),
+        )
+        logger.info("[Celery] WhisperX 模型预加载完成")
+    except Exception as e:
+        # 预加载失败不影响 worker 启动，首个任务会按需加载模型
+        logger.warning(f"[Celery] 预加载 WhisperX 模型失败: {str(e)}", exc_info=True)
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(**kwds):
+    """Worker 子进程退出时关闭事件循环"""
+    try:
+        close_loop()
+    except Exception as e:
+        logger.warning(f"[Celery] 关闭事件循环失败: {str(e)}")
+
+
 @task_prerun.connect
 def task_prerun_handler(
     sender=None, task_id=None, task=None, args=None, kwargs=None, **kwds
@@ -99,14 +169,34 @@ def task_postrun_handler(
 
 @task_failure.connect
 def task_failure_handler(
-    sender=None, task_id=None, exception=None, traceback=None, einfo=None, **kwds
+    sender=None,
+    task_id=None,
+    exception=None,
+    args=None,
+    kwargs=None,
+    traceback=None,
+    einfo=None,
+    **kwds,
 ):
-    """任务失败处理"""
+    """任务失败处理（重试次数用尽后才会触发，重试过程中不会）"""
     logger.error(
         f"[Celery] 任务执行失败: task_id={task_id}, exception={str(exception)}",
         exc_info=einfo,
     )
 
+    # 工作流中的任一步最终失败后 chain 不再继续，取消预先创建的后续任务
+    # （应用任务 ID 是任务的第一个参数，与 Celery 任务 ID 不同）
+    app_task_id = args[0] if args else (kwargs or {}).get("task_id")
+    if isinstance(app_task_id, str):
+        try:
+            task_manager.cancel_pending_workflow_tasks(
+                app_task_id, f"前置任务失败，任务已取消: {str(exception)}"
+            )
+        except Exception as e:
+            logger.warning(
+                f"[Celery] 在 failure 中取消后续任务失败: {str(e)}", exc_info=True
+            )
+
     # 尝试从任务参数中提取应用任务 ID 并更新状态为失败
     try:
         if isinstance(task_id, str) and len(task_id) > 10:
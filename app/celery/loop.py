@@ -0,0 +1,70 @@
+"""
+Celery worker 进程内的持久事件循环
+"""
+
+import asyncio
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 每个 worker 进程共享一个事件循环，所有任务复用
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """获取当前进程的事件循环（不存在或已关闭时创建）"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """在当前进程的事件循环中运行协程，结束后取消并回收遗留的任务
+
+    事件循环在任务之间复用：协程失败或超时（SoftTimeLimitExceeded）时，
+    gather 中尚未完成的兄弟协程仍挂在循环上，不清理的话会在下一个任务的
+    run_until_complete 中继续执行。这里与 asyncio.run 一样在结束时全部取消。
+    """
+    loop = get_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        _cancel_all_tasks(loop)
+
+
+def _cancel_all_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """取消循环上所有未完成的任务并等待其结束（同 asyncio.runners）"""
+    to_cancel = asyncio.all_tasks(loop)
+    if not to_cancel:
+        return
+
+    for task in to_cancel:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*to_cancel, return_exceptions=True))
+
+    for task in to_cancel:
+        if task.cancelled():
+            continue
+        if task.exception() is not None:
+            loop.call_exception_handler(
+                {
+                    "message": "unhandled exception during worker task shutdown",
+                    "exception": task.exception(),
+                    "task": task,
+                }
+            )
+
+
+def close_loop() -> None:
+    """关闭当前进程的事件循环（worker 进程退出时调用）"""
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        try:
+            _cancel_all_tasks(_loop)
+            _loop.run_until_complete(_loop.shutdown_asyncgens())
+            _loop.run_until_complete(_loop.shutdown_default_executor())
+        finally:
+            _loop.close()
+    _loop = None
@@ -10,7 +10,7 @@ from pathlib import Path
 from app.schemas.subtitle import SubtitleRequest
 from app.services.task_manager import get_task_manager
 from app.core.asr.asr_data import ASRData
-from app.core.constants import TaskStatus
+from app.core.constants import RelationType, TaskStatus
 from app.core.entities import (
     SubtitleConfig as CoreSubtitleConfig,
     SubtitleLayoutEnum,
@@ -193,7 +193,7 @@ class SubtitleService:
         """
         # 1. 尝试从关联的转录任务获取文件路径
         transcribe_task_id = self.task_manager.get_task_relation(
-            task_id, "transcribe_task_id"
+            task_id, RelationType.TRANSCRIBE
         )
         if transcribe_task_id:
             transcribe_task = self.task_manager.get_task(transcribe_task_id)
@@ -3,34 +3,88 @@
 """
 
 import asyncio
-import tempfile
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
-from app.schemas.transcribe import TranscribeRequest
+from minio.datatypes import Object
+
+from app.config import CACHE_PATH, get_settings
+from app.schemas.transcribe import (
+    TranscribeModel,
+    TranscribeOutputFormat,
+    TranscribeRequest,
+)
 from app.services.task_manager import get_task_manager
 from app.core.asr import transcribe
 from app.core.entities import TranscribeConfig as CoreTranscribeConfig
-from app.core.constants import TaskStatus
+from app.core.constants import RelationType, TaskStatus
 from app.core.utils.logger import setup_logger
 from app.core.entities import (
     TranscribeModelEnum,
     TranscribeOutputFormatEnum,
+    WhisperXConfig,
 )
-from app.core.storage import get_storage
+from app.core.storage import MinIOStorage, get_storage
 
 task_manager = get_task_manager()
 logger = setup_logger("transcribe_service")
 
+# API 枚举到 core 枚举的映射（导入时解析一次）
+_MODEL_MAP: dict[TranscribeModel, TranscribeModelEnum] = {
+    model: TranscribeModelEnum[model.value.upper()] for model in TranscribeModel
+}
+_OUTPUT_FORMAT_MAP: dict[TranscribeOutputFormat, TranscribeOutputFormatEnum] = {
+    fmt: TranscribeOutputFormatEnum[fmt.value.upper()]
+    for fmt in TranscribeOutputFormat
+}
+
+# 转录进度写入节流：进度变化至少 2%，或距上次写入至少 0.5 秒
+PROGRESS_MIN_STEP = 2
+PROGRESS_MIN_INTERVAL = 0.5
+# 转录阶段的最终进度，达到时总是写入
+PROGRESS_FLUSH_AT = 90
+
+# 下载/上传等 I/O 操作使用的线程数
+IO_POOL_WORKERS = 8
+
+# 从 MinIO 下载的音频缓存目录：按对象 ETag 命名，任务重试时直接复用，转录成功后删除
+AUDIO_CACHE_DIR = CACHE_PATH / "audio"
+
+
+def _looks_like_minio(path: str) -> bool:
+    """判断路径是否可能是 MinIO 对象名称
+
+    对象名称不是绝对路径，也不以 ./ 或 ../ 开头；明显的本地路径无需请求 MinIO。
+    """
+    return not os.path.isabs(path) and not path.startswith(("./", "../"))
+
 
 class TranscribeService:
     """转录服务"""
 
     def __init__(self):
         self.task_manager = task_manager
+        # MinIO 对象元数据缓存（任务级别，避免同一任务内重复 HEAD 请求）
+        self._stat_cache: dict[str, Optional[Object]] = {}
+        # 每个任务最近一次写入的进度和时间（monotonic），用于节流进度更新
+        self._last_progress: dict[str, tuple[int, float]] = {}
+        # 分块并发转录时多个线程同时回调进度，串行化节流判断和写入
+        self._progress_lock = threading.Lock()
+        # 独立的 I/O 线程池，避免与转录使用的默认线程池相互阻塞
+        # （线程按需创建，fork 前实例化不会带入子进程）
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=IO_POOL_WORKERS, thread_name_prefix="transcribe-io"
+        )
 
     async def process_transcribe_task(self, task_id: str, request: TranscribeRequest):
         """处理转录任务"""
         logger.info(f"[任务 {task_id}] 开始处理转录任务")
+        self._stat_cache.clear()
 
         try:
             # 1. 更新任务状态为 running
@@ -43,7 +97,7 @@ class TranscribeService:
             core_config = self._prepare_config(task_id, request.config)
 
             # 4. 准备音频文件路径
-            audio_path = self._prepare_audio_path(task_id, file_path)
+            audio_path = await self._prepare_audio_path(task_id, file_path)
 
             # 5. 执行转录
             asr_data = await self._execute_transcribe(task_id, audio_path, core_config)
@@ -53,6 +107,10 @@ class TranscribeService:
                 task_id, file_path, asr_data, request.output_path
             )
 
+            # 转录成功，删除从 MinIO 下载的音频缓存（失败时保留供重试复用）
+            if audio_path != str(file_path):
+                Path(audio_path).unlink(missing_ok=True)
+
             # 7. 更新任务状态为 completed
             self._update_task_completed(task_id, output_path)
 
@@ -62,6 +120,27 @@ class TranscribeService:
             self._handle_error(task_id, e)
             # 重新抛出异常，让 Celery 知道任务失败
             raise
+        finally:
+            self._stat_cache.clear()
+            self._last_progress.pop(task_id, None)
+
+    @functools.cached_property
+    def storage(self) -> MinIOStorage:
+        """MinIO 存储实例（首次使用时解析，避免在导入/fork 前创建客户端）"""
+        return get_storage()
+
+    async def _run_io(self, func, *args, **kwargs):
+        """在 I/O 线程池中执行阻塞函数"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_pool, functools.partial(func, *args, **kwargs)
+        )
+
+    def _stat(self, path: str) -> Optional[Object]:
+        """获取 MinIO 对象元数据（同一任务内只请求一次），不存在时返回 None"""
+        if path not in self._stat_cache:
+            self._stat_cache[path] = self.storage.stat_file(path)
+        return self._stat_cache[path]
 
     def _update_task_running(self, task_id: str) -> None:
         """更新任务状态为 running"""
@@ -76,7 +155,7 @@ class TranscribeService:
         从关联的视频任务的 output_path 获取文件路径
         """
         # 从关联的视频任务获取文件路径
-        video_task_id = self.task_manager.get_task_relation(task_id, "video_task_id")
+        video_task_id = self.task_manager.get_task_relation(task_id, RelationType.VIDEO)
         if video_task_id:
             video_task = self.task_manager.get_task(video_task_id)
             if video_task and video_task.output_path:
@@ -111,12 +190,12 @@ class TranscribeService:
         if file_path.exists():
             return True
 
-        # 再检查是否是 MinIO 对象
-        storage = get_storage()
-        if storage.file_exists(file_path_str):
-            return True
+        # 明显是本地路径时不再请求 MinIO
+        if not _looks_like_minio(file_path_str):
+            return False
 
-        return False
+        # 再检查是否是 MinIO 对象
+        return self._stat(file_path_str) is not None
 
     def _prepare_config(self, task_id: str, config) -> CoreTranscribeConfig:
         """准备并转换配置"""
@@ -133,26 +212,33 @@ class TranscribeService:
         )
         return core_config
 
-    def _prepare_audio_path(self, task_id: str, file_path: Path) -> str:
+    async def _prepare_audio_path(self, task_id: str, file_path: Path) -> str:
         """准备音频文件路径
 
-        如果文件路径是 MinIO 对象名称，则下载到临时文件
-        否则直接使用本地文件路径
+        如果文件路径是 MinIO 对象名称，则流式下载到按 ETag 命名的缓存文件
+        （在线程池中执行），缓存文件已存在时直接复用；否则直接使用本地文件路径
         """
         file_path_str = str(file_path)
 
-        # 检查是否是 MinIO 对象（通过检查文件是否存在来判断）
-        storage = get_storage()
-        if storage.file_exists(file_path_str):
-            # 是 MinIO 对象，下载到临时文件
+        # 检查是否是 MinIO 对象（复用验证阶段获取的元数据）
+        stat = self._stat(file_path_str) if _looks_like_minio(file_path_str) else None
+        if stat is not None:
+            suffix = os.path.splitext(file_path_str)[1]
+            etag = stat.etag.strip('"')
+            local_path = AUDIO_CACHE_DIR / f"{etag}{suffix}"
+            if local_path.exists() and local_path.stat().st_size == stat.size:
+                logger.info(f"[任务 {task_id}] 复用已下载的音频文件: {local_path}")
+                return str(local_path)
+
+            # 是 MinIO 对象，先写入 .part 文件，下载完成后再重命名
             logger.info(f"[任务 {task_id}] 从 MinIO 下载音频文件: {file_path_str}")
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=Path(file_path_str).suffix
-            ) as tmp_file:
-                tmp_path = tmp_file.name
-            storage.download_file(file_path_str, tmp_path)
-            logger.info(f"[任务 {task_id}] 音频文件已下载到临时文件: {tmp_path}")
-            return tmp_path
+            AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            part_path = local_path.with_name(local_path.name + ".part")
+            with open(part_path, "wb") as f:
+                await self._run_io(self.storage.download_to_fileobj, file_path_str, f)
+            os.replace(part_path, local_path)
+            logger.info(f"[任务 {task_id}] 音频文件已下载到: {local_path}")
+            return str(local_path)
         else:
             # 是本地文件路径
             audio_path = file_path_str
@@ -206,15 +292,17 @@ class TranscribeService:
         self, task_id: str, file_path: Path, asr_data, output_path: str | None
     ) -> str:
         """保存字幕文件到 MinIO"""
-        output_path = output_path or str(file_path.parent / f"{file_path.stem}.srt")
+        if not output_path:
+            root, _ = os.path.splitext(str(file_path))
+            output_path = f"{root}.srt"
         logger.info(f"[任务 {task_id}] 保存字幕文件到 MinIO: {output_path}")
 
         # 保存到 MinIO（save 方法内部会处理）
-        final_path = await asyncio.to_thread(asr_data.save, output_path, use_minio=True)
+        final_path = await self._run_io(asr_data.save, output_path, use_minio=True)
 
-        # 验证文件是否保存成功（检查 MinIO）
-        storage = get_storage()
-        if storage.file_exists(final_path):
+        # 验证文件是否保存成功（检查 MinIO，上传后需丢弃旧的元数据）
+        self._stat_cache.pop(final_path, None)
+        if self._stat(final_path) is not None:
             logger.info(f"[任务 {task_id}] 字幕文件保存成功到 MinIO: {final_path}")
         else:
             logger.warning(
@@ -250,24 +338,41 @@ class TranscribeService:
     def _convert_config(self, config) -> CoreTranscribeConfig:
         """转换配置格式"""
         # 这里需要将 API 的配置转换为 core 模块的配置格式
-        # 由于 core 模块使用的是枚举类型，需要进行映射
+        # 由于 core 模块使用的是枚举类型，通过预先构建的映射表转换
+        device = config.whisperx_device or "cpu"  # 默认使用 CPU
+        # 未指定计算类型时按设备选择：CPU 使用配置的默认值（int8），GPU 使用 float16
+        compute_type = config.whisperx_compute_type or (
+            get_settings().whisperx_compute_type if device == "cpu" else "float16"
+        )
 
         return CoreTranscribeConfig(
-            transcribe_model=TranscribeModelEnum[config.transcribe_model.value.upper()],
+            transcribe_model=_MODEL_MAP[config.transcribe_model],
             transcribe_language=config.transcribe_language,
             need_word_time_stamp=config.need_word_time_stamp,
-            output_format=TranscribeOutputFormatEnum[
-                config.output_format.value.upper()
-            ],
-            whisperx_model=config.whisperx_model,
-            whisperx_device=config.whisperx_device or "cpu",  # 默认使用 CPU
-            whisperx_compute_type=config.whisperx_compute_type
-            or "float32",  # CPU 默认 float32
-            whisperx_batch_size=config.whisperx_batch_size,
+            output_format=_OUTPUT_FORMAT_MAP[config.output_format],
+            whisperx=WhisperXConfig(
+                model=config.whisperx_model,
+                device=device,
+                compute_type=compute_type,
+                batch_size=config.whisperx_batch_size,
+            ),
         )
 
     def _progress_callback(self, task_id: str, value: float, message: str):
-        """转录进度回调函数"""
+        """转录进度回调函数（可在多个线程中并发调用，写入的进度只增不减）"""
         progress = 10 + int(value * 0.8)  # 调整进度范围：10% - 90%
-        self.task_manager.update_task(task_id, progress=progress, message=message)
-        logger.debug(f"[任务 {task_id}] 转录进度: {progress}% - {message}")
+        with self._progress_lock:
+            now = time.monotonic()
+            last_progress, last_time = self._last_progress.get(task_id, (-1, 0.0))
+            # 并发的分块会报告相互重叠的进度，只取最大值
+            progress = max(progress, last_progress)
+            if (
+                progress < PROGRESS_FLUSH_AT
+                and progress - last_progress < PROGRESS_MIN_STEP
+                and now - last_time < PROGRESS_MIN_INTERVAL
+            ):
+                return
+
+            self._last_progress[task_id] = (progress, now)
+            self.task_manager.update_task(task_id, progress=progress, message=message)
+        logger.debug("[任务 {}] 转录进度: {}% - {}", task_id, progress, message)
@@ -12,8 +12,6 @@ import yt_dlp
 
 from app.config import settings
 from app.services.task_manager import get_task_manager
-from app.celery.tasks.transcribe_tasks import transcribe_task
-from app.schemas.transcribe import TranscribeRequest, TranscribeConfig, TranscribeModel
 from app.core.constants import TaskStatus
 from app.core.utils.logger import setup_logger
 from app.core.storage import get_storage
@@ -241,83 +239,8 @@ class VideoDownloadService:
                 output_path=minio_path,  # 存储 MinIO 路径
             )
 
-            # 使用 WhisperX 进行转录，获取精准时间戳
-            # 只有转录任务完成，音频下载任务才算完成
-            if video_file_path and Path(video_file_path).exists():
-                try:
-                    logger.info(
-                        f"[任务 {task_id}] 开始使用 WhisperX 进行转录，获取精准时间戳"
-                    )
-
-                    # 创建转录任务
-                    transcribe_task_id = self.task_manager.create_task(
-                        task_type="transcribe",
-                    )
-
-                    # 批量绑定关联关系：音频下载任务 -> 转录任务
-                    self.task_manager.set_task_relations(
-                        task_id,
-                        {
-                            "transcribe_task_id": transcribe_task_id,
-                        },
-                    )
-                    # 转录任务 -> 音频下载任务（反向关联）
-                    self.task_manager.set_task_relations(
-                        transcribe_task_id,
-                        {
-                            "video_task_id": task_id,
-                        },
-                    )
-
-                    logger.info(
-                        f"[任务 {task_id}] 创建转录任务关联: "
-                        f"video_task_id={task_id}, transcribe_task_id={transcribe_task_id}"
-                    )
-
-                    # 更新音频下载任务消息
-                    self.task_manager.update_task(
-                        task_id,
-                        message="Audio download completed, waiting for transcription...",
-                    )
-
-                    # 创建转录请求，使用 WhisperX（默认使用 CPU）
-                    transcribe_config = TranscribeConfig(
-                        transcribe_model=TranscribeModel.WHISPERX,
-                        transcribe_language="auto",
-                        need_word_time_stamp=True,  # WhisperX 总是提供词级时间戳
-                        whisperx_model="large-v3",
-                        whisperx_device="cpu",  # 默认使用 CPU
-                        whisperx_compute_type="float32",  # CPU 使用 float32
-                        whisperx_batch_size=16,
-                    )
-
-                    transcribe_request = TranscribeRequest(
-                        output_path=None,  # 自动生成输出路径（MinIO 路径）
-                        config=transcribe_config,
-                    )
-
-                    # 发送 Celery 任务到队列
-                    transcribe_task.delay(
-                        transcribe_task_id,
-                        transcribe_request.model_dump(),  # 转换为字典
-                    )
-
-                    logger.info(
-                        f"[任务 {task_id}] WhisperX 转录任务已发送到 Celery 队列: {transcribe_task_id}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"[任务 {task_id}] 创建 WhisperX 转录任务失败: {str(e)}",
-                        exc_info=True,
-                    )
-                    # 转录任务创建失败，标记音频下载任务为失败
-                    self.task_manager.update_task(
-                        task_id,
-                        status=TaskStatus.FAILED,
-                        error=f"Failed to create transcription task: {str(e)}",
-                        message="Audio download completed, but failed to create transcription task",
-                    )
-            else:
+            # 转录和字幕处理由 Celery chain 在本任务成功后自动投递
+            if not (video_file_path and Path(video_file_path).exists()):
                 # 音频文件不存在，标记为失败
                 self.task_manager.update_task(
                     task_id,
@@ -2,19 +2,23 @@
 字幕处理相关 Celery 任务
 """
 
-import asyncio
+from pydantic import TypeAdapter
 
 from app.celery import celery_app
+from app.celery.loop import run
 from app.celery.services.subtitle_service import SubtitleService
 from app.services.task_manager import get_task_manager
 from app.schemas.subtitle import SubtitleRequest
-from app.core.constants import TaskStatus
+from app.core.constants import RelationType, TaskStatus
 from app.core.utils.logger import setup_logger
 
 logger = setup_logger("subtitle_tasks")
 task_manager = get_task_manager()
 subtitle_service = SubtitleService()
 
+# 预先构建 SubtitleRequest 校验器，每次任务复用
+_SUBTITLE_TA = TypeAdapter(SubtitleRequest)
+
 
 @celery_app.task(
     name="app.celery.tasks.subtitle.process",
@@ -25,6 +29,8 @@ subtitle_service = SubtitleService()
     retry_backoff=True,
     retry_backoff_max=600,
     retry_jitter=True,
+    time_limit=1800,  # 硬超时 30 分钟
+    soft_time_limit=1700,
 )
 def subtitle_task(self, task_id: str, request_dict: dict):
     """字幕处理任务（Celery 任务）
@@ -37,22 +43,15 @@ def subtitle_task(self, task_id: str, request_dict: dict):
         logger.info(f"[Celery Task] 开始执行字幕处理任务: task_id={task_id}")
 
         # 从字典重建 SubtitleRequest 对象
-        request = SubtitleRequest(**request_dict)
+        request = _SUBTITLE_TA.validate_python(request_dict)
 
-        # 在事件循环中运行异步函数
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(
-                subtitle_service.process_subtitle_task(task_id, request)
-            )
-        finally:
-            loop.close()
+        # 在 worker 进程共享的事件循环中运行异步函数（结束后清理遗留的协程）
+        run(subtitle_service.process_subtitle_task(task_id, request))
 
         logger.info(f"[Celery Task] 字幕处理任务完成: task_id={task_id}")
 
         # 字幕任务完成后，更新视频任务状态
-        video_task_id = task_manager.get_task_relation(task_id, "video_task_id")
+        video_task_id = task_manager.get_task_relation(task_id, RelationType.VIDEO)
         if video_task_id:
             subtitle_task_obj = task_manager.get_task(task_id)
             if subtitle_task_obj and subtitle_task_obj.status == TaskStatus.COMPLETED:
@@ -2,10 +2,12 @@
 视频下载相关 Celery 任务
 """
 
-import asyncio
 from pathlib import Path
 
+from celery.exceptions import Ignore
+
 from app.celery import celery_app
+from app.celery.loop import run
 from app.celery.services.video_download_service import VideoDownloadService
 from app.services.task_manager import get_task_manager
 from app.core.constants import TaskStatus
@@ -25,6 +27,8 @@ video_download_service = VideoDownloadService()
     retry_backoff=True,
     retry_backoff_max=600,
     retry_jitter=True,
+    time_limit=600,  # 硬超时 10 分钟
+    soft_time_limit=540,
 )
 def download_audio_task(self, task_id: str, url: str, work_dir: str = None):
     """下载音频任务（Celery 任务）
@@ -37,15 +41,8 @@ def download_audio_task(self, task_id: str, url: str, work_dir: str = None):
     try:
         logger.info(f"[Celery Task] 开始执行下载音频任务: task_id={task_id}, url={url}")
 
-        # 在事件循环中运行异步函数
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(
-                video_download_service.download_audio_task(task_id, url, work_dir)
-            )
-        finally:
-            loop.close()
+        # 在 worker 进程共享的事件循环中运行异步函数（结束后清理遗留的协程）
+        run(video_download_service.download_audio_task(task_id, url, work_dir))
 
         logger.info(f"[Celery Task] 下载音频任务完成: task_id={task_id}")
     except Exception as e:
@@ -69,3 +66,18 @@ def download_audio_task(self, task_id: str, url: str, work_dir: str = None):
         # 重新抛出异常以触发重试
         raise
 
+    # 下载失败时服务层只标记任务状态，这里终止 chain，不再投递转录/字幕任务
+    video_task = task_manager.get_task(task_id)
+    if video_task and video_task.status == TaskStatus.FAILED:
+        logger.warning(f"[Celery Task] 下载音频任务失败，终止后续任务: task_id={task_id}")
+        # Ignore 不会触发 task_failure 信号，这里直接取消预先创建的后续任务
+        try:
+            task_manager.cancel_pending_workflow_tasks(
+                task_id, f"下载音频失败，任务已取消: {video_task.error or '未知错误'}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[Celery Task] 取消后续任务失败: task_id={task_id}, error={str(e)}",
+                exc_info=True,
+            )
+        raise Ignore()
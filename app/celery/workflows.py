@@ -0,0 +1,85 @@
+"""
+Celery 任务编排：视频分析（下载音频 -> 转录 -> 字幕处理）
+"""
+
+from celery import chain
+
+from app.config import WHISPERX_COMPUTE_TYPE, WHISPERX_DEVICE, WHISPERX_MODEL
+from app.celery.tasks.subtitle_tasks import subtitle_task
+from app.celery.tasks.transcribe_tasks import transcribe_task
+from app.celery.tasks.video_tasks import download_audio_task
+from app.schemas.subtitle import SubtitleConfig, SubtitleRequest
+from app.schemas.transcribe import TranscribeConfig, TranscribeModel, TranscribeRequest
+from app.services.task_manager import get_task_manager
+from app.core.constants import RelationType, TaskType
+from app.core.utils.logger import setup_logger
+
+logger = setup_logger("workflows")
+task_manager = get_task_manager()
+
+
+def start_analyze_workflow(task_id: str, url: str) -> None:
+    """启动视频分析流程
+
+    预先创建转录任务和字幕任务并建立关联关系，然后以 Celery chain 串联
+    三个任务：上一步成功后由 Celery 直接投递下一步，任务内部不再查询
+    关联关系并手动派发；任一步失败则后续任务不会执行。
+
+    Args:
+        task_id: 视频（音频下载）任务ID
+        url: 视频URL
+    """
+    transcribe_task_id = task_manager.create_task(task_type=TaskType.TRANSCRIBE)
+    subtitle_task_id = task_manager.create_task(task_type=TaskType.SUBTITLE)
+
+    task_manager.set_task_relations(
+        task_id,
+        {
+            RelationType.TRANSCRIBE: transcribe_task_id,
+            RelationType.SUBTITLE: subtitle_task_id,
+        },
+    )
+    task_manager.set_task_relations(transcribe_task_id, {RelationType.VIDEO: task_id})
+    task_manager.set_task_relations(
+        subtitle_task_id,
+        {
+            RelationType.VIDEO: task_id,
+            RelationType.TRANSCRIBE: transcribe_task_id,
+        },
+    )
+
+    # 转录请求，使用 WhisperX（与 worker 预加载的模型配置一致）
+    transcribe_request = TranscribeRequest(
+        output_path=None,  # 自动生成输出路径（MinIO 路径）
+        config=TranscribeConfig(
+            transcribe_model=TranscribeModel.WHISPERX,
+            transcribe_language="auto",
+            need_word_time_stamp=True,  # WhisperX 总是提供词级时间戳
+            whisperx_model=WHISPERX_MODEL,
+            whisperx_device=WHISPERX_DEVICE,
+            whisperx_compute_type=WHISPERX_COMPUTE_TYPE,
+            whisperx_batch_size=16,
+        ),
+    )
+
+    # 字幕处理请求（默认启用优化、翻译和分割）
+    subtitle_request = SubtitleRequest(
+        output_path=None,  # 自动生成输出路径（MinIO 路径）
+        config=SubtitleConfig(
+            need_optimize=True,
+            need_translate=True,
+            need_split=True,
+        ),
+    )
+
+    # 使用不可变签名（si），上一步的返回值不会传给下一步
+    chain(
+        download_audio_task.si(task_id, url, None),
+        transcribe_task.si(transcribe_task_id, transcribe_request.model_dump()),
+        subtitle_task.si(subtitle_task_id, subtitle_request.model_dump()),
+    ).apply_async()
+
+    logger.info(
+        f"[任务 {task_id}] 视频分析流程已发送到 Celery 队列: "
+        f"transcribe_task_id={transcribe_task_id}, subtitle_task_id={subtitle_task_id}"
+    )
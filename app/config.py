@@ -2,22 +2,71 @@
 应用配置模块
 """
 
+import dataclasses
+import functools
 import os
 from pathlib import Path
-from typing import Optional
-
-from pydantic import ConfigDict
-from pydantic_settings import BaseSettings
-
-
-class Settings(BaseSettings):
-    """应用配置"""
-
-    model_config = ConfigDict(
-        env_file=".env",
-        case_sensitive=False,
-        extra="ignore",  # 忽略未定义的额外字段
-    )
+from typing import Any, Callable, Dict, Optional
+
+# 布尔配置项可接受的取值（与 pydantic 的布尔解析一致，不区分大小写）
+_TRUE_VALUES = frozenset(("1", "true", "t", "yes", "y", "on"))
+_FALSE_VALUES = frozenset(("0", "false", "f", "no", "n", "off"))
+
+
+def _parse_bool(value: str) -> bool:
+    """解析布尔类型的环境变量"""
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"无效的布尔值: {value!r}")
+
+
+# 字段类型 -> 字符串转换函数（未列出的类型按字符串处理）
+_CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    bool: _parse_bool,
+    int: int,
+    Path: Path,
+}
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """读取 .env 文件（键名统一转小写），文件不存在时返回空字典
+
+    只支持 KEY=VALUE 形式：忽略空行和 # 注释，支持 export 前缀和引号包裹的值。
+    """
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+
+    values: Dict[str, str] = {}
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
+            value = value[1:-1]
+        else:
+            # 去掉行尾注释
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip().lower()] = value
+    return values
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Settings:
+    """应用配置
+
+    读取顺序：环境变量 -> .env 文件 -> 字段默认值，环境变量名不区分大小写。
+    """
 
     # 基础配置
     log_level: str = "INFO"
@@ -54,70 +103,104 @@ class Settings(BaseSettings):
     minio_secure: bool = False
     minio_bucket_name: str = "subtitle-files"
 
+    # WhisperX 配置（worker 启动时预加载的模型）
+    whisperx_preload: bool = True
+    whisperx_model: str = "large-v3"
+    whisperx_device: str = "cpu"
+    # CPU 默认 int8，设为 float32 可得到与未量化模型一致的结果
+    whisperx_compute_type: str = "int8"
+
     # 字幕配置（从环境变量读取）
     max_word_count_cjk: int = 25
     max_word_count_english: int = 20
 
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """从环境变量和 .env 文件构建配置（环境变量优先）"""
+        env = _read_env_file(env_file)
+        env.update((key.lower(), value) for key, value in os.environ.items())
+
+        values: Dict[str, Any] = {}
+        for field in dataclasses.fields(cls):
+            raw = env.get(field.name)
+            if raw is None:
+                continue
+            convert = _CONVERTERS.get(field.type, str)
+            try:
+                values[field.name] = convert(raw)
+            except ValueError as e:
+                raise ValueError(f"配置项 {field.name.upper()} 的值无效: {raw!r}") from e
+        return cls(**values)
 
-settings = Settings()
 
-# 确保目录存在
-settings.work_dir.mkdir(parents=True, exist_ok=True)
-settings.model_dir.mkdir(parents=True, exist_ok=True)
-settings.log_dir.mkdir(parents=True, exist_ok=True)
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """获取全局 Settings 实例（首次访问时才读取环境变量和 .env）"""
+    return Settings.from_env()
 
-# 导出路径常量（供 core 模块使用）
-CACHE_PATH = settings.work_dir / "cache"
-LOG_PATH = settings.log_dir
-MODEL_PATH = settings.model_dir
+
+# 静态路径常量（不依赖 Settings）
 RESOURCE_PATH = Path("./resources")  # 资源文件路径
 ASSETS_PATH = RESOURCE_PATH / "assets"  # 资源文件路径
 SUBTITLE_STYLE_PATH = Path("./resources/subtitle_styles")  # 字幕样式路径
 
-# 确保缓存目录存在
-CACHE_PATH.mkdir(parents=True, exist_ok=True)
-RESOURCE_PATH.mkdir(parents=True, exist_ok=True)
-ASSETS_PATH.mkdir(parents=True, exist_ok=True)
-SUBTITLE_STYLE_PATH.mkdir(parents=True, exist_ok=True)
-
-# 日志级别（供 core 模块使用）
-LOG_LEVEL = settings.log_level
-
-# LLM API 配置（从环境变量读取，优先使用新名称，兼容旧名称）
-LLM_API_BASE = (
-    settings.llm_api_base
-    or settings.openai_api_base
-    or os.getenv("LLM_API_BASE")
-    or os.getenv("OPENAI_API_BASE")
-)
-LLM_API_KEY = (
-    settings.llm_api_key
-    or settings.openai_api_key
-    or os.getenv("LLM_API_KEY")
-    or os.getenv("OPENAI_API_KEY")
-)
-LLM_MODEL = (
-    settings.llm_model
-    or settings.openai_model
-    or os.getenv("LLM_MODEL")
-    or os.getenv("OPENAI_MODEL")
-)
-
-# 数据库配置
-DATABASE_URL = os.getenv("DATABASE_URL", settings.database_url)
-
-# Redis 配置
-REDIS_URL = os.getenv("REDIS_URL", settings.redis_url)
-
-# Celery 配置
-CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", settings.celery_broker_url)
-CELERY_RESULT_BACKEND = os.getenv(
-    "CELERY_RESULT_BACKEND", settings.celery_result_backend
-)
-
-# MinIO 配置
-MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", settings.minio_endpoint)
-MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", settings.minio_access_key)
-MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", settings.minio_secret_key)
-MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() == "true"
-MINIO_BUCKET_NAME = os.getenv("MINIO_BUCKET_NAME", settings.minio_bucket_name)
+# 依赖 Settings 的模块属性：首次访问时解析，并缓存到模块命名空间
+# （Settings 已读取环境变量和 .env，无需再调用 os.getenv）
+_LAZY_ATTRS: dict[str, Callable[[Settings], Any]] = {
+    "settings": lambda s: s,
+    # 路径常量（供 core 模块使用）
+    "CACHE_PATH": lambda s: s.work_dir / "cache",
+    "LOG_PATH": lambda s: s.log_dir,
+    "MODEL_PATH": lambda s: s.model_dir,
+    # 日志级别（供 core 模块使用）
+    "LOG_LEVEL": lambda s: s.log_level,
+    # LLM API 配置（优先使用新名称，兼容旧名称）
+    "LLM_API_BASE": lambda s: s.llm_api_base or s.openai_api_base,
+    "LLM_API_KEY": lambda s: s.llm_api_key or s.openai_api_key,
+    "LLM_MODEL": lambda s: s.llm_model or s.openai_model,
+    # 数据库 / Redis / Celery 配置
+    "DATABASE_URL": lambda s: s.database_url,
+    "REDIS_URL": lambda s: s.redis_url,
+    "CELERY_BROKER_URL": lambda s: s.celery_broker_url,
+    "CELERY_RESULT_BACKEND": lambda s: s.celery_result_backend,
+    # MinIO 配置
+    "MINIO_ENDPOINT": lambda s: s.minio_endpoint,
+    "MINIO_ACCESS_KEY": lambda s: s.minio_access_key,
+    "MINIO_SECRET_KEY": lambda s: s.minio_secret_key,
+    "MINIO_SECURE": lambda s: s.minio_secure,
+    "MINIO_BUCKET_NAME": lambda s: s.minio_bucket_name,
+    # WhisperX 配置
+    "WHISPERX_PRELOAD": lambda s: s.whisperx_preload,
+    "WHISPERX_MODEL": lambda s: s.whisperx_model,
+    "WHISPERX_DEVICE": lambda s: s.whisperx_device,
+    "WHISPERX_COMPUTE_TYPE": lambda s: s.whisperx_compute_type,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """PEP 562：延迟解析依赖 Settings 的模块属性，解析后写回模块命名空间"""
+    factory = _LAZY_ATTRS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = factory(get_settings())
+    globals()[name] = value
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_workspace_dirs() -> None:
+    """确保工作目录存在（每个进程只执行一次）
+
+    不在导入时创建，由 API 启动和 Celery worker 进程初始化时调用。
+    """
+    s = get_settings()
+    for path in (
+        s.work_dir,
+        s.model_dir,
+        s.log_dir,
+        __getattr__("CACHE_PATH"),
+        RESOURCE_PATH,
+        ASSETS_PATH,
+        SUBTITLE_STYLE_PATH,
+    ):
+        path.mkdir(parents=True, exist_ok=True)
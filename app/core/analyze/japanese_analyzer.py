@@ -4,15 +4,15 @@
 """
 
 import asyncio
-import difflib
+import functools
 import json
-import re
+import weakref
 from collections import Counter
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import json_repair
 
-from ..llm import call_llm
+from ..llm import acall_llm
 from ..prompts import get_prompt
 from ..utils.logger import setup_logger
 
@@ -21,6 +21,177 @@ logger = setup_logger("japanese_analyzer")
 
 MAX_STEPS = 3
 
+DEFAULT_SYSTEM_PROMPT = (
+    "You are a Japanese language analyzer. Analyze Japanese text and extract "
+    "word-level information including furigana, romaji, and part of speech."
+)
+
+# 静态分析规则（不含具体文本），与系统提示词一起作为 system 消息发送，
+# 多次请求和 agent loop 重试时前缀保持不变，可利用服务端的提示词缓存
+_STATIC_INSTRUCTIONS = (
+    "**CRITICAL REQUIREMENTS (MUST FOLLOW):**\n"
+    "1. **NO AUTO-CORRECTION (绝对禁止自动修正):**\n"
+    "   - DO NOT attempt to correct, fix, improve, or standardize the input text\n"
+    "   - DO NOT 'fix' spelling errors, typos, or non-standard usage\n"
+    "   - Even if the text appears 'wrong' or non-standard, output it EXACTLY as given\n"
+    "   - Your task is to ANALYZE the text, NOT to CORRECT it\n"
+    "   - The 'text' field MUST match the original EXACTLY, with NO modifications\n"
+    "   - Do NOT modify, delete, or replace any character, word, particle, ending, or conjugation form in the original text\n"
+    "   - Do NOT perform any form of grammatical correction or natural language completion\n"
+    "   - Keep the original text completely unchanged, every character must be preserved exactly as is\n\n"
+    "2. **ONE-TO-ONE CORRESPONDENCE (最重要):**\n"
+    "   - Every character in the input text MUST have a corresponding output item\n"
+    "   - Every output item's 'text' field MUST correspond to consecutive characters in the input\n"
+    "   - NO character can be omitted, skipped, modified, or replaced\n"
+    "   - NO character can be duplicated or added\n"
+    "   - Input and output must have a one-to-one correspondence\n\n"
+    "3. **NO MORPHEME DECOMPOSITION OR LEMMATIZATION (严格禁止形态素分解和词形还原):**\n"
+    "   - 「教師あり形態素分解禁止」- Do NOT perform supervised morpheme decomposition\n"
+    "   - Do NOT expand or transform any morpheme into another form\n"
+    "   - Do NOT split contracted forms into their theoretical sources\n"
+    "   - 禁止把「だ」→「で + ある」\n"
+    "   - 禁止把「じゃ」→「では」\n"
+    "   - 禁止把「とっ」→「と + っ」\n"
+    "   - Do NOT perform any lemmatization (禁止任何词形还原)\n"
+    "   - Every text must be EXACTLY the substring from the original input\n"
+    "   - Keep the actual form in the original text, do NOT restore to theoretical base form\n"
+    "   - Do NOT expand abbreviations to their full theoretical forms\n"
+    "   - Do NOT convert spoken forms to written forms\n"
+    "   - Do NOT restore any word to dictionary form or base form\n"
+    "   - The 'text' field MUST be an exact substring from the original, with NO transformations\n\n"
+    "4. **Word segmentation must follow Japanese grammar rules (按日语语法拆分):**\n"
+    "   - Segmentation should match how Japanese learners understand the grammar\n"
+    "   - Follow Japanese grammatical structure, NOT just part of speech\n\n"
+    "5. **Grammar-based segmentation rules:**\n"
+    "   a. **Particles (助詞)**: MUST be separated as individual words\n"
+    "      - Case particles (格助詞): が、を、に、へ、と、から、より、で、まで\n"
+    "      - Adverbial particles (副助詞): は、も、だけ、ばかり、まで、など\n"
+    "      - Conjunctive particles (接続助詞): て、で、ながら、が、けれども\n"
+    "      - Sentence-final particles (終助詞): か、ね、よ、な、わ\n"
+    "      - Example: '母親が' → '母親' + 'が'\n\n"
+    "   b. **Verbs (動詞)**: Verb stem + conjugation form as one unit\n"
+    "      - Example: '叩いた' (ta-form), '食べる' (dictionary form)\n"
+    "      - Passive/causative forms as one unit: '逮捕されました'\n\n"
+    "   c. **Auxiliary verbs (助動詞)**: Separate from main verb\n"
+    "      - 'です', 'ます', 'だ', 'ない', 'たい', 'らしい' should be separate\n"
+    "      - Example: '食べます' → '食べ' + 'ます'\n\n"
+    "   d. **Nouns (名詞)**: Complete words as one unit\n"
+    "      - Example: '母親', '勉強', '頭'\n\n"
+    "   e. **Adjectives (形容詞)**: Stem + conjugation as one unit\n"
+    "      - Example: '高い', '高かった', '高くて'\n\n"
+    "   f. **Conjunctions (接続詞)**: Separate words\n"
+    "      - Example: 'そして', 'しかし', 'だから', 'でも'\n\n"
+    "   g. **Adverbs (副詞)**: Separate words\n"
+    "      - Example: 'とても', 'すごく', 'よく'\n\n"
+    "   **Key principle**: Particles MUST be separated; verb/adjective conjugations as one unit; auxiliary verbs separated\n"
+    "6. The user message gives the original character count (excluding spaces).\n"
+    "7. The total length of all 'text' fields MUST equal that character count exactly.\n"
+    "8. Do NOT omit any characters (including punctuation, particles, spaces).\n"
+    "9. Do NOT add any characters that are not in the original text.\n"
+    "10. Do NOT modify, replace, or correct any characters in the original text.\n"
+    "11. Before outputting, verify:\n"
+    "   - result_text = ''.join([item['text'] for item in result])\n"
+    "   - len(result_text.replace(' ', '')) == the original character count\n"
+    "   - result_text.replace(' ', '') == the original text with spaces removed\n"
+    "   - Every character matches exactly, with NO corrections or modifications\n\n"
+    "Return a JSON array where each element contains:\n"
+    "- text: the original word (segmented by part of speech, MUST match exactly, NO corrections, NO modifications)\n"
+    "- furigana: hiragana reading (平假名)\n"
+    "- romaji: romanized reading\n"
+    "- type: part of speech (noun, verb, adjective, particle, etc.)\n\n"
+    "**Example:**\n"
+    "Input: '母親が逮捕されました'\n"
+    "Output: [\n"
+    '  {"text": "母親", "furigana": "ははおや", "romaji": "hahaoya", "type": "noun"},\n'
+    '  {"text": "が", "furigana": "が", "romaji": "ga", "type": "particle"},\n'
+    '  {"text": "逮捕されました", "furigana": "たいほされました", "romaji": "taihosaremashita", "type": "verb"}\n'
+    "]\n"
+    "Verification: '母親' + 'が' + '逮捕されました' = '母親が逮捕されました' ✓ (all 10 characters covered, NO modifications)\n\n"
+    "**Verification (MANDATORY before output):**\n"
+    "1. Concatenate all 'text' fields: result_text = ''.join([item['text'] for item in result])\n"
+    "2. Compare character by character with the original text (spaces removed)\n"
+    "3. Verify length: len(result_text.replace(' ', '')) == the original character count\n"
+    "4. Verify NO modifications: Every character must match the original EXACTLY\n"
+    "5. If any mismatch, identify missing/extra/modified characters and correct the output\n\n"
+    "**OUTPUT FORMAT (MANDATORY):**\n"
+    "- Output ONLY a JSON array, no explanations, no markdown, no code blocks\n"
+    '- Format: [{"text": "...", "furigana": "...", "romaji": "...", "type": "..."}]\n'
+    '- Example: [{"text": "母親", "furigana": "ははおや", "romaji": "hahaoya", "type": "noun"}]'
+)
+
+# 用户提示词模板：只包含待分析文本和字符数
+_USER_PROMPT_TEMPLATE = (
+    "Analyze the following Japanese text and extract word-level information:\n"
+    "<text>{text}</text>\n"
+    "Original character count (excluding spaces): {original_length}"
+)
+
+# 批量分析的用户提示词：一个批次的文本合并为一次请求，按顺序返回嵌套数组
+_BATCH_USER_PROMPT_HEADER = (
+    "Analyze each of the following {count} Japanese texts separately and extract "
+    "word-level information.\n"
+    "Output ONLY a JSON array containing exactly {count} arrays: the i-th inner "
+    "array is the analysis of text <i>, following all the rules above.\n\n"
+)
+_BATCH_TEXT_TEMPLATE = (
+    "<{index}>{text}</{index}>\n"
+    "Original character count of text {index} (excluding spaces): {original_length}"
+)
+
+# 分析结果每一项的必需字段
+_REQUIRED_FIELDS = frozenset(("text", "furigana", "romaji", "type"))
+
+
+# 进程级共享信号量：同一模型、同一并发上限的分析器共用一个并发限制，
+# 每次请求新建分析器时并发上限依然生效。按事件循环区分，
+# 因为 asyncio.Semaphore 不能跨事件循环使用
+_SEMAPHORES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore(model: str, max_concurrent: int) -> asyncio.Semaphore:
+    """获取当前事件循环中 (model, max_concurrent) 对应的共享信号量"""
+    loop_semaphores = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    key = (model, max_concurrent)
+    semaphore = loop_semaphores.get(key)
+    if semaphore is None:
+        semaphore = loop_semaphores[key] = asyncio.Semaphore(max_concurrent)
+    return semaphore
+
+
+def _strip_whitespace(text: str) -> str:
+    """去除所有空白字符（str.split 在 C 层完成，比正则更快）"""
+    return "".join(text.split())
+
+
+def _loads_json(content: str) -> Any:
+    """解析 LLM 输出：先用标准库解析（格式正确时更快），失败再用 json_repair 修复"""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return json_repair.loads(content)
+
+
+def _fallback_result(text: str) -> List[Dict[str, str]]:
+    """分析失败时的基本结构：每个非空白字符一项"""
+    return [
+        {"text": char, "furigana": "", "romaji": "", "type": "unknown"}
+        for char in text
+        if not char.isspace()
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_system_prompt() -> str:
+    """获取分析系统提示词（结果缓存，提示词文件不存在时使用默认提示词）
+
+    静态分析规则附加在系统提示词之后。
+    """
+    try:
+        base_prompt = get_prompt("analyze/japanese")
+    except Exception:
+        base_prompt = DEFAULT_SYSTEM_PROMPT
+    return f"{base_prompt}\n\n{_STATIC_INSTRUCTIONS}"
+
 
 class JapaneseAnalyzer:
     """日语文本分析器（异步版本，适用于 FastAPI 环境）
@@ -43,13 +214,14 @@ class JapaneseAnalyzer:
 
         Args:
             model: LLM模型名称
-            max_concurrent: 最大并发数（使用 asyncio.Semaphore 控制）
+            max_concurrent: 最大并发数（同模型的分析器共享 asyncio.Semaphore）
             batch_num: 每批处理的文本数量
         """
         self.model = model
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
         self.batch_num = batch_num
+        # 系统提示词在进程内只读取一次，构建消息时直接引用
+        self._system_prompt = _get_system_prompt()
 
     async def analyze_text(self, text: str) -> List[Dict[str, str]]:
         """分析单个日语文本，返回词级别的信息
@@ -63,18 +235,12 @@ class JapaneseAnalyzer:
         if not text or not text.strip():
             return []
 
-        # 使用信号量控制并发数
-        async with self.semaphore:
-            try:
-                return await self._analyze_with_agent_loop(text)
-            except Exception as e:
-                logger.error(f"分析失败: {e}")
-                # 失败时返回基本结构
-                return [
-                    {"text": char, "furigana": "", "romaji": "", "type": "unknown"}
-                    for char in text
-                    if char.strip()
-                ]
+        try:
+            return await self._analyze_with_agent_loop(text)
+        except Exception as e:
+            logger.error(f"分析失败: {e}")
+            # 失败时返回基本结构
+            return _fallback_result(text)
 
     async def analyze_texts(self, texts: List[str]) -> List[List[Dict[str, str]]]:
         """批量分析多个日语文本
@@ -143,6 +309,9 @@ class JapaneseAnalyzer:
     async def _analyze_chunk(self, texts: List[str]) -> List[List[Dict[str, str]]]:
         """分析单个文本批次
 
+        先用一次 LLM 请求分析整个批次，未通过验证的文本再逐条使用 agent loop
+        分析修正。
+
         Args:
             texts: 文本批次列表
 
@@ -151,34 +320,81 @@ class JapaneseAnalyzer:
         """
         logger.info(f"[+]正在分析日语文本批次，共 {len(texts)} 条")
 
-        # 使用信号量控制并发数
-        async with self.semaphore:
-            # 并发分析批次内的所有文本
-            tasks = [self._analyze_with_agent_loop(text) for text in texts]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            analyzed_results = []
-            for i, result in enumerate[List[Dict[str, str]] | BaseException](results):
-                if isinstance(result, Exception):
-                    logger.error(f"分析文本失败：{str(result)}")
-                    # 失败时返回基本结构
-                    text = texts[i]
-                    analyzed_results.append(
-                        [
-                            {
-                                "text": char,
-                                "furigana": "",
-                                "romaji": "",
-                                "type": "unknown",
-                            }
-                            for char in text
-                            if char.strip()
-                        ]
-                    )
-                else:
-                    analyzed_results.append(result)
-
-            return analyzed_results
+        analyzed_results: List[Optional[List[Dict[str, str]]]] = [None] * len(texts)
+        if len(texts) > 1:
+            try:
+                analyzed_results = await self._analyze_batch(texts)
+            except Exception as e:
+                logger.warning(f"批量分析失败，改为逐条分析：{str(e)}")
+
+        # 逐条分析批量结果中缺失或未通过验证的文本（并发数由信号量控制）
+        pending = [i for i, result in enumerate(analyzed_results) if result is None]
+        if pending and len(texts) > 1:
+            logger.info(f"批量分析中 {len(pending)} 条未通过验证，改为逐条分析")
+        tasks = [self._analyze_with_agent_loop(texts[i]) for i in pending]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for i, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"分析文本失败：{str(result)}")
+                # 失败时返回基本结构
+                analyzed_results[i] = _fallback_result(texts[i])
+            else:
+                analyzed_results[i] = result
+
+        return analyzed_results
+
+    async def _analyze_batch(
+        self, texts: List[str]
+    ) -> List[Optional[List[Dict[str, str]]]]:
+        """用一次 LLM 请求分析多个文本
+
+        Args:
+            texts: 文本批次列表
+
+        Returns:
+            与 texts 一一对应的结果列表，未通过验证的文本对应 None
+        """
+        cleaned_texts = [_strip_whitespace(text) for text in texts]
+        user_prompt = _BATCH_USER_PROMPT_HEADER.format(count=len(texts)) + "\n".join(
+            [
+                _BATCH_TEXT_TEMPLATE.format(
+                    index=i + 1, text=text, original_length=len(cleaned)
+                )
+                for i, (text, cleaned) in enumerate(zip(texts, cleaned_texts))
+            ]
+        )
+        messages = [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+        async with _get_semaphore(self.model, self.max_concurrent):
+            response = await acall_llm(
+                messages=messages,
+                model=self.model,
+                temperature=0.1,
+            )
+
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("LLM返回空结果")
+
+        parsed_result = _loads_json(content)
+        if not isinstance(parsed_result, list) or len(parsed_result) != len(texts):
+            raise ValueError(f"期望包含{len(texts)}个数组的list，实际{type(parsed_result)}")
+
+        results: List[Optional[List[Dict[str, str]]]] = [None] * len(texts)
+        for i, (cleaned, result) in enumerate(zip(cleaned_texts, parsed_result)):
+            if not isinstance(result, list):
+                continue
+            is_valid, error_message = self._validate_result(cleaned, result)
+            if is_valid:
+                results[i] = result
+            else:
+                logger.debug(f"批量分析第{i + 1}条验证失败: {error_message}")
+
+        return results
 
     async def _analyze_with_agent_loop(self, text: str) -> List[Dict[str, str]]:
         """使用agent loop分析文本，自动验证和修正
@@ -189,109 +405,15 @@ class JapaneseAnalyzer:
         Returns:
             词信息列表
         """
-        # 计算原文字符数（去除空格）
-        original_length = len(re.sub(r"\s+", "", text))
-
-        user_prompt = (
-            f"Analyze the following Japanese text and extract word-level information:\n"
-            f"<text>{text}</text>\n\n"
-            f"**CRITICAL REQUIREMENTS (MUST FOLLOW):**\n"
-            f"1. **NO AUTO-CORRECTION (绝对禁止自动修正):**\n"
-            f"   - DO NOT attempt to correct, fix, improve, or standardize the input text\n"
-            f"   - DO NOT 'fix' spelling errors, typos, or non-standard usage\n"
-            f"   - Even if the text appears 'wrong' or non-standard, output it EXACTLY as given\n"
-            f"   - Your task is to ANALYZE the text, NOT to CORRECT it\n"
-            f"   - The 'text' field MUST match the original EXACTLY, with NO modifications\n"
-            f"   - Do NOT modify, delete, or replace any character, word, particle, ending, or conjugation form in the original text\n"
-            f"   - Do NOT perform any form of grammatical correction or natural language completion\n"
-            f"   - Keep the original text completely unchanged, every character must be preserved exactly as is\n\n"
-            f"2. **ONE-TO-ONE CORRESPONDENCE (最重要):**\n"
-            f"   - Every character in the input text MUST have a corresponding output item\n"
-            f"   - Every output item's 'text' field MUST correspond to consecutive characters in the input\n"
-            f"   - NO character can be omitted, skipped, modified, or replaced\n"
-            f"   - NO character can be duplicated or added\n"
-            f"   - Input and output must have a one-to-one correspondence\n\n"
-            f"3. **NO MORPHEME DECOMPOSITION OR LEMMATIZATION (严格禁止形态素分解和词形还原):**\n"
-            f"   - 「教師あり形態素分解禁止」- Do NOT perform supervised morpheme decomposition\n"
-            f"   - Do NOT expand or transform any morpheme into another form\n"
-            f"   - Do NOT split contracted forms into their theoretical sources\n"
-            f"   - 禁止把「だ」→「で + ある」\n"
-            f"   - 禁止把「じゃ」→「では」\n"
-            f"   - 禁止把「とっ」→「と + っ」\n"
-            f"   - Do NOT perform any lemmatization (禁止任何词形还原)\n"
-            f"   - Every text must be EXACTLY the substring from the original input\n"
-            f"   - Keep the actual form in the original text, do NOT restore to theoretical base form\n"
-            f"   - Do NOT expand abbreviations to their full theoretical forms\n"
-            f"   - Do NOT convert spoken forms to written forms\n"
-            f"   - Do NOT restore any word to dictionary form or base form\n"
-            f"   - The 'text' field MUST be an exact substring from the original, with NO transformations\n\n"
-            f"4. **Word segmentation must follow Japanese grammar rules (按日语语法拆分):**\n"
-            f"   - Segmentation should match how Japanese learners understand the grammar\n"
-            f"   - Follow Japanese grammatical structure, NOT just part of speech\n\n"
-            f"5. **Grammar-based segmentation rules:**\n"
-            f"   a. **Particles (助詞)**: MUST be separated as individual words\n"
-            f"      - Case particles (格助詞): が、を、に、へ、と、から、より、で、まで\n"
-            f"      - Adverbial particles (副助詞): は、も、だけ、ばかり、まで、など\n"
-            f"      - Conjunctive particles (接続助詞): て、で、ながら、が、けれども\n"
-            f"      - Sentence-final particles (終助詞): か、ね、よ、な、わ\n"
-            f"      - Example: '母親が' → '母親' + 'が'\n\n"
-            f"   b. **Verbs (動詞)**: Verb stem + conjugation form as one unit\n"
-            f"      - Example: '叩いた' (ta-form), '食べる' (dictionary form)\n"
-            f"      - Passive/causative forms as one unit: '逮捕されました'\n\n"
-            f"   c. **Auxiliary verbs (助動詞)**: Separate from main verb\n"
-            f"      - 'です', 'ます', 'だ', 'ない', 'たい', 'らしい' should be separate\n"
-            f"      - Example: '食べます' → '食べ' + 'ます'\n\n"
-            f"   d. **Nouns (名詞)**: Complete words as one unit\n"
-            f"      - Example: '母親', '勉強', '頭'\n\n"
-            f"   e. **Adjectives (形容詞)**: Stem + conjugation as one unit\n"
-            f"      - Example: '高い', '高かった', '高くて'\n\n"
-            f"   f. **Conjunctions (接続詞)**: Separate words\n"
-            f"      - Example: 'そして', 'しかし', 'だから', 'でも'\n\n"
-            f"   g. **Adverbs (副詞)**: Separate words\n"
-            f"      - Example: 'とても', 'すごく', 'よく'\n\n"
-            f"   **Key principle**: Particles MUST be separated; verb/adjective conjugations as one unit; auxiliary verbs separated\n"
-            f"6. The original text has {original_length} characters (excluding spaces).\n"
-            f"7. The total length of all 'text' fields MUST be exactly {original_length} characters.\n"
-            f"8. Do NOT omit any characters (including punctuation, particles, spaces).\n"
-            f"9. Do NOT add any characters that are not in the original text.\n"
-            f"10. Do NOT modify, replace, or correct any characters in the original text.\n"
-            f"11. Before outputting, verify:\n"
-            f"   - result_text = ''.join([item['text'] for item in result])\n"
-            f"   - len(result_text.replace(' ', '')) == {original_length}\n"
-            f"   - result_text.replace(' ', '') == '{text.replace(' ', '')}'\n"
-            f"   - Every character matches exactly, with NO corrections or modifications\n\n"
-            f"Return a JSON array where each element contains:\n"
-            f"- text: the original word (segmented by part of speech, MUST match exactly, NO corrections, NO modifications)\n"
-            f"- furigana: hiragana reading (平假名)\n"
-            f"- romaji: romanized reading\n"
-            f"- type: part of speech (noun, verb, adjective, particle, etc.)\n\n"
-            f"**Example:**\n"
-            f"Input: '母親が逮捕されました'\n"
-            f"Output: [\n"
-            f'  {{"text": "母親", "furigana": "ははおや", "romaji": "hahaoya", "type": "noun"}},\n'
-            f'  {{"text": "が", "furigana": "が", "romaji": "ga", "type": "particle"}},\n'
-            f'  {{"text": "逮捕されました", "furigana": "たいほされました", "romaji": "taihosaremashita", "type": "verb"}}\n'
-            f"]\n"
-            f"Verification: '母親' + 'が' + '逮捕されました' = '母親が逮捕されました' ✓ (all {len(text.replace(' ', ''))} characters covered, NO modifications)\n\n"
-            f"**Verification (MANDATORY before output):**\n"
-            f"1. Concatenate all 'text' fields: result_text = ''.join([item['text'] for item in result])\n"
-            f"2. Compare character by character: result_text.replace(' ', '') == '{text.replace(' ', '')}'\n"
-            f"3. Verify length: len(result_text.replace(' ', '')) == {original_length}\n"
-            f"4. Verify NO modifications: Every character must match the original EXACTLY\n"
-            f"5. If any mismatch, identify missing/extra/modified characters and correct the output\n\n"
-            f"**OUTPUT FORMAT (MANDATORY):**\n"
-            f"- Output ONLY a JSON array, no explanations, no markdown, no code blocks\n"
-            f'- Format: [{{"text": "...", "furigana": "...", "romaji": "...", "type": "..."}}]\n'
-            f'- Example: [{{"text": "母親", "furigana": "ははおや", "romaji": "hahaoya", "type": "noun"}}]'
+        # 去除空白后的原文，每次调用只计算一次，提示词和各轮验证共用
+        original_cleaned = _strip_whitespace(text)
+
+        user_prompt = _USER_PROMPT_TEMPLATE.format(
+            text=text, original_length=len(original_cleaned)
         )
 
         messages = [
-            {
-                "role": "system",
-                "content": get_prompt("analyze/japanese")
-                if self._has_prompt()
-                else "You are a Japanese language analyzer. Analyze Japanese text and extract word-level information including furigana, romaji, and part of speech.",
-            },
+            {"role": "system", "content": self._system_prompt},
             {"role": "user", "content": user_prompt},
         ]
 
@@ -299,13 +421,14 @@ class JapaneseAnalyzer:
 
         # Agent loop
         for step in range(MAX_STEPS):
-            # 调用LLM（使用 asyncio.to_thread 包装同步调用）
-            response = await asyncio.to_thread(
-                call_llm,
-                messages=messages,
-                model=self.model,
-                temperature=0.1,
-            )
+            # 调用LLM（异步客户端，复用连接池，不占用线程池），
+            # 信号量只包住 LLM 请求本身，使并发请求数真正达到 max_concurrent
+            async with _get_semaphore(self.model, self.max_concurrent):
+                response = await acall_llm(
+                    messages=messages,
+                    model=self.model,
+                    temperature=0.1,
+                )
 
             result_text = response.choices[0].message.content
             if not result_text:
@@ -313,7 +436,7 @@ class JapaneseAnalyzer:
 
             # 解析结果
             try:
-                parsed_result = json_repair.loads(result_text)
+                parsed_result = _loads_json(result_text)
                 if not isinstance(parsed_result, list):
                     raise ValueError(f"期望list，实际{type(parsed_result)}")
 
@@ -321,7 +444,9 @@ class JapaneseAnalyzer:
                 last_result = result_list
 
                 # 验证结果
-                is_valid, error_message = self._validate_result(text, result_list)
+                is_valid, error_message = self._validate_result(
+                    original_cleaned, result_list
+                )
 
                 if is_valid:
                     return result_list
@@ -358,12 +483,12 @@ class JapaneseAnalyzer:
         return last_result if last_result else []
 
     def _validate_result(
-        self, original_text: str, result: List[Dict[str, str]]
+        self, original_cleaned: str, result: List[Dict[str, str]]
     ) -> Tuple[bool, str]:
         """验证分析结果
 
         Args:
-            original_text: 原始文本
+            original_cleaned: 去除空白后的原始文本
             result: 分析结果列表
 
         Returns:
@@ -373,18 +498,18 @@ class JapaneseAnalyzer:
             return False, "结果为空"
 
         # 检查必需字段
-        required_fields = ["text", "furigana", "romaji", "type"]
         for i, item in enumerate(result):
             if not isinstance(item, dict):
                 return False, f"第{i + 1}项不是字典类型"
-            for field in required_fields:
-                if field not in item:
-                    return False, f"第{i + 1}项缺少字段: {field}"
+            missing_fields = _REQUIRED_FIELDS - item.keys()
+            if missing_fields:
+                missing = ", ".join(sorted(missing_fields))
+                return False, f"第{i + 1}项缺少字段: {missing}"
 
         # 检查文本是否匹配（必须完全匹配）
-        result_text = "".join(item.get("text", "") for item in result)
-        original_cleaned = re.sub(r"\s+", "", original_text)
-        result_cleaned = re.sub(r"\s+", "", result_text)
+        # 上面已确认每项都有 text 字段，直接取值；列表推导式比生成器 join 更快
+        result_text = "".join([item["text"] for item in result])
+        result_cleaned = _strip_whitespace(result_text)
 
         # 严格检查长度必须完全一致
         if len(original_cleaned) != len(result_cleaned):
@@ -392,17 +517,8 @@ class JapaneseAnalyzer:
             original_counter = Counter(original_cleaned)
             result_counter = Counter(result_cleaned)
 
-            missing_chars = []
-            for char, count in original_counter.items():
-                result_count = result_counter.get(char, 0)
-                if count > result_count:
-                    missing_chars.extend([char] * (count - result_count))
-
-            extra_chars = []
-            for char, count in result_counter.items():
-                original_count = original_counter.get(char, 0)
-                if count > original_count:
-                    extra_chars.extend([char] * (count - original_count))
+            missing_chars = list((original_counter - result_counter).elements())
+            extra_chars = list((result_counter - original_counter).elements())
 
             error_msg = f"文本长度不匹配: 原文{len(original_cleaned)}字符，结果{len(result_cleaned)}字符，差异{abs(len(original_cleaned) - len(result_cleaned))}字符"
             if missing_chars:
@@ -413,25 +529,12 @@ class JapaneseAnalyzer:
                 error_msg += (
                     f"\n多余的字符（共{len(extra_chars)}个）: {extra_chars[:20]}"
                 )
-            error_msg += f"\n\n请确保所有字符都被包含在结果中。原文: '{original_text}'"
+            error_msg += f"\n\n请确保所有字符都被包含在结果中。原文: '{original_cleaned}'"
             return False, error_msg
 
         # 验证字符顺序和内容是否匹配（使用字符序列比较）
         if original_cleaned != result_cleaned:
-            # 使用 difflib 找出具体差异
-            diff = list(
-                difflib.unified_diff([original_cleaned], [result_cleaned], lineterm="")
-            )
-            if diff:
-                error_msg = f"文本内容不匹配（长度相同但内容不同）\n原文: '{original_cleaned}'\n结果: '{result_cleaned}'"
-                return False, error_msg
+            error_msg = f"文本内容不匹配（长度相同但内容不同）\n原文: '{original_cleaned}'\n结果: '{result_cleaned}'"
+            return False, error_msg
 
         return True, ""
-
-    def _has_prompt(self) -> bool:
-        """检查是否存在分析提示词文件"""
-        try:
-            get_prompt("analyze/japanese")
-            return True
-        except (FileNotFoundError, Exception):
-            return False
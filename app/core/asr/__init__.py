@@ -1,9 +1,39 @@
-from .chunked_asr import ChunkedASR
-from .status import ASRStatus
-from .transcribe import transcribe
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chunked_asr import ChunkedASR
+    from .status import ASRStatus
+    from .transcribe import transcribe
+    from .whisperx import preload_model
 
 __all__ = [
     "ChunkedASR",
     "transcribe",
+    "preload_model",
     "ASRStatus",
 ]
+
+# 导出名 -> 所在子模块；子模块会引入 whisperx/torch 等重量级依赖，访问时才导入。
+# 注意 transcribe 与子模块同名，包外请通过 `from app.core.asr import transcribe`
+# 获取函数，不要直接导入 app.core.asr.transcribe 子模块
+_LAZY_IMPORTS = {
+    "ChunkedASR": ".chunked_asr",
+    "transcribe": ".transcribe",
+    "preload_model": ".whisperx",
+    "ASRStatus": ".status",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """PEP 562：首次访问导出名时才导入对应子模块，导入后写回包命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
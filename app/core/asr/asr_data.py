@@ -56,6 +56,16 @@ def handle_long_path(path: str) -> str:
 
 
 class ASRDataSeg:
+    # 长音频会生成数万个词级分段，使用 __slots__ 省去每个实例的 __dict__
+    __slots__ = (
+        "text",
+        "translated_text",
+        "start_time",
+        "end_time",
+        "tokens",
+        "word_segments",
+    )
+
     def __init__(
         self,
         text: str,
@@ -1,15 +1,17 @@
 import os
 import pickle
-import tempfile
-import threading
+import struct
+import subprocess
 import time
 import uuid
+import wave
 import zlib
 from io import BytesIO
 from pathlib import Path
-from typing import Callable, Optional, Union, cast
+from typing import Any, Callable, Iterable, Iterator, Optional, Union, cast
 
-from pydub import AudioSegment
+import crc32c
+import orjson
 
 from app.core.storage import get_storage
 from app.core.utils.cache import get_asr_cache, is_cache_enabled
@@ -19,20 +21,98 @@ from .asr_data import ASRData, ASRDataSeg
 
 logger = setup_logger("asr")
 
+# 计算校验值时每次读取的块大小（1 MiB），避免把整个音频文件读入内存
+CRC32_BLOCK_SIZE = 1024 * 1024
+
+
+# ASR 结果缓存：键带版本前缀（旧的 pickle 缓存自动失效），
+# 值为 1 字节格式标记 + zlib 压缩的数据
+ASR_CACHE_VERSION = "v2"
+# 缓存键使用的校验算法（CRC32C 由 SSE4.2/ARMv8 CRC 指令硬件加速）
+CHECKSUM_ALGORITHM = "c32c"
+CACHE_COMPRESS_LEVEL = 1
+_CACHE_FORMAT_JSON = b"j"
+_CACHE_FORMAT_PICKLE = b"p"
+
+# 限流记录的时长以 8 字节小端 double 存储，不需要 pickle
+_DURATION_STRUCT = struct.Struct("<d")
+
+# ffprobe 读取音频头的超时时间（秒）
+FFPROBE_TIMEOUT = 30
+
+
+def _probe_duration(source: Union[str, bytes]) -> float:
+    """读取音频容器头获取时长（秒），不解码音频数据
+
+    WAV 文件用标准库 wave 直接读取 RIFF 头，其他格式调用 ffprobe；
+    source 为字节数据时通过 stdin 传给 ffprobe。
+    """
+    if isinstance(source, str) and source.lower().endswith(".wav"):
+        try:
+            with wave.open(source, "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError):
+            pass  # 非 PCM 编码等 wave 不支持的格式交给 ffprobe
+
+    is_bytes = isinstance(source, bytes)
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            "-i",
+            "pipe:0" if is_bytes else source,
+        ],
+        input=source if is_bytes else None,
+        capture_output=True,
+        timeout=FFPROBE_TIMEOUT,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def _serialize_cache(data: Any) -> bytes:
+    """序列化 ASR 结果用于缓存（优先 orjson，无法序列化时回退到 pickle）"""
+    try:
+        marker = _CACHE_FORMAT_JSON
+        payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    except TypeError:
+        marker = _CACHE_FORMAT_PICKLE
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    return marker + zlib.compress(payload, CACHE_COMPRESS_LEVEL)
+
+
+def _deserialize_cache(blob: bytes) -> Any:
+    """反序列化 _serialize_cache 生成的缓存数据"""
+    payload = zlib.decompress(blob[1:])
+    if blob[:1] == _CACHE_FORMAT_JSON:
+        return orjson.loads(payload)
+    return pickle.loads(payload)
+
+
+def _iter_file_chunks(path: str, block_size: int = CRC32_BLOCK_SIZE) -> Iterator[bytes]:
+    """按块读取本地文件"""
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            yield block
+
 
 class BaseASR:
     """Base class for ASR (Automatic Speech Recognition) implementations.
 
     Provides common functionality including:
     - Audio file loading and validation
-    - CRC32-based file identification
+    - CRC32C-based file identification
     - Disk caching with automatic key generation
     - Template method pattern for subclass implementation
     - Rate limiting for public charity services
     """
 
     SUPPORTED_SOUND_FORMAT = ["flac", "m4a", "mp3", "wav"]
-    _lock = threading.Lock()
 
     RATE_LIMIT_MAX_CALLS = 100
     RATE_LIMIT_MAX_DURATION = 360 * 60
@@ -52,19 +132,37 @@ class BaseASR:
             need_word_time_stamp: Whether to return word-level timestamps
         """
         self.audio_path = audio_path
-        self.file_binary = None
+        self._file_binary: Optional[bytes] = None
+        self._is_minio_object = False
         self.use_cache = use_cache
         self._set_data()
         self._cache = get_asr_cache()
         self.audio_duration = self._get_audio_duration()
 
+    @property
+    def file_binary(self) -> bytes:
+        """音频原始字节（按需加载）
+
+        缓存键和时长都不需要整个文件驻留内存，只有确实需要字节数据的子类
+        访问该属性时才会读取文件。
+        """
+        if self._file_binary is None:
+            if isinstance(self.audio_path, bytes):
+                self._file_binary = self.audio_path
+            elif self._is_minio_object:
+                self._file_binary = get_storage().download_bytes(self.audio_path)
+            else:
+                self._file_binary = Path(self.audio_path).read_bytes()
+        return self._file_binary
+
     def _set_data(self):
-        """Load audio data and compute CRC32 hash for cache key.
+        """Compute the cache id that identifies the audio content.
 
-        支持从 MinIO 读取音频文件。
+        MinIO 对象直接使用服务端的 ETag 和大小，无需读取内容；本地文件和字节
+        数据按块计算 CRC32C，不会把整个文件读入内存。
         """
         if isinstance(self.audio_path, bytes):
-            self.file_binary = self.audio_path
+            self.cache_id = self._checksum([self.audio_path])
         elif isinstance(self.audio_path, str):
             ext = self.audio_path.split(".")[-1].lower()
             assert ext in self.SUPPORTED_SOUND_FORMAT, (
@@ -72,38 +170,52 @@ class BaseASR:
             )
 
             # 检查是否是 MinIO 对象
-            storage = get_storage()
-            if storage.file_exists(self.audio_path):
-                # 从 MinIO 下载到临时文件
-                logger.debug(f"从 MinIO 下载音频文件: {self.audio_path}")
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=Path(self.audio_path).suffix
-                ) as tmp_file:
-                    tmp_path = tmp_file.name
-                storage.download_file(self.audio_path, tmp_path)
-                try:
-                    with open(tmp_path, "rb") as f:
-                        self.file_binary = f.read()
-                finally:
-                    # 清理临时文件
-                    Path(tmp_path).unlink(missing_ok=True)
+            stat = get_storage().stat_file(self.audio_path)
+            if stat is not None:
+                self._is_minio_object = True
+                etag = stat.etag.strip('"')
+                self.cache_id = f"{etag}-{stat.size}"
             elif os.path.exists(self.audio_path):
                 # 本地文件
-                with open(self.audio_path, "rb") as f:
-                    self.file_binary = f.read()
+                self.cache_id = self._checksum(_iter_file_chunks(self.audio_path))
             else:
                 raise FileNotFoundError(f"File not found: {self.audio_path}")
         else:
             raise ValueError("audio_path must be provided as string or bytes")
-        crc32_value = zlib.crc32(self.file_binary) & 0xFFFFFFFF
-        self.crc32_hex = format(crc32_value, "08x")
+
+    @staticmethod
+    def _checksum(blocks: Iterable[bytes]) -> str:
+        """按块计算 CRC32C，返回 8 位十六进制字符串"""
+        value = 0
+        for block in blocks:
+            value = crc32c.crc32c(block, value)
+        return format(value & 0xFFFFFFFF, "08x")
 
     def _get_audio_duration(self) -> float:
-        """Get audio duration in seconds using pydub."""
-        if not self.file_binary:
-            return 0.0
+        """Get audio duration in seconds from the container header.
+
+        只读取音频头（ffprobe / wave），读取失败时才用 pydub 解码整个音频。
+        """
+        source: Union[str, bytes]
+        if isinstance(self.audio_path, str) and not self._is_minio_object:
+            source = self.audio_path
+        else:
+            source = self.file_binary
+            if not source:
+                return 0.0
+
+        try:
+            return _probe_duration(source)
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            logger.debug(f"读取音频头获取时长失败，改用 pydub 解码: {e}")
+
         try:
-            audio = AudioSegment.from_file(BytesIO(self.file_binary))
+            # pydub 只在回退路径中使用，按需导入
+            from pydub import AudioSegment
+
+            audio = AudioSegment.from_file(
+                source if isinstance(source, str) else BytesIO(source)
+            )
             return audio.duration_seconds
         except Exception as e:
             logger.warning(f"Failed to get audio duration: {e}")
@@ -136,14 +248,22 @@ class BaseASR:
         Returns:
             tuple[ASRData, Optional[str]]: Recognition results with segments and detected language code
         """
-        cache_key = f"{self.__class__.__name__}:{self._get_key()}"
+        cache_key = (
+            f"{ASR_CACHE_VERSION}:{CHECKSUM_ALGORITHM}:"
+            f"{self.__class__.__name__}:{self._get_key()}"
+        )
 
         # Try cache first
         if self.use_cache and is_cache_enabled():
             cached_result = self._cache.get(cache_key)
             if cached_result is not None:
-                # 反序列化缓存结果
-                cached_result = pickle.loads(cached_result)
+                # 反序列化缓存结果（损坏时当作未命中）
+                try:
+                    cached_result = _deserialize_cache(cached_result)
+                except Exception as e:
+                    logger.warning(f"反序列化 ASR 缓存失败: {e}")
+                    cached_result = None
+            if cached_result is not None:
                 cached_result = cast(Optional[dict], cached_result)
                 logger.info("找到缓存，直接返回")
                 segments = self._make_segments(cached_result)
@@ -159,7 +279,7 @@ class BaseASR:
         resp_data = self._run(callback, **kwargs)
 
         # Cache result
-        cached_data = pickle.dumps(resp_data)
+        cached_data = _serialize_cache(resp_data)
         self._cache.setex(cache_key, 86400 * 2, cached_data)
 
         segments = self._make_segments(resp_data)
@@ -170,13 +290,13 @@ class BaseASR:
     def _get_key(self) -> str:
         """Get cache key for this ASR request.
 
-        Default implementation uses file CRC32.
+        Default implementation uses the content cache id (MinIO ETag or CRC32C).
         Subclasses can override to include additional parameters.
 
         Returns:
             Cache key string
         """
-        return self.crc32_hex
+        return self.cache_id
 
     def _make_segments(self, resp_data: dict) -> list[ASRDataSeg]:
         """Convert ASR response to segment list.
@@ -206,26 +326,31 @@ class BaseASR:
         raise NotImplementedError("_run method must be implemented in subclass")
 
     def _check_rate_limit(self) -> None:
-        """Check rate limit for public charity services."""
+        """Check rate limit for public charity services.
+
+        调用记录保存在每个服务一个的 Redis 有序集合中（score 为调用时间，
+        member 为 16 字节 UUID + 8 字节时长），一次 pipeline 往返即可清理过期
+        记录并取回时间窗口内的全部时长，无需逐条查询。
+        """
         service_name = self.__class__.__name__
-        tag = f"rate_limit:{service_name}"
-        time_limit = time.time() - self.RATE_LIMIT_TIME_WINDOW
+        key = f"rate_limit:{service_name}"
+        now = time.time()
+        time_limit = now - self.RATE_LIMIT_TIME_WINDOW
 
         # Query recent records
         try:
-            query = "SELECT key FROM Cache WHERE tag = ? AND store_time >= ?"
-            results = self._cache._sql(query, (tag, time_limit)).fetchall()
+            pipe = self._cache.pipeline()
+            pipe.zremrangebyscore(key, "-inf", f"({time_limit}")
+            pipe.zrangebyscore(key, time_limit, "+inf")
+            _, records = pipe.execute()
         except Exception as e:
             raise RuntimeError(f"Failed to query rate limit: {e}")
 
-        # Get durations using cache API
-        durations = []
-        for (key,) in results:
-            duration_bytes = self._cache.get(key)
-            if duration_bytes is not None:
-                duration = pickle.loads(duration_bytes)
-                if isinstance(duration, (int, float)):
-                    durations.append(duration)
+        durations = [
+            _DURATION_STRUCT.unpack_from(record, 16)[0]
+            for record in records
+            if len(record) == 16 + _DURATION_STRUCT.size
+        ]
 
         call_count = len(durations)
         total_duration = sum(durations)
@@ -242,11 +367,9 @@ class BaseASR:
             logger.warning(error_msg)
             raise RuntimeError(error_msg)
 
-        # Record current call (store duration directly as float)
-        duration_bytes = pickle.dumps(self.audio_duration)
-        expire_time = int(self.RATE_LIMIT_TIME_WINDOW) + 3600
-        self._cache.setex(
-            f"rate_limit_record:{service_name}:{uuid.uuid4()}",
-            expire_time,
-            duration_bytes,
-        )
+        # Record current call (store duration as a packed double)
+        record = uuid.uuid4().bytes + _DURATION_STRUCT.pack(self.audio_duration)
+        pipe = self._cache.pipeline()
+        pipe.zadd(key, {record: now})
+        pipe.expire(key, int(self.RATE_LIMIT_TIME_WINDOW) + 3600)
+        pipe.execute()
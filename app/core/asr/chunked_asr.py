@@ -7,12 +7,9 @@
 
 import asyncio
 import io
-import tempfile
 from pathlib import Path
 from typing import Callable, List, Optional, Tuple
 
-from pydub import AudioSegment
-
 from app.core.storage import get_storage
 
 from ..utils.logger import setup_logger
@@ -136,22 +133,11 @@ class ChunkedASR:
 
         storage = get_storage()
         if storage.file_exists(self.audio_path):
-            # 从 MinIO 下载到临时文件
-            logger.info(f"从 MinIO 下载音频文件用于分块: {self.audio_path}")
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=Path(self.audio_path).suffix
-            ) as tmp_file:
-                tmp_path = tmp_file.name
-            # 下载文件（同步操作，在线程池中执行）
-            await asyncio.to_thread(storage.download_file, self.audio_path, tmp_path)
-            try:
-                # 读取文件（同步操作，在线程池中执行）
-                self.file_binary = await asyncio.to_thread(
-                    lambda: Path(tmp_path).read_bytes()
-                )
-            finally:
-                # 清理临时文件
-                Path(tmp_path).unlink(missing_ok=True)
+            # 从 MinIO 直接读取到内存（同步操作，在线程池中执行），不经过临时文件
+            logger.info(f"从 MinIO 读取音频文件用于分块: {self.audio_path}")
+            self.file_binary = await asyncio.to_thread(
+                storage.download_bytes, self.audio_path
+            )
         else:
             # 本地文件（同步操作，在线程池中执行）
             self.file_binary = await asyncio.to_thread(
@@ -169,6 +155,9 @@ class ChunkedASR:
         if self.file_binary is None:
             raise ValueError("file_binary is None, cannot split audio")
 
+        # pydub 导入较慢（导入时会探测 ffmpeg），只在真正切分音频时导入
+        from pydub import AudioSegment
+
         audio = AudioSegment.from_file(io.BytesIO(self.file_binary))
         total_duration_ms = len(audio)
 
@@ -1,11 +1,20 @@
 from app.core.asr.asr_data import ASRData
 from app.core.asr.chunked_asr import ChunkedASR
-from app.core.asr.whisperx import WhisperXASR
-from app.core.entities import TranscribeConfig, TranscribeModelEnum
+from app.core.asr.whisperx import CPU_DEFAULT_COMPUTE_TYPE, WhisperXASR
+from app.core.entities import (
+    TranscribeConfig,
+    TranscribeModelEnum,
+    WhisperXConfig,
+)
 from app.config import MODEL_PATH
 
 import asyncio
 
+# WhisperX 分块并发数：推理共用同一个常驻模型并串行执行，
+# 并发只让下一块的解码、对齐等步骤与当前块的推理重叠
+WHISPERX_CHUNK_CONCURRENCY = 2
+
+
 async def transcribe(
     audio_path: str, config: TranscribeConfig, callback=None
 ) -> tuple[ASRData, str | None]:
@@ -62,13 +71,10 @@ def _create_asr_instance(audio_path: str, config: TranscribeConfig) -> ChunkedAS
 
 def _create_whisperx_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
     """Create WhisperX ASR instance with chunking support."""
-    # 默认使用 CPU
-    device = config.whisperx_device or "cpu"
-    compute_type = config.whisperx_compute_type or "float32"
-
-    # 如果使用 CPU，确保 compute_type 为 float32
-    if device == "cpu":
-        compute_type = "float32"
+    whisperx_config = config.whisperx or WhisperXConfig()
+    # 默认使用 CPU；设备和计算类型的规范化统一由 WhisperXASR 完成
+    device = whisperx_config.device or "cpu"
+    compute_type = whisperx_config.compute_type or CPU_DEFAULT_COMPUTE_TYPE
 
     # 明确指定模型目录为 models/whisperx
     model_dir = str(MODEL_PATH / "whisperx")
@@ -77,17 +83,17 @@ def _create_whisperx_asr(audio_path: str, config: TranscribeConfig) -> ChunkedAS
         "use_cache": True,
         "need_word_time_stamp": True,  # WhisperX 总是提供词级时间戳
         "language": config.transcribe_language,
-        "model": config.whisperx_model or "large-v3",
+        "model": whisperx_config.model or "large-v3",
         "device": device,
         "compute_type": compute_type,
-        "batch_size": config.whisperx_batch_size or 16,
+        "batch_size": whisperx_config.batch_size or 16,
         "model_dir": model_dir,  # 明确指定为 models/whisperx
     }
     return ChunkedASR(
         asr_class=WhisperXASR,
         audio_path=audio_path,
         asr_kwargs=asr_kwargs,
-        chunk_concurrency=1,  # 本地转录使用单线程
+        chunk_concurrency=WHISPERX_CHUNK_CONCURRENCY,
         chunk_length=60 * 20,  # 每块20分钟
     )
 
@@ -3,16 +3,12 @@ WhisperX ASR 实现
 提供精准的字词级时间戳
 """
 
+import functools
+import importlib.util
+import subprocess
+import threading
 from pathlib import Path
-from typing import Callable, Optional
-
-try:
-    import whisperx
-    import torch
-
-    WHISPERX_AVAILABLE = True
-except ImportError:
-    WHISPERX_AVAILABLE = False
+from typing import Callable, Optional, Union
 
 from ...config import MODEL_PATH
 from ..utils.logger import setup_logger
@@ -21,32 +17,251 @@ from .base import BaseASR
 
 logger = setup_logger("whisperx")
 
+# whisperx/torch 导入开销很大（数百毫秒、上百 MB 内存），这里只检查是否安装，
+# 真正用到时才在函数内导入；命中缓存的转录不会加载它们
+WHISPERX_AVAILABLE = importlib.util.find_spec("whisperx") is not None
+
+# 预热使用的静音音频时长（秒），WhisperX 内部采样率为 16kHz
+WARMUP_AUDIO_SECONDS = 1
+WHISPERX_SAMPLE_RATE = 16000
+# Whisper 每个 30 秒窗口的 mel 帧数（编码器输入的固定长度）
+WHISPER_CHUNK_FRAMES = 3000
+
+# 进程内最多常驻的 WhisperX 模型数量（按 LRU 淘汰）
+MODEL_CACHE_SIZE = 2
+# 进程内最多常驻的对齐模型数量（按语言和设备缓存，LRU 淘汰）
+ALIGN_MODEL_CACHE_SIZE = 4
+
+# CPU 上 CTranslate2 支持的计算类型；默认 int8，比 float32 快且精度损失很小
+CPU_COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+CPU_DEFAULT_COMPUTE_TYPE = "int8"
+
+_model_lock = threading.Lock()
+# WhisperX pipeline 在实例上保存 tokenizer 等单次调用的状态，同一进程内的推理需要串行；
+# 分块并发时，音频解码、对齐等其余步骤仍可与推理重叠执行
+_inference_lock = threading.Lock()
+
+
+def _decode_audio(source: Union[str, bytes]):
+    """用 ffmpeg 一次解码为 16kHz 单声道 float32 波形（与 whisperx.load_audio 一致）
+
+    直接输出 f32le，省去 s16le 再转换的步骤；source 为字节数据时通过 stdin 传入，
+    不需要先写临时文件。
+    """
+    import numpy as np
+
+    is_bytes = isinstance(source, bytes)
+    # 从文件读取时禁止 ffmpeg 读 stdin；字节数据需要通过 stdin 传入
+    cmd = ["ffmpeg"] if is_bytes else ["ffmpeg", "-nostdin"]
+    cmd += [
+        "-threads",
+        "0",
+        "-i",
+        "pipe:0" if is_bytes else source,
+        "-f",
+        "f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(WHISPERX_SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        out = subprocess.run(
+            cmd,
+            input=source if is_bytes else None,
+            capture_output=True,
+            check=True,
+        ).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode()}") from e
+    return np.frombuffer(out, dtype=np.float32)
+
+
+def _resolve_download_root(model_dir: Optional[str] = None) -> Path:
+    """确定模型目录（download_root），不存在时自动创建"""
+    download_root = Path(model_dir) if model_dir else Path(MODEL_PATH) / "whisperx"
+    download_root.mkdir(parents=True, exist_ok=True)
+    return download_root
+
+
+def _cuda_available() -> bool:
+    """检查 CUDA 是否可用（只在请求 CUDA 时才导入 torch）"""
+    import torch
+
+    return torch.cuda.is_available()
+
+
+def _normalize_device(device: str, compute_type: str) -> tuple[str, str]:
+    """规范化设备和计算类型
+
+    CUDA 不可用时回退到 CPU；CPU 不支持的计算类型（如 float16）回退到 int8。
+    """
+    if device == "cuda" and not _cuda_available():
+        logger.warning("CUDA 不可用，使用 CPU")
+        device = "cpu"
+        compute_type = CPU_DEFAULT_COMPUTE_TYPE
+
+    if device == "cpu" and compute_type not in CPU_COMPUTE_TYPES:
+        logger.info(
+            f"CPU 模式下不支持 compute_type={compute_type}，"
+            f"使用 {CPU_DEFAULT_COMPUTE_TYPE}"
+        )
+        compute_type = CPU_DEFAULT_COMPUTE_TYPE
+
+    return device, compute_type
+
+
+@functools.lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _load_whisper_model(
+    model: str, device: str, compute_type: str, download_root: str
+):
+    """加载 WhisperX 模型（LRU 缓存，相同配置的模型常驻进程内存）"""
+    import whisperx
+
+    logger.info(
+        f"[WhisperX] 加载模型: model={model}, device={device}, "
+        f"compute_type={compute_type}, download_root={download_root}"
+    )
+    # 统一以自动检测语言的方式加载，具体语言在 transcribe 时传入
+    loaded_model = whisperx.load_model(
+        model,
+        device,
+        compute_type=compute_type,
+        language=None,
+        download_root=download_root,
+    )
+    logger.info("[WhisperX] 模型加载完成")
+    return loaded_model
+
+
+def _get_model(model: str, device: str, compute_type: str, download_root: Path):
+    """获取 WhisperX 模型，配置相同时直接复用已加载的模型
+
+    batch_size 只影响推理，不参与缓存键。
+    """
+    # 加锁避免并发任务重复加载同一个模型
+    with _model_lock:
+        return _load_whisper_model(model, device, compute_type, str(download_root))
+
+
+@functools.lru_cache(maxsize=ALIGN_MODEL_CACHE_SIZE)
+def _load_align_model(language: str, device: str):
+    """加载对齐模型（LRU 缓存，同一语言的后续分块和任务直接复用）"""
+    import whisperx
+
+    logger.info(f"[WhisperX] 加载对齐模型: language={language}, device={device}")
+    model_a, metadata = whisperx.load_align_model(
+        language_code=language,
+        device=device,
+    )
+    logger.info("[WhisperX] 对齐模型加载完成")
+    return model_a, metadata
+
+
+def _get_align_model(language: str, device: str):
+    """获取对齐模型，语言和设备相同时直接复用已加载的模型"""
+    with _model_lock:
+        return _load_align_model(language, device)
+
+
+def evict_models() -> None:
+    """释放进程内缓存的转录模型和对齐模型（内存紧张时调用）"""
+    with _model_lock:
+        _load_whisper_model.cache_clear()
+        _load_align_model.cache_clear()
+    logger.info("[WhisperX] 已释放缓存的模型")
+
+
+def preload_model(
+    model: str = "large-v3",
+    device: str = "cpu",
+    compute_type: str = CPU_DEFAULT_COMPUTE_TYPE,
+    model_dir: Optional[str] = None,
+    warmup: bool = True,
+    batch_size: int = 16,
+) -> None:
+    """预加载 WhisperX 模型并常驻进程内存
+
+    在 Celery worker 进程启动时调用，避免首个转录任务承担模型加载的冷启动开销。
+
+    Args:
+        model: Whisper 模型名称或 Hugging Face 模型 ID
+        device: 设备（cuda/cpu）
+        compute_type: 计算类型（float16/float32/int8）
+        model_dir: 模型存储目录（可选）
+        warmup: 是否使用 1 秒静音音频执行一次预热转录
+        batch_size: GPU 预热编码器时使用的批大小（与转录时保持一致）
+    """
+    if not WHISPERX_AVAILABLE:
+        raise ImportError("WhisperX 未安装。请运行: pip install whisperx")
+
+    device, compute_type = _normalize_device(device, compute_type)
+    loaded_model = _get_model(
+        model, device, compute_type, _resolve_download_root(model_dir)
+    )
+
+    if warmup:
+        import numpy as np
+
+        # 静音音频转录，提前完成内存页加载和计算内核初始化
+        logger.info("[WhisperX] 使用静音音频预热模型...")
+        silent_audio = np.zeros(
+            WARMUP_AUDIO_SECONDS * WHISPERX_SAMPLE_RATE, dtype=np.float32
+        )
+        loaded_model.transcribe(silent_audio, batch_size=1)
+        # 预热时检测到的语言不应影响后续自动检测
+        loaded_model.tokenizer = None
+        if device == "cuda":
+            _warmup_encoder(loaded_model, batch_size)
+        logger.info("[WhisperX] 模型预热完成")
+
+
+def _warmup_encoder(loaded_model, batch_size: int) -> None:
+    """以实际推理的输入形状执行一次编码器前向
+
+    静音音频会被 VAD 过滤掉，不会真正走到编码器。这里直接构造
+    (batch_size, n_mels, 3000) 的输入，让 CTranslate2 提前完成 CUDA
+    内核加载和显存分配，首个任务不再承担这部分开销。
+    """
+    import numpy as np
+
+    try:
+        n_mels = loaded_model.model.feat_kwargs.get("feature_size") or 80
+        features = np.zeros(
+            (batch_size, n_mels, WHISPER_CHUNK_FRAMES), dtype=np.float32
+        )
+        loaded_model.model.encode(features)
+    except Exception as e:
+        # 预热失败不影响正常使用，首个任务按需初始化
+        logger.warning(f"[WhisperX] 编码器预热失败: {str(e)}")
+
 
 class WhisperXASR(BaseASR):
     """WhisperX ASR 实现，提供精准的字词级时间戳"""
 
     def __init__(
         self,
-        audio_path: Optional[str] = None,
+        audio_path: Optional[Union[str, bytes]] = None,
         use_cache: bool = False,
         need_word_time_stamp: bool = True,
         language: str = "auto",
         model: str = "large-v3",
         device: str = "cpu",
-        compute_type: str = "float32",
+        compute_type: str = CPU_DEFAULT_COMPUTE_TYPE,
         batch_size: int = 16,
         model_dir: Optional[str] = None,
     ):
         """初始化 WhisperX ASR
 
         Args:
-            audio_path: 音频文件路径
+            audio_path: 音频文件路径或音频字节数据
             use_cache: 是否使用缓存
             need_word_time_stamp: 是否需要词级时间戳（WhisperX 总是提供）
             language: 语言代码（auto 为自动检测）
             model: Whisper 模型名称或 Hugging Face 模型 ID
             device: 设备（cuda/cpu，默认 cpu）
-            compute_type: 计算类型（float16/float32/int8，默认 float32）
+            compute_type: 计算类型（float16/float32/int8，默认 int8）
             batch_size: 批处理大小
             model_dir: 模型存储目录（可选，如果指定则从本地加载）
         """
@@ -56,28 +271,27 @@ class WhisperXASR(BaseASR):
         super().__init__(audio_path, use_cache, need_word_time_stamp=True)
         self.language = language
         self.model = model
-        self.device = device
-        self.compute_type = compute_type
         self.batch_size = batch_size
         self.model_dir = model_dir
+        # 解码后的波形（首次转录时解码，转录和对齐共用）
+        self._audio_np = None
 
-        # 自动选择设备
-        if device == "cuda" and not torch.cuda.is_available():
-            logger.warning("CUDA 不可用，使用 CPU")
-            self.device = "cpu"
-            self.compute_type = "float32"
+        # 自动选择设备，CPU 模式下确保 compute_type 受支持
+        self.device, self.compute_type = _normalize_device(device, compute_type)
 
-        # 如果使用 CPU，确保 compute_type 为 float32
-        if self.device == "cpu" and self.compute_type != "float32":
-            logger.info(
-                f"CPU 模式下强制使用 float32，忽略 compute_type={self.compute_type}"
-            )
-            self.compute_type = "float32"
+    def _get_audio_np(self):
+        """获取 16kHz float32 波形，每个实例只解码一次
+
+        audio_path 为字节数据时（ChunkedASR 的分块）直接通过管道解码。
+        """
+        if self._audio_np is None:
+            self._audio_np = _decode_audio(self.audio_path)
+        return self._audio_np
 
     def _get_key(self) -> str:
         """生成缓存键，包含模型和语言信息"""
         key_parts = [
-            self.crc32_hex,
+            self.cache_id,
             self.model,
             self.language,
             self.device,
@@ -97,47 +311,32 @@ class WhisperXASR(BaseASR):
         Returns:
             转录结果字典
         """
+        import whisperx
+
         if callback:
             callback(10, "加载 WhisperX 模型...")
 
         # 确定模型目录（download_root）
-        download_root = None
-        if self.model_dir:
-            download_root = Path(self.model_dir)
-            download_root.mkdir(parents=True, exist_ok=True)
-            logger.info(f"[WhisperX] 使用自定义模型目录: {download_root}")
-        else:
-            # 使用项目根目录下的 models/whisperx 文件夹
-            download_root = Path(MODEL_PATH) / "whisperx"
-            download_root.mkdir(parents=True, exist_ok=True)
-            logger.info(f"[WhisperX] 使用默认模型目录: {download_root}")
-
-        # 加载模型
-        logger.info(
-            f"[WhisperX] 加载模型: model={self.model}, device={self.device}, "
-            f"compute_type={self.compute_type}, download_root={download_root}"
-        )
+        download_root = _resolve_download_root(self.model_dir)
+        logger.info(f"[WhisperX] 使用模型目录: {download_root}")
 
-        model = whisperx.load_model(
-            self.model,
-            self.device,
-            compute_type=self.compute_type,
-            language=None if self.language == "auto" else self.language,
-            download_root=str(download_root),
-        )
-
-        logger.info("[WhisperX] 模型加载完成")
+        # 获取模型（已预加载时直接复用）
+        model = _get_model(self.model, self.device, self.compute_type, download_root)
 
         if callback:
             callback(30, "转录音频...")
 
-        # 转录音频
-        audio = whisperx.load_audio(self.audio_path)
-        result = model.transcribe(
-            audio,
-            batch_size=self.batch_size,
-            language=None if self.language == "auto" else self.language,
-        )
+        # 转录音频（解码在锁外进行）
+        audio = self._get_audio_np()
+        with _inference_lock:
+            # 常驻模型会保留上一次检测到的语言，自动检测时需要重置
+            if self.language == "auto":
+                model.tokenizer = None
+            result = model.transcribe(
+                audio,
+                batch_size=self.batch_size,
+                language=None if self.language == "auto" else self.language,
+            )
 
         # 保存检测到的语言信息（align 后会丢失）
         detected_language = result.get("language")
@@ -145,24 +344,9 @@ class WhisperXASR(BaseASR):
         if callback:
             callback(60, "对齐时间戳...")
 
-        # 对齐模型（用于获取精准的字词级时间戳）
-        # 对齐模型也使用相同的模型目录
-        if self.model_dir:
-            align_download_root = Path(self.model_dir)
-        else:
-            align_download_root = Path(MODEL_PATH) / "whisperx"
-
-        logger.info(
-            f"[WhisperX] 加载对齐模型: language={detected_language}, "
-            f"download_root={align_download_root}"
-        )
+        # 对齐模型（用于获取精准的字词级时间戳），按语言缓存复用
+        model_a, metadata = _get_align_model(detected_language, self.device)
 
-        model_a, metadata = whisperx.load_align_model(
-            language_code=detected_language,
-            device=self.device,
-        )
-
-        logger.info("[WhisperX] 对齐模型加载完成")
         result = whisperx.align(
             result["segments"],
             model_a,
@@ -191,43 +375,58 @@ class WhisperXASR(BaseASR):
         Returns:
             ASRDataSeg 列表（词级时间戳）
         """
-        segments = []
-
-        for segment in resp_data.get("segments", []):
-            # WhisperX 对齐后的结果包含 words 数组，每个 word 都有精确的时间戳
-            words = segment.get("words", [])
-
-            if words:
-                # 如果有词级时间戳，直接使用（这是最精确的方式）
-                for word in words:
-                    word_text = word.get("word", "").strip()
-                    if not word_text:
-                        continue
-
-                    # WhisperX 返回的时间戳是秒，需要转换为毫秒
-                    start_time = int(float(word.get("start", 0)) * 1000)
-                    end_time = int(float(word.get("end", 0)) * 1000)
-
-                    segments.append(
-                        ASRDataSeg(
-                            text=word_text,
-                            start_time=start_time,
-                            end_time=end_time,
-                        )
-                    )
-            else:
-                # 如果没有词级时间戳（理论上不应该发生），回退到句子级
-                start_time = int(segment.get("start", 0) * 1000)  # 转换为毫秒
-                end_time = int(segment.get("end", 0) * 1000)
-                text = segment.get("text", "").strip()
-
-                if text:
-                    segments.append(
-                        ASRDataSeg(
-                            text=text,
-                            start_time=start_time,
-                            end_time=end_time,
-                        )
-                    )
-
+        # 收集 (文本, 开始秒, 结束秒)，时间戳统一在 NumPy 中向量化转换
+        texts: list[str] = []
+        starts: list = []
+        ends: list = []
+
+        segments_data = resp_data.get("segments", [])
+        word_segments = resp_data.get("word_segments")
+
+        if word_segments and all(segment.get("words") for segment in segments_data):
+            # 每个句子都有词级时间戳时，直接遍历 align 返回的展平词列表，
+            # 不再逐句展开嵌套的 words
+            for word in word_segments:
+                word_text = word.get("word", "").strip()
+                if word_text:
+                    texts.append(word_text)
+                    starts.append(word.get("start", 0))
+                    ends.append(word.get("end", 0))
+        else:
+            for segment in segments_data:
+                # WhisperX 对齐后的结果包含 words 数组，每个 word 都有精确的时间戳
+                words = segment.get("words", [])
+
+                if words:
+                    # 如果有词级时间戳，直接使用（这是最精确的方式）
+                    for word in words:
+                        word_text = word.get("word", "").strip()
+                        if not word_text:
+                            continue
+                        texts.append(word_text)
+                        starts.append(word.get("start", 0))
+                        ends.append(word.get("end", 0))
+                else:
+                    # 如果没有词级时间戳（理论上不应该发生），回退到句子级
+                    text = segment.get("text", "").strip()
+                    if text:
+                        texts.append(text)
+                        starts.append(segment.get("start", 0))
+                        ends.append(segment.get("end", 0))
+
+        if not texts:
+            return []
+
+        import numpy as np
+
+        # WhisperX 返回的时间戳是秒，转换为毫秒（与 int() 一样向零截断）
+        start_ms = (np.array(starts, dtype=np.float64) * 1000).astype(np.int64)
+        end_ms = (np.array(ends, dtype=np.float64) * 1000).astype(np.int64)
+
+        segments = [
+            ASRDataSeg(text=text, start_time=start_time, end_time=end_time)
+            for text, start_time, end_time in zip(
+                texts, start_ms.tolist(), end_ms.tolist()
+            )
+        ]
         return segments
@@ -1,6 +1,8 @@
 """
-任务状态常量
+任务状态、任务类型和关联类型常量
 """
+from enum import StrEnum
+
 from app.schemas.common import TaskStatus
 
 # 任务状态常量（从 TaskStatus 枚举导出，方便使用）
@@ -10,9 +12,31 @@ TASK_STATUS_COMPLETED = TaskStatus.COMPLETED
 TASK_STATUS_FAILED = TaskStatus.FAILED
 TASK_STATUS_CANCELLED = TaskStatus.CANCELLED
 
+
+class TaskType(StrEnum):
+    """任务类型（存储在 Task.task_type）"""
+
+    VIDEO_DOWNLOAD = "video_download"
+    TRANSCRIBE = "transcribe"
+    SUBTITLE = "subtitle"
+
+
+class RelationType(StrEnum):
+    """任务关联类型（存储在 TaskRelation.relation_type）
+
+    成员本身就是 str，可直接用于数据库查询和字典键。
+    """
+
+    TRANSCRIBE = "transcribe_task_id"
+    SUBTITLE = "subtitle_task_id"
+    VIDEO = "video_task_id"
+
+
 # 也可以直接导出 TaskStatus 枚举类
 __all__ = [
     "TaskStatus",
+    "TaskType",
+    "RelationType",
     "TASK_STATUS_PENDING",
     "TASK_STATUS_RUNNING",
     "TASK_STATUS_COMPLETED",
@@ -1,13 +1,14 @@
 import datetime
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Literal, Optional
 
 if TYPE_CHECKING:
     from app.core.translate.types import TargetLanguage
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtitleProcessData:
     """字幕处理数据（翻译/优化通用）"""
 
@@ -87,282 +88,202 @@ class SubtitleLayoutEnum(Enum):
     ONLY_TRANSLATE = "仅译文"
 
 
+# FFmpeg x264/x265 编码速度预设
+FFmpegPreset = Literal[
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+    "slower",
+    "veryslow",
+]
+
+
 class VideoQualityEnum(Enum):
-    """视频合成质量"""
+    """视频合成质量（值为 (显示名称, CRF, FFmpeg preset)）"""
+
+    ULTRA_HIGH = ("极高质量", 18, "slow")
+    HIGH = ("高质量", 23, "medium")
+    MEDIUM = ("中等质量", 28, "medium")
+    LOW = ("低质量", 32, "fast")
 
-    ULTRA_HIGH = "极高质量"
-    HIGH = "高质量"
-    MEDIUM = "中等质量"
-    LOW = "低质量"
+    @property
+    def label(self) -> str:
+        """显示名称"""
+        return self.value[0]
+
+    @property
+    def crf(self) -> int:
+        """CRF 值（越小质量越高，文件越大）"""
+        return self.value[1]
+
+    @property
+    def preset(self) -> FFmpegPreset:
+        """FFmpeg preset 值（影响编码速度）"""
+        return self.value[2]
 
     def get_crf(self) -> int:
         """获取对应的 CRF 值（越小质量越高，文件越大）"""
-        crf_map = {
-            VideoQualityEnum.ULTRA_HIGH: 18,
-            VideoQualityEnum.HIGH: 23,
-            VideoQualityEnum.MEDIUM: 28,
-            VideoQualityEnum.LOW: 32,
-        }
-        return crf_map[self]
-
-    def get_preset(
-        self,
-    ) -> Literal[
-        "ultrafast",
-        "superfast",
-        "veryfast",
-        "faster",
-        "fast",
-        "medium",
-        "slow",
-        "slower",
-        "veryslow",
-    ]:
+        return self.crf
+
+    def get_preset(self) -> FFmpegPreset:
         """获取对应的 FFmpeg preset 值（影响编码速度）"""
-        preset_map: dict[
-            VideoQualityEnum,
-            Literal[
-                "ultrafast",
-                "superfast",
-                "veryfast",
-                "faster",
-                "fast",
-                "medium",
-                "slow",
-                "slower",
-                "veryslow",
-            ],
-        ] = {
-            VideoQualityEnum.ULTRA_HIGH: "slow",
-            VideoQualityEnum.HIGH: "medium",
-            VideoQualityEnum.MEDIUM: "medium",
-            VideoQualityEnum.LOW: "fast",
-        }
-        return preset_map[self]
+        return self.preset
 
 
 class TranscribeLanguageEnum(Enum):
-    """转录语言"""
-
-    ENGLISH = "英语"
-    CHINESE = "中文"
-    JAPANESE = "日本語"
-    KOREAN = "韩语"
-    YUE = "粤语"
-    FRENCH = "法语"
-    GERMAN = "德语"
-    SPANISH = "西班牙语"
-    RUSSIAN = "俄语"
-    PORTUGUESE = "葡萄牙语"
-    TURKISH = "土耳其语"
-    POLISH = "Polish"
-    CATALAN = "Catalan"
-    DUTCH = "Dutch"
-    ARABIC = "Arabic"
-    SWEDISH = "Swedish"
-    ITALIAN = "Italian"
-    INDONESIAN = "Indonesian"
-    HINDI = "Hindi"
-    FINNISH = "Finnish"
-    VIETNAMESE = "Vietnamese"
-    HEBREW = "Hebrew"
-    UKRAINIAN = "Ukrainian"
-    GREEK = "Greek"
-    MALAY = "Malay"
-    CZECH = "Czech"
-    ROMANIAN = "Romanian"
-    DANISH = "Danish"
-    HUNGARIAN = "Hungarian"
-    TAMIL = "Tamil"
-    NORWEGIAN = "Norwegian"
-    THAI = "Thai"
-    URDU = "Urdu"
-    CROATIAN = "Croatian"
-    BULGARIAN = "Bulgarian"
-    LITHUANIAN = "Lithuanian"
-    LATIN = "Latin"
-    MAORI = "Maori"
-    MALAYALAM = "Malayalam"
-    WELSH = "Welsh"
-    SLOVAK = "Slovak"
-    TELUGU = "Telugu"
-    PERSIAN = "Persian"
-    LATVIAN = "Latvian"
-    BENGALI = "Bengali"
-    SERBIAN = "Serbian"
-    AZERBAIJANI = "Azerbaijani"
-    SLOVENIAN = "Slovenian"
-    KANNADA = "Kannada"
-    ESTONIAN = "Estonian"
-    MACEDONIAN = "Macedonian"
-    BRETON = "Breton"
-    BASQUE = "Basque"
-    ICELANDIC = "Icelandic"
-    ARMENIAN = "Armenian"
-    NEPALI = "Nepali"
-    MONGOLIAN = "Mongolian"
-    BOSNIAN = "Bosnian"
-    KAZAKH = "Kazakh"
-    ALBANIAN = "Albanian"
-    SWAHILI = "Swahili"
-    GALICIAN = "Galician"
-    MARATHI = "Marathi"
-    PUNJABI = "Punjabi"
-    SINHALA = "Sinhala"
-    KHMER = "Khmer"
-    SHONA = "Shona"
-    YORUBA = "Yoruba"
-    SOMALI = "Somali"
-    AFRIKAANS = "Afrikaans"
-    OCCITAN = "Occitan"
-    GEORGIAN = "Georgian"
-    BELARUSIAN = "Belarusian"
-    TAJIK = "Tajik"
-    SINDHI = "Sindhi"
-    GUJARATI = "Gujarati"
-    AMHARIC = "Amharic"
-    YIDDISH = "Yiddish"
-    LAO = "Lao"
-    UZBEK = "Uzbek"
-    FAROESE = "Faroese"
-    HAITIAN_CREOLE = "Haitian Creole"
-    PASHTO = "Pashto"
-    TURKMEN = "Turkmen"
-    NYNORSK = "Nynorsk"
-    MALTESE = "Maltese"
-    SANSKRIT = "Sanskrit"
-    LUXEMBOURGISH = "Luxembourgish"
-    MYANMAR = "Myanmar"
-    TIBETAN = "Tibetan"
-    TAGALOG = "Tagalog"
-    MALAGASY = "Malagasy"
-    ASSAMESE = "Assamese"
-    TATAR = "Tatar"
-    HAWAIIAN = "Hawaiian"
-    LINGALA = "Lingala"
-    HAUSA = "Hausa"
-    BASHKIR = "Bashkir"
-    JAVANESE = "Javanese"
-    SUNDANESE = "Sundanese"
-    CANTONESE = "Cantonese"
-
-
-LANGUAGES = {
-    "英语": "en",
-    "中文": "zh",
-    "日本語": "ja",
-    "德语": "de",
-    "粤语": "yue",
-    "西班牙语": "es",
-    "俄语": "ru",
-    "韩语": "ko",
-    "法语": "fr",
-    "葡萄牙语": "pt",
-    "土耳其语": "tr",
-    "English": "en",
-    "Chinese": "zh",
-    "German": "de",
-    "Spanish": "es",
-    "Russian": "ru",
-    "Korean": "ko",
-    "French": "fr",
-    "Japanese": "ja",
-    "Portuguese": "pt",
-    "Turkish": "tr",
-    "Polish": "pl",
-    "Catalan": "ca",
-    "Dutch": "nl",
-    "Arabic": "ar",
-    "Swedish": "sv",
-    "Italian": "it",
-    "Indonesian": "id",
-    "Hindi": "hi",
-    "Finnish": "fi",
-    "Vietnamese": "vi",
-    "Hebrew": "he",
-    "Ukrainian": "uk",
-    "Greek": "el",
-    "Malay": "ms",
-    "Czech": "cs",
-    "Romanian": "ro",
-    "Danish": "da",
-    "Hungarian": "hu",
-    "Tamil": "ta",
-    "Norwegian": "no",
-    "Thai": "th",
-    "Urdu": "ur",
-    "Croatian": "hr",
-    "Bulgarian": "bg",
-    "Lithuanian": "lt",
-    "Latin": "la",
-    "Maori": "mi",
-    "Malayalam": "ml",
-    "Welsh": "cy",
-    "Slovak": "sk",
-    "Telugu": "te",
-    "Persian": "fa",
-    "Latvian": "lv",
-    "Bengali": "bn",
-    "Serbian": "sr",
-    "Azerbaijani": "az",
-    "Slovenian": "sl",
-    "Kannada": "kn",
-    "Estonian": "et",
-    "Macedonian": "mk",
-    "Breton": "br",
-    "Basque": "eu",
-    "Icelandic": "is",
-    "Armenian": "hy",
-    "Nepali": "ne",
-    "Mongolian": "mn",
-    "Bosnian": "bs",
-    "Kazakh": "kk",
-    "Albanian": "sq",
-    "Swahili": "sw",
-    "Galician": "gl",
-    "Marathi": "mr",
-    "Punjabi": "pa",
-    "Sinhala": "si",
-    "Khmer": "km",
-    "Shona": "sn",
-    "Yoruba": "yo",
-    "Somali": "so",
-    "Afrikaans": "af",
-    "Occitan": "oc",
-    "Georgian": "ka",
-    "Belarusian": "be",
-    "Tajik": "tg",
-    "Sindhi": "sd",
-    "Gujarati": "gu",
-    "Amharic": "am",
-    "Yiddish": "yi",
-    "Lao": "lo",
-    "Uzbek": "uz",
-    "Faroese": "fo",
-    "Haitian Creole": "ht",
-    "Pashto": "ps",
-    "Turkmen": "tk",
-    "Nynorsk": "nn",
-    "Maltese": "mt",
-    "Sanskrit": "sa",
-    "Luxembourgish": "lb",
-    "Myanmar": "my",
-    "Tibetan": "bo",
-    "Tagalog": "tl",
-    "Malagasy": "mg",
-    "Assamese": "as",
-    "Tatar": "tt",
-    "Hawaiian": "haw",
-    "Lingala": "ln",
-    "Hausa": "ha",
-    "Bashkir": "ba",
-    "Javanese": "jw",
-    "Sundanese": "su",
-    "Cantonese": "yue",
+    """转录语言（值为 (显示名称, 语言代码)）"""
+
+    ENGLISH = ("英语", "en")
+    CHINESE = ("中文", "zh")
+    JAPANESE = ("日本語", "ja")
+    KOREAN = ("韩语", "ko")
+    YUE = ("粤语", "yue")
+    FRENCH = ("法语", "fr")
+    GERMAN = ("德语", "de")
+    SPANISH = ("西班牙语", "es")
+    RUSSIAN = ("俄语", "ru")
+    PORTUGUESE = ("葡萄牙语", "pt")
+    TURKISH = ("土耳其语", "tr")
+    POLISH = ("Polish", "pl")
+    CATALAN = ("Catalan", "ca")
+    DUTCH = ("Dutch", "nl")
+    ARABIC = ("Arabic", "ar")
+    SWEDISH = ("Swedish", "sv")
+    ITALIAN = ("Italian", "it")
+    INDONESIAN = ("Indonesian", "id")
+    HINDI = ("Hindi", "hi")
+    FINNISH = ("Finnish", "fi")
+    VIETNAMESE = ("Vietnamese", "vi")
+    HEBREW = ("Hebrew", "he")
+    UKRAINIAN = ("Ukrainian", "uk")
+    GREEK = ("Greek", "el")
+    MALAY = ("Malay", "ms")
+    CZECH = ("Czech", "cs")
+    ROMANIAN = ("Romanian", "ro")
+    DANISH = ("Danish", "da")
+    HUNGARIAN = ("Hungarian", "hu")
+    TAMIL = ("Tamil", "ta")
+    NORWEGIAN = ("Norwegian", "no")
+    THAI = ("Thai", "th")
+    URDU = ("Urdu", "ur")
+    CROATIAN = ("Croatian", "hr")
+    BULGARIAN = ("Bulgarian", "bg")
+    LITHUANIAN = ("Lithuanian", "lt")
+    LATIN = ("Latin", "la")
+    MAORI = ("Maori", "mi")
+    MALAYALAM = ("Malayalam", "ml")
+    WELSH = ("Welsh", "cy")
+    SLOVAK = ("Slovak", "sk")
+    TELUGU = ("Telugu", "te")
+    PERSIAN = ("Persian", "fa")
+    LATVIAN = ("Latvian", "lv")
+    BENGALI = ("Bengali", "bn")
+    SERBIAN = ("Serbian", "sr")
+    AZERBAIJANI = ("Azerbaijani", "az")
+    SLOVENIAN = ("Slovenian", "sl")
+    KANNADA = ("Kannada", "kn")
+    ESTONIAN = ("Estonian", "et")
+    MACEDONIAN = ("Macedonian", "mk")
+    BRETON = ("Breton", "br")
+    BASQUE = ("Basque", "eu")
+    ICELANDIC = ("Icelandic", "is")
+    ARMENIAN = ("Armenian", "hy")
+    NEPALI = ("Nepali", "ne")
+    MONGOLIAN = ("Mongolian", "mn")
+    BOSNIAN = ("Bosnian", "bs")
+    KAZAKH = ("Kazakh", "kk")
+    ALBANIAN = ("Albanian", "sq")
+    SWAHILI = ("Swahili", "sw")
+    GALICIAN = ("Galician", "gl")
+    MARATHI = ("Marathi", "mr")
+    PUNJABI = ("Punjabi", "pa")
+    SINHALA = ("Sinhala", "si")
+    KHMER = ("Khmer", "km")
+    SHONA = ("Shona", "sn")
+    YORUBA = ("Yoruba", "yo")
+    SOMALI = ("Somali", "so")
+    AFRIKAANS = ("Afrikaans", "af")
+    OCCITAN = ("Occitan", "oc")
+    GEORGIAN = ("Georgian", "ka")
+    BELARUSIAN = ("Belarusian", "be")
+    TAJIK = ("Tajik", "tg")
+    SINDHI = ("Sindhi", "sd")
+    GUJARATI = ("Gujarati", "gu")
+    AMHARIC = ("Amharic", "am")
+    YIDDISH = ("Yiddish", "yi")
+    LAO = ("Lao", "lo")
+    UZBEK = ("Uzbek", "uz")
+    FAROESE = ("Faroese", "fo")
+    HAITIAN_CREOLE = ("Haitian Creole", "ht")
+    PASHTO = ("Pashto", "ps")
+    TURKMEN = ("Turkmen", "tk")
+    NYNORSK = ("Nynorsk", "nn")
+    MALTESE = ("Maltese", "mt")
+    SANSKRIT = ("Sanskrit", "sa")
+    LUXEMBOURGISH = ("Luxembourgish", "lb")
+    MYANMAR = ("Myanmar", "my")
+    TIBETAN = ("Tibetan", "bo")
+    TAGALOG = ("Tagalog", "tl")
+    MALAGASY = ("Malagasy", "mg")
+    ASSAMESE = ("Assamese", "as")
+    TATAR = ("Tatar", "tt")
+    HAWAIIAN = ("Hawaiian", "haw")
+    LINGALA = ("Lingala", "ln")
+    HAUSA = ("Hausa", "ha")
+    BASHKIR = ("Bashkir", "ba")
+    JAVANESE = ("Javanese", "jw")
+    SUNDANESE = ("Sundanese", "su")
+    CANTONESE = ("Cantonese", "yue")
+
+    @property
+    def label(self) -> str:
+        """显示名称"""
+        return self.value[0]
+
+    @property
+    def code(self) -> str:
+        """语言代码（ISO 639）"""
+        return self.value[1]
+
+    @classmethod
+    def from_label(cls, label: str) -> "TranscribeLanguageEnum":
+        """按显示名称（含英文别名）查找语言，未知名称抛出 KeyError"""
+        return _LANGUAGES_BY_LABEL[label]
+
+
+# 显示名称为中文的语言的英文别名
+_LABEL_ALIASES = {
+    "English": TranscribeLanguageEnum.ENGLISH,
+    "Chinese": TranscribeLanguageEnum.CHINESE,
+    "German": TranscribeLanguageEnum.GERMAN,
+    "Spanish": TranscribeLanguageEnum.SPANISH,
+    "Russian": TranscribeLanguageEnum.RUSSIAN,
+    "Korean": TranscribeLanguageEnum.KOREAN,
+    "French": TranscribeLanguageEnum.FRENCH,
+    "Japanese": TranscribeLanguageEnum.JAPANESE,
+    "Portuguese": TranscribeLanguageEnum.PORTUGUESE,
+    "Turkish": TranscribeLanguageEnum.TURKISH,
 }
 
+# 显示名称 -> 语言（导入时构建一次，只读）
+_LANGUAGES_BY_LABEL = MappingProxyType(
+    {
+        **{language.label: language for language in TranscribeLanguageEnum},
+        **_LABEL_ALIASES,
+    }
+)
 
-@dataclass
+# 显示名称 -> 语言代码（只读，由枚举生成，不再单独维护）
+LANGUAGES = MappingProxyType(
+    {label: language.code for label, language in _LANGUAGES_BY_LABEL.items()}
+)
+
+
+@dataclass(slots=True)
 class AudioStreamInfo:
     """音频流信息"""
 
@@ -372,7 +293,7 @@ class AudioStreamInfo:
     title: str = ""  # 音轨标题（可选）
 
 
-@dataclass
+@dataclass(slots=True)
 class VideoInfo:
     """视频信息类"""
 
@@ -390,7 +311,17 @@ class VideoInfo:
     audio_streams: list[AudioStreamInfo] = field(default_factory=list)  # 音频流列表
 
 
-@dataclass
+@dataclass(slots=True)
+class WhisperXConfig:
+    """WhisperX 转录配置"""
+
+    model: str = "large-v3"
+    device: str = "cpu"  # 默认使用 CPU
+    compute_type: str = "int8"  # CPU 默认使用 int8
+    batch_size: int = 16
+
+
+@dataclass(slots=True)
 class TranscribeConfig:
     """转录配置类"""
 
@@ -398,14 +329,11 @@ class TranscribeConfig:
     transcribe_language: str = ""
     need_word_time_stamp: bool = True
     output_format: Optional[TranscribeOutputFormatEnum] = None
-    # WhisperX 配置
-    whisperx_model: Optional[str] = "large-v3"
-    whisperx_device: str = "cpu"  # 默认使用 CPU
-    whisperx_compute_type: str = "float32"  # CPU 默认使用 float32
-    whisperx_batch_size: int = 16
+    # 各转录模型的专属配置（未设置时使用默认值）
+    whisperx: Optional[WhisperXConfig] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtitleConfig:
     """字幕处理配置类"""
 
@@ -431,7 +359,7 @@ class SubtitleConfig:
     custom_prompt_text: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SynthesisConfig:
     """视频合成配置类"""
 
@@ -440,7 +368,7 @@ class SynthesisConfig:
     video_quality: VideoQualityEnum = VideoQualityEnum.MEDIUM
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscribeTask:
     """转录任务类"""
 
@@ -463,7 +391,7 @@ class TranscribeTask:
     transcribe_config: Optional[TranscribeConfig] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtitleTask:
     """字幕任务类"""
 
@@ -485,7 +413,7 @@ class SubtitleTask:
     subtitle_config: Optional[SubtitleConfig] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SynthesisTask:
     """视频合成任务类"""
 
@@ -2,12 +2,14 @@
 
 from .check_llm import check_llm_connection, get_available_models
 from .check_whisper import check_whisper_connection
-from .client import call_llm, get_llm_client
+from .client import acall_llm, call_llm, get_async_llm_client, get_llm_client
 from .health_check import get_health_checker, LLMHealthChecker, LLMHealthStatus
 
 __all__ = [
     "get_llm_client",
+    "get_async_llm_client",
     "call_llm",
+    "acall_llm",
     "check_llm_connection",
     "get_available_models",
     "check_whisper_connection",
@@ -2,13 +2,17 @@
 
 from typing import Literal, Optional
 
+import httpx
 import openai
 
 from app.core.llm.client import normalize_base_url
 
 
 def check_llm_connection(
-    base_url: str, api_key: str, model: str
+    base_url: str,
+    api_key: str,
+    model: str,
+    http_client: Optional[httpx.Client] = None,
 ) -> tuple[Literal[True], Optional[str]] | tuple[Literal[False], Optional[str]]:
     """测试 LLM API 连接
 
@@ -18,6 +22,8 @@ def check_llm_connection(
         base_url: API 基础 URL
         api_key: API 密钥
         model: 模型名称
+        http_client: 复用的 HTTP 客户端（保持连接，避免每次检查重新握手），
+            为 None 时由 OpenAI 客户端自行创建
 
     返回:
         (是否成功, 错误信息或AI助手的回复)
@@ -27,7 +33,7 @@ def check_llm_connection(
         base_url = normalize_base_url(base_url)
         api_key = api_key.strip()
         response = openai.OpenAI(
-            base_url=base_url, api_key=api_key, timeout=60
+            base_url=base_url, api_key=api_key, timeout=60, http_client=http_client
         ).chat.completions.create(
             model=model,
             messages=[
@@ -1,12 +1,15 @@
 """Unified LLM client for the application."""
 
+import asyncio
 import os
 import threading
+import weakref
 from typing import Any, List, Optional
 from urllib.parse import urlparse, urlunparse
 
+import httpx
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from tenacity import (
     RetryCallState,
     retry,
@@ -15,12 +18,18 @@ from tenacity import (
     wait_random_exponential,
 )
 
-from app.core.utils.cache import get_llm_cache, memoize
+from app.core.utils.cache import amemoize, get_llm_cache, memoize
 from app.core.utils.logger import setup_logger
 
 _global_client: Optional[OpenAI] = None
+# One async client per event loop: httpx.AsyncClient connections are bound to
+# the loop that opened them and fail once that loop is closed and replaced
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 _client_lock = threading.Lock()
 
+# Connection pool size of the shared async client
+ASYNC_MAX_CONNECTIONS = 20
+
 logger = setup_logger("llm_client")
 
 
@@ -85,20 +94,62 @@ def get_llm_client() -> OpenAI:
         with _client_lock:
             # Double-check locking pattern
             if _global_client is None:
-                base_url = os.getenv("OPENAI_BASE_URL", "").strip()
-                base_url = normalize_base_url(base_url)
-                api_key = os.getenv("OPENAI_API_KEY", "").strip()
-
-                if not base_url or not api_key:
-                    raise ValueError(
-                        "OPENAI_BASE_URL and OPENAI_API_KEY environment variables must be set"
-                    )
-
+                base_url, api_key = _get_client_config()
                 _global_client = OpenAI(base_url=base_url, api_key=api_key)
 
     return _global_client
 
 
+def get_async_llm_client() -> AsyncOpenAI:
+    """Get the async LLM client for the running event loop (pooled HTTP client).
+
+    Requests are issued on the running event loop, so concurrent calls share
+    keep-alive connections instead of each occupying an executor thread.
+    Each loop gets its own client; it is dropped together with the loop.
+
+    Returns:
+        AsyncOpenAI client bound to the running event loop
+
+    Raises:
+        RuntimeError: If called without a running event loop
+        ValueError: If OPENAI_BASE_URL or OPENAI_API_KEY env vars not set
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None:
+        with _client_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                base_url, api_key = _get_client_config()
+                client = _async_clients[loop] = AsyncOpenAI(
+                    base_url=base_url,
+                    api_key=api_key,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=ASYNC_MAX_CONNECTIONS,
+                            max_keepalive_connections=ASYNC_MAX_CONNECTIONS,
+                        ),
+                    ),
+                )
+
+    return client
+
+
+def _get_client_config() -> tuple[str, str]:
+    """Read base URL and API key from environment variables."""
+    base_url = os.getenv("OPENAI_BASE_URL", "").strip()
+    base_url = normalize_base_url(base_url)
+    api_key = os.getenv("OPENAI_API_KEY", "").strip()
+
+    if not base_url or not api_key:
+        raise ValueError(
+            "OPENAI_BASE_URL and OPENAI_API_KEY environment variables must be set"
+        )
+
+    return base_url, api_key
+
+
 def before_sleep_log(retry_state: RetryCallState) -> None:
     logger.warning(
         "Rate Limit Error, sleeping and retrying... Please lower your thread concurrency or use better OpenAI API."
@@ -144,6 +195,54 @@ def call_llm(
     )
 
     # Validate response (exceptions are not cached by diskcache)
+    _validate_response(response)
+
+    return response
+
+
+@amemoize(get_llm_cache(), expire=3600, typed=True)
+@retry(
+    stop=stop_after_attempt(10),
+    wait=wait_random_exponential(multiplier=1, min=5, max=60),
+    retry=retry_if_exception_type(openai.RateLimitError),
+    before_sleep=before_sleep_log,
+)
+async def acall_llm(
+    messages: List[dict],
+    model: str,
+    temperature: float = 1,
+    **kwargs: Any,
+) -> Any:
+    """Async version of call_llm, using the pooled async client.
+
+    Args:
+        messages: Chat messages list
+        model: Model name
+        temperature: Sampling temperature
+        **kwargs: Additional parameters for API call
+
+    Returns:
+        API response object
+
+    Raises:
+        ValueError: If response is invalid (empty choices or content)
+    """
+    client = get_async_llm_client()
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=messages,  # pyright: ignore[reportArgumentType]
+        temperature=temperature,
+        **kwargs,
+    )
+
+    _validate_response(response)
+
+    return response
+
+
+def _validate_response(response: Any) -> None:
+    """Raise ValueError if response has no usable content."""
     if not (
         response
         and hasattr(response, "choices")
@@ -153,5 +252,3 @@ def call_llm(
         and response.choices[0].message.content
     ):
         raise ValueError("Invalid OpenAI API response: empty choices or content")
-
-    return response
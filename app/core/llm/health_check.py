@@ -6,27 +6,37 @@ LLM 健康检查服务
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from typing import Optional
 
+import httpx
+
 from app.core.llm.check_llm import check_llm_connection
 from app.core.utils.logger import setup_logger
 from app.config import LLM_API_BASE, LLM_API_KEY, LLM_MODEL
 
 logger = setup_logger("llm_health_check")
 
+# 定时检查时并行执行的最大线程数
+PERIODIC_CHECK_MAX_WORKERS = 8
+
+# 尚无配置时的空闲等待粒度（秒），期间可响应停止信号
+IDLE_WAIT_INTERVAL = 1
+
+# 健康检查共用的 HTTP 连接池配置
+HTTP_TIMEOUT = 10
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class LLMHealthStatus:
-    """LLM 健康状态"""
+    """LLM 健康状态（不含凭据，可安全打印/记录日志）"""
 
-    base_url: str
-    api_key: str
-    model: str
     is_healthy: bool
     message: Optional[str]
-    last_check_time: datetime
+    # 上次检查的单调时钟时间戳（time.monotonic()），不受系统时间调整影响
+    last_check_mono: float
     check_count: int = 0
 
 
@@ -41,10 +51,26 @@ class LLMHealthChecker:
             check_interval: 检查间隔（秒），默认 1 分钟
         """
         self.check_interval = check_interval
+        # 不健康结果的缓存时间更短：故障恢复能尽快发现，又不会每次请求都重试
+        self.unhealthy_ttl = max(5, check_interval // 6)
+        # 健康状态快照：只在持有 lock 时整体替换（写时复制），读取无需加锁
         self.health_status: dict[str, LLMHealthStatus] = {}
+        # 各配置的连接参数 (base_url, api_key, model)，与 health_status 一同替换，
+        # 完整的 API 密钥只保存在这里，供定时检查使用
+        self._creds: dict[str, tuple[str, str, str]] = {}
+        # 正在执行检查的配置，同一配置的并发请求等待同一次检查
+        self._inflight: dict[str, threading.Event] = {}
         self.lock = threading.Lock()
+        # 保护定时检查的启动/停止，与状态锁分开避免互相争用
+        self._lifecycle_lock = threading.Lock()
+        # 共用的 HTTP 客户端，在多次检查之间保持连接（keep-alive）
+        self._http: Optional[httpx.Client] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # 停止信号：等待检查间隔时可被立即唤醒
+        self._stop_event = threading.Event()
+        # 是否存在已缓存的配置：为空时定时检查循环空闲等待
+        self._has_configs = threading.Event()
 
     def _get_config_key(self, base_url: str, api_key: str, model: str) -> str:
         """生成配置的唯一标识"""
@@ -58,6 +84,9 @@ class LLMHealthChecker:
         """
         检查 LLM 健康状态
 
+        缓存命中时无锁读取状态快照；未命中时同一配置只由一个线程执行网络检查，
+        其他线程等待该检查完成后直接使用其结果。
+
         Args:
             base_url: API 基础 URL
             api_key: API 密钥
@@ -69,50 +98,86 @@ class LLMHealthChecker:
         """
         config_key = self._get_config_key(base_url, api_key, model)
 
-        with self.lock:
+        # 如果存在缓存且未过期，且不是强制检查，则返回缓存结果
+        # （health_status 只会被整体替换，读取引用无需加锁）
+        if not force:
             status = self.health_status.get(config_key)
-
-            # 如果存在缓存且未过期，且不是强制检查，则返回缓存结果
-            if status and not force:
-                # 检查是否在有效期内（检查间隔内）
-                time_since_check = datetime.now() - status.last_check_time
-                if time_since_check < timedelta(seconds=self.check_interval):
+            if status:
+                # 检查是否在有效期内（健康结果为检查间隔，不健康结果为 unhealthy_ttl）
+                ttl = self.check_interval if status.is_healthy else self.unhealthy_ttl
+                time_since_check = time.monotonic() - status.last_check_mono
+                if time_since_check < ttl:
                     logger.debug(
                         f"使用缓存的健康检查结果: {config_key}, "
                         f"健康状态: {status.is_healthy}, "
-                        f"距离上次检查: {time_since_check.total_seconds():.1f}秒"
+                        f"距离上次检查: {time_since_check:.1f}秒"
                     )
                     return status.is_healthy, status.message
 
-            # 执行健康检查
-            logger.info(f"执行 LLM 健康检查: base_url={base_url}, model={model}")
-            is_healthy, message = check_llm_connection(base_url, api_key, model)
+        # 同一配置已有线程在检查时，等待其结果
+        with self.lock:
+            event = self._inflight.get(config_key)
+            is_owner = event is None
+            if is_owner:
+                event = self._inflight[config_key] = threading.Event()
 
-            # 更新状态
+        if not is_owner:
+            event.wait()
+            status = self.health_status.get(config_key)
             if status:
-                status.is_healthy = is_healthy
-                status.message = message
-                status.last_check_time = datetime.now()
-                status.check_count += 1
-            else:
-                status = LLMHealthStatus(
-                    base_url=base_url,
-                    api_key=api_key,
-                    model=model,
-                    is_healthy=is_healthy,
-                    message=message,
-                    last_check_time=datetime.now(),
-                    check_count=1,
-                )
-                self.health_status[config_key] = status
-
-            logger.info(
-                f"LLM 健康检查完成: {config_key}, "
-                f"健康状态: {is_healthy}, "
-                f"消息: {message or 'OK'}"
+                return status.is_healthy, status.message
+            # 检查线程出错未写入结果，自行检查
+            return self._run_check(config_key, base_url, api_key, model)
+
+        try:
+            return self._run_check(config_key, base_url, api_key, model)
+        finally:
+            with self.lock:
+                self._inflight.pop(config_key, None)
+            event.set()
+
+    def _run_check(
+        self, config_key: str, base_url: str, api_key: str, model: str
+    ) -> tuple[bool, Optional[str]]:
+        """执行健康检查（不持有锁），完成后以写时复制的方式发布新状态"""
+        logger.info(f"执行 LLM 健康检查: base_url={base_url}, model={model}")
+        is_healthy, message = check_llm_connection(
+            base_url, api_key, model, http_client=self._get_http_client()
+        )
+
+        # 更新状态：构建新字典后整体替换，读者始终看到完整的快照
+        with self.lock:
+            previous = self.health_status.get(config_key)
+            health_status = dict(self.health_status)
+            health_status[config_key] = LLMHealthStatus(
+                is_healthy=is_healthy,
+                message=message,
+                last_check_mono=time.monotonic(),
+                check_count=previous.check_count + 1 if previous else 1,
             )
+            creds = dict(self._creds)
+            creds[config_key] = (base_url, api_key, model)
+            self._creds = creds
+            self.health_status = health_status
+            self._has_configs.set()
+
+        logger.info(
+            f"LLM 健康检查完成: {config_key}, "
+            f"健康状态: {is_healthy}, "
+            f"消息: {message or 'OK'}"
+        )
+
+        return is_healthy, message
 
-            return is_healthy, message
+    def _get_http_client(self) -> httpx.Client:
+        """获取共用的 HTTP 客户端（惰性创建）"""
+        client = self._http
+        if client is None:
+            with self.lock:
+                if self._http is None:
+                    self._http = httpx.Client(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+                client = self._http
+        return client
 
     def check_and_setup(
         self, base_url: str, api_key: str, model: str, force: bool = False
@@ -179,22 +244,13 @@ class LLMHealthChecker:
 
         logger.info(f"LLM 连接验证成功: base_url={base_url}, model={model}")
 
-    def get_health_status(
+    def _resolve_config_key(
         self,
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-    ) -> Optional[LLMHealthStatus]:
-        """获取健康状态（不执行检查）
-
-        Args:
-            base_url: API 基础 URL，如果为 None 则从默认配置获取
-            api_key: API 密钥，如果为 None 则从默认配置获取
-            model: 模型名称，如果为 None 则从默认配置获取
-
-        Returns:
-            健康状态，如果未找到则返回 None
-        """
+    ) -> Optional[str]:
+        """补全未提供的配置参数并生成配置标识，配置不完整时返回 None"""
         # 如果参数未提供，从默认配置获取
         if not base_url or not api_key or not model:
             try:
@@ -218,64 +274,149 @@ class LLMHealthChecker:
         if not base_url or not api_key or not model:
             return None
 
-        config_key = self._get_config_key(base_url, api_key, model)
-        with self.lock:
-            return self.health_status.get(config_key)
+        return self._get_config_key(base_url, api_key, model)
+
+    def get_health_status(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Optional[LLMHealthStatus]:
+        """获取健康状态（不执行检查）
+
+        Args:
+            base_url: API 基础 URL，如果为 None 则从默认配置获取
+            api_key: API 密钥，如果为 None 则从默认配置获取
+            model: 模型名称，如果为 None 则从默认配置获取
+
+        Returns:
+            健康状态，如果未找到则返回 None
+        """
+        config_key = self._resolve_config_key(base_url, api_key, model)
+        if config_key is None:
+            return None
+        return self.health_status.get(config_key)
+
+    def get_healthy_model(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """获取健康配置的模型名称（不执行检查）
+
+        参数含义同 get_health_status。
+
+        Returns:
+            模型名称，如果配置未检查过或不健康则返回 None
+        """
+        config_key = self._resolve_config_key(base_url, api_key, model)
+        if config_key is None:
+            return None
+        # 先取状态再取凭据：写入时凭据先于状态发布，读到状态时凭据必然存在
+        status = self.health_status.get(config_key)
+        creds = self._creds.get(config_key)
+        if not creds or not status or not status.is_healthy:
+            return None
+        return creds[2]
 
     def start_periodic_check(self):
         """启动定时检查"""
-        if self.running:
-            logger.warning("健康检查已在运行")
-            return
-
-        self.running = True
-        self.thread = threading.Thread(target=self._periodic_check_loop, daemon=True)
-        self.thread.start()
+        with self._lifecycle_lock:
+            if self.running:
+                logger.warning("健康检查已在运行")
+                return
+
+            self.running = True
+            # 每次启动使用新的停止信号：上一次未及时退出的线程仍持有已触发的旧信号，
+            # 不会因重新启动而继续运行
+            self._stop_event = threading.Event()
+            self.thread = threading.Thread(
+                target=self._periodic_check_loop,
+                args=(self._stop_event,),
+                daemon=True,
+            )
+            self.thread.start()
         logger.info(f"LLM 健康检查已启动，检查间隔: {self.check_interval}秒")
 
     def stop_periodic_check(self):
         """停止定时检查"""
-        if not self.running:
-            return
-
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        with self._lifecycle_lock:
+            if not self.running:
+                return
+
+            self.running = False
+            self._stop_event.set()
+            if self.thread:
+                self.thread.join(timeout=5)
+
+            # 关闭连接池，之后的检查会重新创建客户端
+            with self.lock:
+                client, self._http = self._http, None
+            if client is not None:
+                client.close()
         logger.info("LLM 健康检查已停止")
 
-    def _periodic_check_loop(self):
+    def _wait_for_configs(self, stop_event: threading.Event) -> bool:
+        """空闲等待直到存在已缓存的配置，停止时返回 False"""
+        while not stop_event.is_set():
+            if self._has_configs.wait(IDLE_WAIT_INTERVAL):
+                return True
+        return False
+
+    def _periodic_check_loop(self, stop_event: threading.Event):
         """定时检查循环"""
-        while self.running:
+        while not stop_event.is_set():
             try:
-                with self.lock:
-                    # 复制当前的状态列表，避免在迭代时修改
-                    configs_to_check = list(self.health_status.values())
+                # 尚无已缓存的配置时空闲等待，不进入检查周期
+                if not self._wait_for_configs(stop_event):
+                    break
+
+                # 等待检查间隔（停止时立即返回）
+                if stop_event.wait(self.check_interval):
+                    break
+
+                # 取当前快照的配置列表（快照不会被原地修改）
+                configs_to_check = list(self._creds.values())
 
                 # 检查所有已缓存的配置
-                for status in configs_to_check:
-                    if not self.running:
-                        break
-
-                    try:
-                        logger.debug(
-                            f"定时检查 LLM 健康状态: "
-                            f"base_url={status.base_url}, model={status.model}"
-                        )
-                        self.check_health(
-                            status.base_url, status.api_key, status.model, force=True
-                        )
-                    except Exception as e:
-                        logger.error(f"定时健康检查失败: {e}", exc_info=True)
-
-                # 等待检查间隔
-                for _ in range(self.check_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                if configs_to_check:
+                    self._check_all(configs_to_check)
 
             except Exception as e:
                 logger.error(f"健康检查循环出错: {e}", exc_info=True)
-                time.sleep(60)  # 出错后等待1分钟再继续
+                # 出错后等待1分钟再继续
+                if stop_event.wait(60):
+                    break
+
+    def _check_all(self, configs_to_check: list[tuple[str, str, str]]):
+        """并行检查所有配置，单轮耗时取决于最慢的一次检查而非总和"""
+        executor = ThreadPoolExecutor(
+            max_workers=min(PERIODIC_CHECK_MAX_WORKERS, len(configs_to_check)),
+            thread_name_prefix="llm_health_check",
+        )
+        try:
+            futures = [
+                executor.submit(self._periodic_check_one, *config)
+                for config in configs_to_check
+            ]
+            _, not_done = wait(futures, timeout=self.check_interval * 0.9)
+            if not_done:
+                logger.warning(f"{len(not_done)} 个健康检查未在检查间隔内完成")
+        finally:
+            # 不等待未完成的检查，尚未开始的直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _periodic_check_one(self, base_url: str, api_key: str, model: str):
+        """定时检查单个配置"""
+        if not self.running:
+            return
+
+        try:
+            logger.debug(f"定时检查 LLM 健康状态: base_url={base_url}, model={model}")
+            self.check_health(base_url, api_key, model, force=True)
+        except Exception as e:
+            logger.error(f"定时健康检查失败: {e}", exc_info=True)
 
     def clear_cache(self, base_url: str = None, api_key: str = None, model: str = None):
         """
@@ -288,22 +429,33 @@ class LLMHealthChecker:
         """
         with self.lock:
             if base_url or api_key or model:
-                # 清除匹配的配置
-                keys_to_remove = []
-                for key, status in self.health_status.items():
-                    if (
-                        (not base_url or status.base_url == base_url)
-                        and (not api_key or status.api_key == api_key)
-                        and (not model or status.model == model)
-                    ):
-                        keys_to_remove.append(key)
-                for key in keys_to_remove:
-                    del self.health_status[key]
-                logger.info(f"已清除 {len(keys_to_remove)} 个健康检查缓存")
+                # 清除匹配的配置（构建新快照后整体替换）
+                creds = {
+                    config_key: (url, key, name)
+                    for config_key, (url, key, name) in self._creds.items()
+                    if not (
+                        (not base_url or url == base_url)
+                        and (not api_key or key == api_key)
+                        and (not model or name == model)
+                    )
+                }
+                health_status = {
+                    key: status
+                    for key, status in self.health_status.items()
+                    if key in creds
+                }
+                removed = len(self.health_status) - len(health_status)
+                self._creds = creds
+                self.health_status = health_status
+                if not health_status:
+                    self._has_configs.clear()
+                logger.info(f"已清除 {removed} 个健康检查缓存")
             else:
                 # 清除所有缓存
                 count = len(self.health_status)
-                self.health_status.clear()
+                self._creds = {}
+                self.health_status = {}
+                self._has_configs.clear()
                 logger.info(f"已清除所有健康检查缓存（{count} 个）")
 
 
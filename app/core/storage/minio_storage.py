@@ -3,11 +3,15 @@ MinIO 对象存储服务
 """
 
 import io
+import os
 from pathlib import Path
-from typing import Optional, BinaryIO
+from typing import BinaryIO, Iterator, Optional
 from urllib.parse import urlparse
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.datatypes import Object
 from minio.error import S3Error
 from minio.commonconfig import REPLACE
 
@@ -32,10 +36,49 @@ def _get_logger():
     return _logger_instance
 
 
+# 流式下载时使用的缓冲区大小（4 MiB，减少小块读写的系统调用次数）
+DOWNLOAD_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 上传分片大小（64 MiB，数百 MB 的音视频走 multipart 时减少分片请求数）
+UPLOAD_PART_SIZE = 64 * 1024 * 1024
+
+# HTTP 连接池：Minio 默认 maxsize=10，全局单例被多个线程共用时会争用连接
+HTTP_NUM_POOLS = 10
+HTTP_POOL_MAXSIZE = 64
+
+# 文件扩展名 -> 内容类型
+_CONTENT_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".wav": "audio/wav",
+    ".srt": "text/plain",
+    ".ass": "text/plain",
+    ".vtt": "text/vtt",
+    ".json": "application/json",
+    ".txt": "text/plain",
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+}
+
 # 全局存储实例
 _storage_instance: Optional["MinIOStorage"] = None
 
 
+def _create_http_client() -> urllib3.PoolManager:
+    """创建 MinIO 客户端使用的 HTTP 连接池（keep-alive，连接数按并发调大）"""
+    return urllib3.PoolManager(
+        timeout=urllib3.Timeout.DEFAULT_TIMEOUT,
+        num_pools=HTTP_NUM_POOLS,
+        maxsize=HTTP_POOL_MAXSIZE,
+        block=False,
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+    )
+
+
 class MinIOStorage:
     """MinIO 对象存储服务"""
 
@@ -75,6 +118,7 @@ class MinIOStorage:
                 access_key=access_key,
                 secret_key=secret_key,
                 secure=secure,
+                http_client=_create_http_client(),
             )
             # 确保存储桶存在
             self._ensure_bucket_exists()
@@ -102,6 +146,7 @@ class MinIOStorage:
         object_name: Optional[str] = None,
         bucket_name: Optional[str] = None,
         content_type: Optional[str] = None,
+        part_size: int = UPLOAD_PART_SIZE,
     ) -> str:
         """上传文件到 MinIO
 
@@ -110,6 +155,7 @@ class MinIOStorage:
             object_name: 对象名称（如果不提供，使用文件路径）
             bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
             content_type: 内容类型（如果不提供，根据文件扩展名自动推断）
+            part_size: multipart 上传的分片大小
 
         Returns:
             对象名称（可用于后续访问）
@@ -131,6 +177,7 @@ class MinIOStorage:
                 object_name=object_name,
                 file_path=file_path,
                 content_type=content_type,
+                part_size=part_size,
             )
             _get_logger().debug(f"文件上传成功: {file_path} -> {bucket}/{object_name}")
             return object_name
@@ -146,6 +193,7 @@ class MinIOStorage:
         object_name: str,
         bucket_name: Optional[str] = None,
         content_type: Optional[str] = None,
+        part_size: int = UPLOAD_PART_SIZE,
     ) -> str:
         """上传字节数据到 MinIO
 
@@ -154,6 +202,7 @@ class MinIOStorage:
             object_name: 对象名称
             bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
             content_type: 内容类型
+            part_size: 超过该大小时走 multipart 上传的分片大小
 
         Returns:
             对象名称
@@ -173,6 +222,7 @@ class MinIOStorage:
                 data=data_stream,
                 length=len(data),
                 content_type=content_type,
+                part_size=part_size,
             )
             _get_logger().debug(
                 f"字节数据上传成功: {bucket}/{object_name}, 大小: {len(data)} 字节"
@@ -220,40 +270,152 @@ class MinIOStorage:
             )
             raise
 
-    def download_bytes(
+    def download_to_fileobj(
         self,
         object_name: str,
+        file_obj: BinaryIO,
         bucket_name: Optional[str] = None,
-    ) -> bytes:
-        """从 MinIO 下载对象为字节数据
+        buffer_size: int = DOWNLOAD_BUFFER_SIZE,
+    ) -> int:
+        """从 MinIO 流式下载对象并写入已打开的文件对象
+
+        使用大缓冲区分块拷贝，不会把整个对象读入内存。
+        只要求 file_obj 支持 write，也可以直接传入管道（如 ffmpeg 的 stdin）。
 
         Args:
             object_name: 对象名称
+            file_obj: 以二进制写模式打开的文件对象、BytesIO 或管道
             bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
+            buffer_size: 拷贝缓冲区大小（字节）
 
         Returns:
-            字节数据
+            写入的字节数
         """
         bucket = bucket_name or self.bucket_name
 
+        response = None
         try:
             # MinIO 7.x 要求所有参数都是关键字参数
             response = self.client.get_object(
                 bucket_name=bucket,
                 object_name=object_name,
             )
-            data = response.read()
-            response.close()
-            response.release_conn()
+            # 提示内核按顺序写入（仅 Linux 等支持 posix_fadvise 的平台）
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    os.posix_fadvise(
+                        file_obj.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL
+                    )
+                except (OSError, io.UnsupportedOperation):
+                    pass
+            # 自行计数而不用 tell()，管道等不可定位的对象同样适用
+            size = 0
+            while chunk := response.read(buffer_size):
+                file_obj.write(chunk)
+                size += len(chunk)
+            file_obj.flush()
             _get_logger().debug(
-                f"字节数据下载成功: {bucket}/{object_name}, 大小: {len(data)} 字节"
+                f"流式下载成功: {bucket}/{object_name}, 大小: {size} 字节"
             )
-            return data
+            return size
         except S3Error as e:
             _get_logger().error(
-                f"字节数据下载失败: {object_name}, 错误: {str(e)}", exc_info=True
+                f"流式下载失败: {object_name}, 错误: {str(e)}", exc_info=True
             )
             raise
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    def open_object(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> urllib3.BaseHTTPResponse:
+        """发起 GET 请求并返回未读取的响应，由调用方流式读取
+
+        调用方读取完毕后必须调用 close() 和 release_conn() 归还连接。
+
+        Args:
+            object_name: 对象名称
+            bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
+            etag: 期望的对象 ETag；提供时以 If-Match 发起请求，
+                对象已被替换则抛出 PreconditionFailed 的 S3Error
+
+        Returns:
+            对象的 HTTP 响应
+        """
+        bucket = bucket_name or self.bucket_name
+        request_headers = {"If-Match": f'"{etag}"'} if etag else None
+
+        # MinIO 7.x 要求所有参数都是关键字参数
+        return self.client.get_object(
+            bucket_name=bucket,
+            object_name=object_name,
+            request_headers=request_headers,
+        )
+
+    def iter_chunks(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_BUFFER_SIZE,
+    ) -> Iterator[bytes]:
+        """流式读取 MinIO 对象，按块产出字节数据
+
+        不会把整个对象读入内存，适合计算校验值等只需顺序读取一次的场景。
+
+        Args:
+            object_name: 对象名称
+            bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
+            chunk_size: 每块大小（字节）
+
+        Yields:
+            对象内容的字节块
+        """
+        bucket = bucket_name or self.bucket_name
+
+        response = None
+        try:
+            # MinIO 7.x 要求所有参数都是关键字参数
+            response = self.client.get_object(
+                bucket_name=bucket,
+                object_name=object_name,
+            )
+            yield from response.stream(chunk_size)
+        except S3Error as e:
+            _get_logger().error(
+                f"流式读取失败: {object_name}, 错误: {str(e)}", exc_info=True
+            )
+            raise
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
+    def download_bytes(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+    ) -> bytes:
+        """从 MinIO 下载对象为字节数据
+
+        分块流式写入 BytesIO，getvalue() 直接返回内部缓冲区，
+        不会像 response.read() 那样在拼接最终结果时多占一份内存。
+        只需顺序消费数据的调用方应直接使用 download_to_fileobj。
+
+        Args:
+            object_name: 对象名称
+            bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
+
+        Returns:
+            字节数据
+        """
+        buffer = io.BytesIO()
+        self.download_to_fileobj(object_name, buffer, bucket_name=bucket_name)
+        return buffer.getvalue()
 
     def delete_file(
         self,
@@ -311,6 +473,31 @@ class MinIOStorage:
         except S3Error:
             return False
 
+    def stat_file(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+    ) -> Optional[Object]:
+        """获取对象元数据（一次 HEAD 请求）
+
+        Args:
+            object_name: 对象名称
+            bucket_name: 存储桶名称（如果不提供，使用默认存储桶）
+
+        Returns:
+            对象元数据（包含 size、etag 等），不存在时返回 None
+        """
+        bucket = bucket_name or self.bucket_name
+
+        try:
+            # MinIO 7.x 要求所有参数都是关键字参数
+            return self.client.stat_object(
+                bucket_name=bucket,
+                object_name=object_name,
+            )
+        except S3Error:
+            return None
+
     def get_file_url(
         self,
         object_name: str,
@@ -342,20 +529,8 @@ class MinIOStorage:
 
     def _get_content_type(self, file_path: str) -> str:
         """根据文件扩展名推断内容类型"""
-        ext = Path(file_path).suffix.lower()
-        content_types = {
-            ".mp3": "audio/mpeg",
-            ".m4a": "audio/mp4",
-            ".wav": "audio/wav",
-            ".srt": "text/plain",
-            ".ass": "text/plain",
-            ".vtt": "text/vtt",
-            ".json": "application/json",
-            ".txt": "text/plain",
-            ".mp4": "video/mp4",
-            ".webm": "video/webm",
-        }
-        return content_types.get(ext, "application/octet-stream")
+        ext = os.path.splitext(file_path)[1].lower()
+        return _CONTENT_TYPES.get(ext, "application/octet-stream")
 
 
 def get_storage() -> MinIOStorage:
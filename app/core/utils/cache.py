@@ -5,13 +5,16 @@ Can be used by translation, ASR, and other modules that need caching.
 """
 
 import functools
-import hashlib
-import json
 import pickle
-from dataclasses import asdict, is_dataclass
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
 from typing import Any, Optional
 
+import orjson
 import redis
+import xxhash
 from redis.exceptions import ConnectionError as RedisConnectionError
 
 from app.config import REDIS_URL
@@ -35,7 +38,7 @@ def _get_redis_client() -> redis.Redis:
         try:
             _redis_pool = redis.ConnectionPool.from_url(
                 REDIS_URL,
-                decode_responses=False,  # 使用二进制模式，支持 pickle
+                decode_responses=False,  # 使用二进制模式，缓存值为 orjson/pickle 字节
                 max_connections=50,
             )
             _redis_client = redis.Redis(connection_pool=_redis_pool)
@@ -76,6 +79,88 @@ CACHE_PREFIX_TRANSLATE = "cache:translate:"
 CACHE_PREFIX_VERSION = "cache:version:"
 
 
+# 缓存值格式：1 字节标记 + 数据
+# JSON 原生类型用 orjson（更快、更小），其他对象回退到 pickle
+_VALUE_FORMAT_JSON = b"J"
+_VALUE_FORMAT_PICKLE = b"P"
+# 加标记之前写入的缓存值是裸 pickle（协议 2 及以上以 0x80 开头）
+_PICKLE_PROTO_MARKER = b"\x80"
+
+
+def _is_json_native(obj: Any) -> bool:
+    """判断对象能否经 orjson 原样往返（tuple、dataclass 等会变成 list/dict）"""
+    if obj is None or type(obj) in (str, int, float, bool):
+        return True
+    if type(obj) is list:
+        return all(_is_json_native(item) for item in obj)
+    if type(obj) is dict:
+        return all(type(k) is str and _is_json_native(v) for k, v in obj.items())
+    return False
+
+
+def _dumps_value(value: Any) -> bytes:
+    """序列化缓存值"""
+    if _is_json_native(value):
+        try:
+            return _VALUE_FORMAT_JSON + orjson.dumps(value)
+        except TypeError:
+            pass  # 超出 64 位范围的整数等 orjson 不支持的值
+    return _VALUE_FORMAT_PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads_value(data: bytes) -> Any:
+    """反序列化 _dumps_value 生成的缓存值（兼容旧的裸 pickle 数据）"""
+    marker = data[:1]
+    if marker == _VALUE_FORMAT_JSON:
+        return orjson.loads(data[1:])
+    if marker == _VALUE_FORMAT_PICKLE:
+        return pickle.loads(data[1:])
+    if marker == _PICKLE_PROTO_MARKER:
+        return pickle.loads(data)
+    raise ValueError(f"未知的缓存值格式: {marker!r}")
+
+
+# 进程内 L1 缓存：memoize 命中的解码结果，Redis 作为 L2
+# 有效期取 min(expire, L1_CACHE_TTL)，超出容量时按 LRU 淘汰
+L1_CACHE_SIZE = 4096
+L1_CACHE_TTL = 30
+_L1: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+_L1_LOCK = threading.Lock()
+_MISSING = object()
+
+
+def _l1_get(cache_key: str) -> Any:
+    """从 L1 缓存取值，未命中或已过期返回 _MISSING"""
+    with _L1_LOCK:
+        entry = _L1.get(cache_key)
+        if entry is None:
+            return _MISSING
+        if time.monotonic() >= entry[0]:
+            del _L1[cache_key]
+            return _MISSING
+        _L1.move_to_end(cache_key)
+        return entry[1]
+
+
+def _l1_set(cache_key: str, value: Any, expire: int) -> None:
+    """写入 L1 缓存"""
+    expires_at = time.monotonic() + min(expire, L1_CACHE_TTL)
+    with _L1_LOCK:
+        _L1[cache_key] = (expires_at, value)
+        _L1.move_to_end(cache_key)
+        if len(_L1) > L1_CACHE_SIZE:
+            _L1.popitem(last=False)
+
+
+def _l1_clear_prefix(prefix: str) -> int:
+    """清除 L1 缓存中以 prefix 开头的键，返回清除数量"""
+    with _L1_LOCK:
+        keys = [cache_key for cache_key in _L1 if cache_key.startswith(prefix)]
+        for cache_key in keys:
+            del _L1[cache_key]
+    return len(keys)
+
+
 def _get_cache_key(prefix: str, key: str) -> str:
     """生成缓存键"""
     return f"{prefix}{key}"
@@ -101,13 +186,14 @@ def get_version_state_cache() -> redis.Redis:
     return _get_redis_client()
 
 
-def memoize(cache_instance: redis.Redis, prefix: str = "", expire: int = 3600, typed: bool = True):
+def memoize(cache_instance: Optional[redis.Redis], prefix: str = "", expire: int = 3600, typed: bool = True):
     """Decorator to cache function results with global switch support.
 
     This is a wrapper around Redis caching that respects the global cache enable/disable setting.
 
     Args:
-        cache_instance: Redis client instance (from get_llm_cache(), etc.)
+        cache_instance: Redis client instance (from get_llm_cache(), etc.).
+            If None, the shared client is resolved on first call.
         prefix: Cache key prefix (e.g., "llm:", "asr:")
         expire: Cache expiration time in seconds (default: 3600)
         typed: Whether to include argument types in cache key (default: True)
@@ -124,21 +210,33 @@ def memoize(cache_instance: redis.Redis, prefix: str = "", expire: int = 3600, t
             return response
     """
     def decorator(func):
+        # 装饰时绑定 Redis 客户端，未提供时在首次调用时获取并保存在闭包中
+        redis_client = cache_instance
+
         @functools.wraps(func)
         def wrapper(*args, **kw):
+            nonlocal redis_client
             if not _cache_enabled:
                 return func(*args, **kw)
             
             # 生成缓存键
-            cache_key = _generate_cache_key_from_args(func, args, kw, prefix, typed)
-            
+            cache_key = _get_call_cache_key(func, args, kw, prefix, typed)
+
+            # 先查进程内 L1 缓存
+            value = _l1_get(cache_key)
+            if value is not _MISSING:
+                return value
+
             try:
-                redis_client = _get_redis_client()
+                if redis_client is None:
+                    redis_client = _get_redis_client()
                 # 尝试从缓存获取
                 cached_value = redis_client.get(cache_key)
                 if cached_value is not None:
                     try:
-                        return pickle.loads(cached_value)
+                        value = _loads_value(cached_value)
+                        _l1_set(cache_key, value, expire)
+                        return value
                     except Exception as e:
                         logger.warning(f"反序列化缓存值失败: {cache_key}, 错误: {e}")
                         # 缓存损坏，删除它
@@ -149,8 +247,9 @@ def memoize(cache_instance: redis.Redis, prefix: str = "", expire: int = 3600, t
                 
                 # 保存到缓存
                 try:
-                    serialized_value = pickle.dumps(result)
+                    serialized_value = _dumps_value(result)
                     redis_client.setex(cache_key, expire, serialized_value)
+                    _l1_set(cache_key, result, expire)
                 except Exception as e:
                     logger.warning(f"保存缓存失败: {cache_key}, 错误: {e}")
                 
@@ -166,6 +265,96 @@ def memoize(cache_instance: redis.Redis, prefix: str = "", expire: int = 3600, t
     return decorator
 
 
+def amemoize(cache_instance: Optional[redis.Redis], prefix: str = "", expire: int = 3600, typed: bool = True):
+    """Async version of memoize for coroutine functions.
+
+    Same cache key and global switch semantics as memoize. Redis lookups are
+    sub-millisecond and stay inline; only the wrapped coroutine is awaited.
+    """
+    def decorator(func):
+        # 装饰时绑定 Redis 客户端，未提供时在首次调用时获取并保存在闭包中
+        redis_client = cache_instance
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kw):
+            nonlocal redis_client
+            if not _cache_enabled:
+                return await func(*args, **kw)
+
+            # 生成缓存键
+            cache_key = _get_call_cache_key(func, args, kw, prefix, typed)
+
+            # 先查进程内 L1 缓存
+            value = _l1_get(cache_key)
+            if value is not _MISSING:
+                return value
+
+            try:
+                if redis_client is None:
+                    redis_client = _get_redis_client()
+                cached_value = redis_client.get(cache_key)
+            except Exception as e:
+                logger.warning(f"缓存操作失败，跳过缓存: {str(e)}")
+                return await func(*args, **kw)
+
+            if cached_value is not None:
+                try:
+                    value = _loads_value(cached_value)
+                    _l1_set(cache_key, value, expire)
+                    return value
+                except Exception as e:
+                    logger.warning(f"反序列化缓存值失败: {cache_key}, 错误: {e}")
+                    # 缓存损坏，删除它
+                    redis_client.delete(cache_key)
+
+            # 执行函数（异常不缓存）
+            result = await func(*args, **kw)
+
+            # 保存到缓存
+            try:
+                redis_client.setex(cache_key, expire, _dumps_value(result))
+                _l1_set(cache_key, result, expire)
+            except Exception as e:
+                logger.warning(f"保存缓存失败: {cache_key}, 错误: {e}")
+
+            return result
+
+        return wrapper
+    return decorator
+
+
+# 可哈希参数的缓存键记忆化容量（进程内）
+KEY_CACHE_SIZE = 4096
+
+
+def _get_call_cache_key(func, args, kw, prefix: str, typed: bool) -> str:
+    """获取函数调用的缓存键
+
+    参数均可哈希时，直接从进程内 LRU 中取已计算好的键，
+    跳过序列化和哈希计算；否则（list/dict 等）走完整的计算路径。
+    """
+    # 参数值相等但类型不同（如 1 与 True）时生成的键不同，签名中需带上类型
+    kw_items = tuple(sorted(kw.items()))
+    signature = (
+        args,
+        tuple(type(a) for a in args),
+        kw_items,
+        tuple(type(v) for _, v in kw_items),
+    )
+    try:
+        hash(signature)
+    except TypeError:
+        return _generate_cache_key_from_args(func, args, kw, prefix, typed)
+    return _cached_cache_key(func, signature, prefix, typed)
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _cached_cache_key(func, signature: tuple, prefix: str, typed: bool) -> str:
+    """按函数与参数签名记忆化缓存键"""
+    args, _, kw_items, _ = signature
+    return _generate_cache_key_from_args(func, args, dict(kw_items), prefix, typed)
+
+
 def _generate_cache_key_from_args(
     func, args, kw, prefix: str, typed: bool
 ) -> str:
@@ -188,15 +377,26 @@ def _generate_cache_key_from_args(
         key_parts.append(f"types={tuple(type(a).__name__ for a in args)}")
     
     key_str = ":".join(str(p) for p in key_parts)
-    key_hash = hashlib.sha256(key_str.encode()).hexdigest()
+    key_hash = xxhash.xxh3_128_hexdigest(key_str)
     
     return _get_cache_key(prefix, key_hash)
 
 
+# 原样参与缓存键生成的基本类型
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
 def _serialize_for_key(obj: Any) -> Any:
     """序列化对象用于缓存键生成"""
+    # 绝大多数参数是基本类型，先用一次集合查找返回
+    if type(obj) in _PRIMITIVE_TYPES:
+        return obj
     if is_dataclass(obj) and not isinstance(obj, type):
-        return asdict(obj)
+        # 逐字段浅层读取，不用 asdict 深拷贝整个对象树
+        return (
+            type(obj).__qualname__,
+            tuple(_serialize_for_key(getattr(obj, f.name)) for f in fields(obj)),
+        )
     elif isinstance(obj, (list, tuple)):
         return [_serialize_for_key(item) for item in obj]
     elif isinstance(obj, dict):
@@ -208,26 +408,53 @@ def _serialize_for_key(obj: Any) -> Any:
 def generate_cache_key(data: Any) -> str:
     """Generate cache key from data (supports dataclasses, dicts, lists).
 
+    The structure is streamed into the hasher, so no intermediate JSON
+    string is built for large inputs such as long subtitle chunks.
+
     Args:
         data: Data to generate key from
 
     Returns:
-        SHA256 hash of the data
+        XXH3-128 hash of the data (hex)
+    """
+    hasher = xxhash.xxh3_128()
+    _hash_tree(hasher, data)
+    return hasher.hexdigest()
+
+
+def _hash_tree(hasher: "xxhash.xxh3_128", obj: Any) -> None:
+    """Feed obj into hasher with unambiguous type tags and delimiters.
+
+    Strings are length-prefixed, so their content can never be mistaken for
+    a delimiter. Dict keys are sorted, matching the old sort_keys=True JSON.
     """
-    def _serialize(obj: Any) -> Any:
-        """Recursively serialize object to JSON-serializable format"""
-        if is_dataclass(obj) and not isinstance(obj, type):
-            return asdict(obj)
-        elif isinstance(obj, list):
-            return [_serialize(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {k: _serialize(v) for k, v in obj.items()}
-        else:
-            return obj
-
-    serialized_data = _serialize(data)
-    data_str = json.dumps(serialized_data, ensure_ascii=False, sort_keys=True)
-    return hashlib.sha256(data_str.encode()).hexdigest()
+    if isinstance(obj, str):
+        data = obj.encode()
+        hasher.update(b"s%d:" % len(data))
+        hasher.update(data)
+    elif obj is None or isinstance(obj, (bool, int, float)):
+        hasher.update(b"v%r;" % (obj,))
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        hasher.update(b"{")
+        for field in sorted(fields(obj), key=lambda f: f.name):
+            _hash_tree(hasher, field.name)
+            _hash_tree(hasher, getattr(obj, field.name))
+        hasher.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b"[")
+        for item in obj:
+            _hash_tree(hasher, item)
+        hasher.update(b"]")
+    elif isinstance(obj, dict):
+        hasher.update(b"{")
+        for key in sorted(obj):
+            _hash_tree(hasher, key)
+            _hash_tree(hasher, obj[key])
+        hasher.update(b"}")
+    else:
+        raise TypeError(
+            f"Object of type {type(obj).__name__} is not supported for cache keys"
+        )
 
 
 # 兼容旧的文件缓存接口（用于 ASR 缓存）
@@ -241,7 +468,7 @@ def get_cache_value(key: str, prefix: str = CACHE_PREFIX_ASR) -> Optional[Any]:
         cache_key = _get_cache_key(prefix, key)
         cached_value = redis_client.get(cache_key)
         if cached_value is not None:
-            return pickle.loads(cached_value)
+            return _loads_value(cached_value)
         return None
     except Exception as e:
         logger.warning(f"获取缓存失败: {key}, 错误: {e}")
@@ -256,7 +483,93 @@ def set_cache_value(key: str, value: Any, prefix: str = CACHE_PREFIX_ASR, expire
     try:
         redis_client = _get_redis_client()
         cache_key = _get_cache_key(prefix, key)
-        serialized_value = pickle.dumps(value)
+        serialized_value = _dumps_value(value)
         redis_client.setex(cache_key, expire, serialized_value)
     except Exception as e:
         logger.warning(f"设置缓存失败: {key}, 错误: {e}")
+
+
+def get_cache_values(
+    keys: list[str], prefix: str = CACHE_PREFIX_ASR
+) -> list[Optional[Any]]:
+    """批量获取缓存值（一次 MGET 往返），未命中的位置为 None"""
+    if not _cache_enabled or not keys:
+        return [None] * len(keys)
+
+    try:
+        redis_client = _get_redis_client()
+        cached_values = redis_client.mget([_get_cache_key(prefix, k) for k in keys])
+    except Exception as e:
+        logger.warning(f"批量获取缓存失败: {len(keys)} 个键, 错误: {e}")
+        return [None] * len(keys)
+
+    values = []
+    for key, cached_value in zip(keys, cached_values):
+        if cached_value is None:
+            values.append(None)
+            continue
+        try:
+            values.append(_loads_value(cached_value))
+        except Exception as e:
+            logger.warning(f"反序列化缓存值失败: {key}, 错误: {e}")
+            values.append(None)
+    return values
+
+
+def set_cache_values(
+    items: dict[str, Any], prefix: str = CACHE_PREFIX_ASR, expire: int = 3600
+):
+    """批量设置缓存值（pipeline 一次提交所有 SETEX）"""
+    if not _cache_enabled or not items:
+        return
+
+    try:
+        redis_client = _get_redis_client()
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.setex(_get_cache_key(prefix, key), expire, _dumps_value(value))
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"批量设置缓存失败: {len(items)} 个键, 错误: {e}")
+
+
+# SCAN 每批返回的键数量提示
+CLEAR_SCAN_COUNT = 1000
+
+
+def clear_cache_by_prefix(prefix: str) -> int:
+    """按前缀批量清除缓存（SCAN + UNLINK，不阻塞 Redis）
+
+    SCAN 按游标分批遍历，避免 KEYS 在大键空间上阻塞；
+    UNLINK 由 Redis 后台线程回收内存，清除大量键时不会卡住其他命令。
+
+    Args:
+        prefix: 缓存键前缀（如 CACHE_PREFIX_ASR）
+
+    Returns:
+        清除的 Redis 键数量
+    """
+    # 先清除本进程的 L1 缓存，即使 Redis 不可用也不再返回旧值
+    # （其他进程的 L1 缓存仍要等到过期）
+    _l1_clear_prefix(prefix)
+
+    count = 0
+    try:
+        redis_client = _get_redis_client()
+        for keys in _scan_batches(redis_client, f"{prefix}*"):
+            count += redis_client.unlink(*keys)
+        logger.info(f"已清除缓存: {prefix}*, 共 {count} 个")
+    except Exception as e:
+        logger.warning(f"清除缓存失败: {prefix}*, 错误: {e}")
+    return count
+
+
+def _scan_batches(redis_client: redis.Redis, match: str):
+    """按 SCAN 游标分批产出匹配的键"""
+    cursor = 0
+    while True:
+        cursor, keys = redis_client.scan(cursor, match=match, count=CLEAR_SCAN_COUNT)
+        if keys:
+            yield keys
+        if cursor == 0:
+            break
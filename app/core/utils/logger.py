@@ -2,8 +2,14 @@
 使用 loguru 的日志配置模块
 """
 
+import atexit
+import io
+import logging
 import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueListener
 from pathlib import Path
 from typing import Optional, TextIO
 
@@ -40,25 +46,63 @@ def _should_disable_enqueue() -> bool:
     return False
 
 
-class AutoFlushStream:
-    """自动刷新的流包装器，确保日志立即输出
+# 控制台输出缓冲：写入先进入 64 KiB 缓冲区，由后台线程定时刷新，
+# 突发日志合并成少量 write 系统调用
+CONSOLE_BUFFER_SIZE = 64 * 1024
+CONSOLE_FLUSH_INTERVAL = 0.1
 
-    这个类包装了 sys.stderr，在每次写入时自动刷新，
-    避免在代码中频繁调用 sys.stderr.flush()
+
+class BufferedStream:
+    """带缓冲的流包装器，后台线程每 CONSOLE_FLUSH_INTERVAL 秒刷新一次
+
+    直接对底层文件描述符做缓冲写入，替代逐条 flush 的写法；
+    无法获取文件描述符时（如被测试框架替换的 stderr）直接写原始流。
     """
 
     def __init__(self, stream: TextIO):
         self.stream = stream
+        self._lock = threading.Lock()
+        try:
+            raw = io.FileIO(stream.fileno(), "w", closefd=False)
+        except (AttributeError, OSError, ValueError):
+            self._buffered = stream
+        else:
+            self._buffered = io.TextIOWrapper(
+                io.BufferedWriter(raw, buffer_size=CONSOLE_BUFFER_SIZE),
+                encoding=getattr(stream, "encoding", None) or "utf-8",
+                errors="backslashreplace",
+            )
+        self._stop_event = threading.Event()
+        self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        """启动定时刷新线程"""
+        self._stop_event.clear()
+        threading.Thread(
+            target=self._flush_loop, name="log-flusher", daemon=True
+        ).start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(CONSOLE_FLUSH_INTERVAL):
+            self.flush()
 
     def write(self, message: str) -> int:
-        """写入消息并自动刷新"""
-        result = self.stream.write(message)
-        self.stream.flush()
-        return result
+        """写入缓冲区（不立即刷新）"""
+        with self._lock:
+            return self._buffered.write(message)
 
     def flush(self) -> None:
-        """刷新流"""
-        self.stream.flush()
+        """把缓冲区写入底层流"""
+        with self._lock:
+            try:
+                self._buffered.flush()
+            except (OSError, ValueError):
+                pass  # 解释器退出时流可能已关闭
+
+    def close(self) -> None:
+        """停止刷新线程并写出剩余内容"""
+        self._stop_event.set()
+        self.flush()
 
     def __getattr__(self, name: str):
         """代理其他属性和方法到原始流
@@ -68,6 +112,80 @@ class AutoFlushStream:
         return getattr(self.stream, name)
 
 
+_console_streams: list[BufferedStream] = []
+
+
+def _create_console_stream(stream: TextIO) -> BufferedStream:
+    """创建控制台缓冲流，进程退出时写出剩余日志"""
+    console_stream = BufferedStream(stream)
+    _console_streams.append(console_stream)
+    return console_stream
+
+
+def _flush_console_streams() -> None:
+    """fork 前写出缓冲区，避免父进程未刷新的日志在子进程中重复输出"""
+    for console_stream in _console_streams:
+        console_stream.flush()
+
+
+def _close_console_streams() -> None:
+    for console_stream in _console_streams:
+        console_stream.close()
+
+
+def _restart_flushers_in_child() -> None:
+    """fork 后子进程中没有刷新线程，需要重新启动"""
+    for console_stream in _console_streams:
+        console_stream._lock = threading.Lock()
+        console_stream._start_flusher()
+
+
+# 进程内日志队列：禁用 loguru enqueue 时，控制台输出改由后台线程写入
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_queue_listener: Optional[QueueListener] = None
+
+
+def _queue_sink(message) -> None:
+    """loguru sink：只把格式化好的消息放入队列，实际写入由监听线程完成"""
+    _log_queue.put_nowait(logging.makeLogRecord({"msg": str(message)}))
+
+
+def _start_queue_listener(stream: TextIO) -> None:
+    """启动队列监听线程，负责把队列中的日志写入 stream"""
+    global _queue_listener
+    handler = logging.StreamHandler(_create_console_stream(stream))
+    # loguru 格式化后的消息已带换行
+    handler.terminator = ""
+    _queue_listener = QueueListener(_log_queue, handler)
+    _queue_listener.start()
+
+
+def _stop_queue_listener() -> None:
+    """停止监听线程，并写完队列中剩余的日志"""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+
+def _restart_queue_listener_in_child() -> None:
+    """fork 后子进程中没有监听线程，需要重建队列和线程"""
+    global _log_queue, _queue_listener
+    if _queue_listener is None:
+        return
+    _log_queue = queue.Queue(-1)
+    _queue_listener = QueueListener(_log_queue, *_queue_listener.handlers)
+    _queue_listener.start()
+
+
+# 先停止监听线程（写完队列），再写出缓冲区（atexit 按注册的逆序执行）
+atexit.register(_close_console_streams)
+atexit.register(_stop_queue_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_flush_console_streams, after_in_child=_restart_flushers_in_child
+    )
+    os.register_at_fork(after_in_child=_restart_queue_listener_in_child)
+
+
 def _get_log_level(level: str) -> str:
     """将日志级别转换为 loguru 格式"""
     level_map = {
@@ -149,11 +267,17 @@ def setup_logger(
 
         # 添加控制台输出
         if console_output:
-            # 使用自动刷新的流包装器，确保日志立即输出
-            # 这样就不需要在代码中频繁调用 sys.stderr.flush()
-            auto_flush_stderr = AutoFlushStream(sys.stderr)
+            if use_enqueue:
+                # loguru 的队列线程负责写入，缓冲流由后台线程定时刷新，
+                # 不再每条日志都 flush 一次
+                console_sink = _create_console_stream(sys.stderr)
+            else:
+                # 无法使用 loguru enqueue 时，改用线程内队列，
+                # 调用方只负责入队，不在热路径上同步写 stderr
+                _start_queue_listener(sys.stderr)
+                console_sink = _queue_sink
             logger.add(
-                auto_flush_stderr,
+                console_sink,
                 format=format_console,
                 level=log_level,
                 colorize=True,
@@ -10,9 +10,13 @@ from app.config import DATABASE_URL
 # 创建数据库引擎
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # 连接前检查连接是否有效
+    # 不在每次取连接时发送 SELECT 1，改为定期回收连接，避免使用被服务端关闭的旧连接
+    pool_pre_ping=False,
+    pool_recycle=1800,
     pool_size=10,
     max_overflow=20,
+    # 已编译 SQL 的 LRU 缓存容量（默认 500），轮询接口的查询无需重复编译
+    query_cache_size=1200,
     echo=False,  # 设置为 True 可以打印 SQL 语句（调试用）
 )
 
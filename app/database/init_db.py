@@ -1,7 +1,10 @@
 """
 初始化数据库表
 """
+from sqlalchemy import Index, SmallInteger, inspect, text
+
 from app.database.base import Base, engine
+from app.database.models import RELATION_KIND_BY_TYPE, TaskRelation
 from app.core.utils.logger import setup_logger
 
 logger = setup_logger("init_db")
@@ -12,12 +15,80 @@ def init_db():
     try:
         logger.info("开始创建数据库表...")
         Base.metadata.create_all(bind=engine)
+        _migrate_relation_type_column()
+        _migrate_task_relation_indexes()
         logger.info("数据库表创建成功")
     except Exception as e:
         logger.error(f"创建数据库表失败: {str(e)}", exc_info=True)
         raise
 
 
+def _migrate_relation_type_column():
+    """把已有的 task_relations.relation_type 从 VARCHAR 转换为 SMALLINT 编码"""
+    table = TaskRelation.__table__
+    columns = {
+        column["name"]: column for column in inspect(engine).get_columns(table.name)
+    }
+    if isinstance(columns["relation_type"]["type"], SmallInteger):
+        return
+
+    if engine.dialect.name != "postgresql":
+        logger.warning(
+            f"relation_type 列仍为字符串类型，{engine.dialect.name} 需手动迁移为 SMALLINT"
+        )
+        return
+
+    known = ", ".join(
+        f"'{relation_type.value}'" for relation_type in RELATION_KIND_BY_TYPE
+    )
+    cases = " ".join(
+        f"WHEN '{relation_type.value}' THEN {int(kind)}"
+        for relation_type, kind in RELATION_KIND_BY_TYPE.items()
+    )
+    with engine.begin() as conn:
+        # 未知的关联类型无法映射为编码（ORM 也无法读取），转换前记录并删除，
+        # 否则会被转换为 NULL 而违反 NOT NULL 约束，导致启动失败
+        unknown = conn.execute(
+            text(
+                f"SELECT relation_type, COUNT(*) FROM {table.name} "
+                f"WHERE relation_type NOT IN ({known}) GROUP BY relation_type"
+            )
+        ).all()
+        if unknown:
+            details = ", ".join(f"{value!r}（{count} 条）" for value, count in unknown)
+            logger.warning(f"删除无法识别的关联类型: {details}")
+            conn.execute(
+                text(f"DELETE FROM {table.name} WHERE relation_type NOT IN ({known})")
+            )
+        conn.execute(
+            text(
+                f"ALTER TABLE {table.name} ALTER COLUMN relation_type TYPE SMALLINT "
+                f"USING CASE relation_type {cases} ELSE NULL END"
+            )
+        )
+    logger.info("已将 relation_type 列迁移为 SMALLINT")
+
+
+def _migrate_task_relation_indexes():
+    """为已存在的 task_relations 表补建复合索引
+
+    create_all 只创建缺失的表，不会修改已有表的索引。
+    复合索引 (task_id, relation_type) 覆盖了原来的单列 task_id 索引，将其删除。
+    """
+    table = TaskRelation.__table__
+    existing = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(bind=engine)
+            logger.info(f"创建索引: {index.name}")
+
+    legacy_index = "ix_task_relations_task_id"
+    if legacy_index in existing:
+        Index(legacy_index, table.c.task_id).drop(bind=engine)
+        logger.info(f"删除索引: {legacy_index}")
+
+
 if __name__ == "__main__":
     init_db()
 
@@ -7,18 +7,59 @@ from sqlalchemy import (
     Column,
     String,
     Integer,
+    SmallInteger,
     DateTime,
     Text,
     ForeignKey,
+    Index,
     Enum as SQLEnum,
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 import enum
 
 from app.database.base import Base
+from app.core.constants import RelationType
 from app.schemas.common import TaskStatus
 
 
+class RelationKind(enum.IntEnum):
+    """关联类型在数据库中的存储编码"""
+
+    TRANSCRIBE = 1
+    VIDEO = 2
+    SUBTITLE = 3
+
+
+RELATION_KIND_BY_TYPE = {
+    RelationType.TRANSCRIBE: RelationKind.TRANSCRIBE,
+    RelationType.VIDEO: RelationKind.VIDEO,
+    RelationType.SUBTITLE: RelationKind.SUBTITLE,
+}
+RELATION_TYPE_BY_KIND = {kind: type_ for type_, kind in RELATION_KIND_BY_TYPE.items()}
+
+
+class RelationTypeColumn(TypeDecorator):
+    """以 SMALLINT 存储关联类型，Python 侧仍读写 RelationType 字符串
+
+    行和 (task_id, relation_type) 索引都比 VARCHAR(50) 小得多，
+    查询条件和读取结果对调用方透明。
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(RELATION_KIND_BY_TYPE[RelationType(value)])
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return RELATION_TYPE_BY_KIND[RelationKind(value)]
+
+
 class Task(Base):
     """任务表"""
 
@@ -59,16 +100,20 @@ class TaskRelation(Base):
     """任务关联关系表"""
 
     __tablename__ = "task_relations"
+    # 按 (task_id, relation_type) 查询关联关系，复合索引一次 B-tree 定位；
+    # 也覆盖只按 task_id 的前缀查询，因此 task_id 不再单独建索引
+    __table_args__ = (
+        Index("ix_task_relations_task_type", "task_id", "relation_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     task_id = Column(
         String(36),
         ForeignKey("tasks.task_id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     relation_type = Column(
-        String(50), nullable=False
+        RelationTypeColumn(), nullable=False
     )  # transcribe_task_id, subtitle_task_id, video_task_id
     related_task_id = Column(
         String(36),
@@ -8,6 +8,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
+from app.config import ensure_workspace_dirs
 from app.routers import (
     dictionary,
     health,
@@ -26,6 +27,8 @@ logger = setup_logger("main")
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时执行
+    ensure_workspace_dirs()
+
     # 初始化数据库
     try:
         init_db()
@@ -26,7 +26,7 @@ async def query_dictionary(request: DictionaryQueryRequest):
     Returns:
         词典查询响应，包含单词的详细词典信息
     """
-    logger.info(f"收到词典查询请求: word={request.word}")
+    logger.info("收到词典查询请求: word={}", request.word)
     try:
         result = dictionary_service.query_word(
             word=request.word,
@@ -34,10 +34,10 @@ async def query_dictionary(request: DictionaryQueryRequest):
             romaji=request.romaji,
             part_of_speech=request.part_of_speech,
         )
-        logger.info(f"成功查询单词: {request.word}")
+        logger.info("成功查询单词: {}", request.word)
         return DictionaryQueryResponse(**result)
     except Exception as e:
         logger.error(
-            f"查询词典失败: word={request.word}, error={str(e)}", exc_info=True
+            "查询词典失败: word={}, error={}", request.word, e, exc_info=True
         )
         raise HTTPException(status_code=500, detail=f"查询词典失败: {str(e)}")
@@ -2,14 +2,18 @@
 字幕处理相关路由
 """
 
-import json
-import tempfile
-from pathlib import Path
+import asyncio
+from typing import Iterator, Optional
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from minio.error import S3Error
+from starlette.background import BackgroundTask
 
 from app.core.constants import TaskStatus
 from app.core.storage import get_storage
+from app.core.storage.minio_storage import DOWNLOAD_BUFFER_SIZE
 from app.core.utils.logger import setup_logger
 from app.services.task_manager import get_task_manager
 
@@ -17,36 +21,83 @@ router = APIRouter()
 task_manager = get_task_manager()
 logger = setup_logger("subtitle_router")
 
+# 字幕内容响应体：{"task_id": ..., "content": <字幕 JSON 原文>}
+_SUBTITLE_CONTENT_PREFIX = b'{"task_id":%s,"content":'
+_SUBTITLE_CONTENT_SUFFIX = b"}"
+
+# 无法再产出字幕的任务状态
+_BAD_STATUSES = frozenset({TaskStatus.FAILED, TaskStatus.CANCELLED})
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 请求头是否命中当前 ETag"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _iter_subtitle_content(prefix: bytes, response) -> Iterator[bytes]:
+    """依次产出响应前缀、已打开的 MinIO 对象内容和后缀"""
+    yield prefix
+    yield from response.stream(DOWNLOAD_BUFFER_SIZE)
+    yield _SUBTITLE_CONTENT_SUFFIX
+
+
+def _stat_subtitle_file(object_name: str):
+    """获取存储客户端并查询字幕文件元数据（同步，在线程池中执行）"""
+    return get_storage().stat_file(object_name)
+
+
+def _open_subtitle_file(object_name: str, etag: str):
+    """以 If-Match 打开字幕文件，确保读到的正是 HEAD 查询到的版本（同步）"""
+    return get_storage().open_object(object_name, etag=etag)
+
+
+def _close_subtitle_file(response) -> None:
+    """关闭 MinIO 响应并归还连接（客户端中途断开时同样会执行）"""
+    response.close()
+    response.release_conn()
+
 
 @router.get("/subtitle/{task_id}/content")
-async def get_subtitle_content(task_id: str):
+async def get_subtitle_content(
+    task_id: str, if_none_match: Optional[str] = Header(None)
+):
     """获取字幕文件内容（JSON 格式）
 
+    字幕文件已是 JSON，从 MinIO 流式转发并带上 ETag；
+    客户端轮询时内容未变化则直接返回 304。
+
     Args:
         task_id: 任务ID
+        if_none_match: 客户端缓存的 ETag
 
     Returns:
-        包含 task_id 和 content（JSON 数组）的字典
+        包含 task_id 和 content（JSON 数组）的 JSON 响应
     """
 
-    logger.info(f"获取字幕内容请求: task_id={task_id}")
-    task = task_manager.get_task(task_id)
+    logger.info("获取字幕内容请求: task_id={}", task_id)
+    task = await asyncio.to_thread(task_manager.get_task, task_id)
     if not task:
-        logger.warning(f"获取字幕内容失败，任务不存在: task_id={task_id}")
+        logger.warning("获取字幕内容失败，任务不存在: task_id={}", task_id)
         raise HTTPException(status_code=404, detail="任务不存在")
 
     # 如果任务失败或取消，返回错误
-    if task.status == TaskStatus.FAILED or task.status == TaskStatus.CANCELLED:
+    if task.status in _BAD_STATUSES:
         error_msg = task.error or "任务失败"
         logger.warning(
-            f"获取字幕内容失败，任务已失败或取消: task_id={task_id}, status={task.status}, error={error_msg}"
+            "获取字幕内容失败，任务已失败或取消: task_id={}, status={}, error={}",
+            task_id,
+            task.status,
+            error_msg,
         )
         raise HTTPException(status_code=400, detail=f"任务失败: {error_msg}")
 
     # 如果任务未完成（pending 或 running），继续等待或返回空内容
     if task.status != TaskStatus.COMPLETED:
         logger.info(
-            f"任务尚未完成，返回空内容: task_id={task_id}, status={task.status}"
+            "任务尚未完成，返回空内容: task_id={}, status={}", task_id, task.status
         )
         return {
             "task_id": task_id,
@@ -54,51 +105,54 @@ async def get_subtitle_content(task_id: str):
         }
 
     if not task.output_path:
-        logger.warning(f"获取字幕内容失败，输出文件路径不存在: task_id={task_id}")
+        logger.warning("获取字幕内容失败，输出文件路径不存在: task_id={}", task_id)
         raise HTTPException(status_code=404, detail="输出文件路径不存在")
 
     try:
         output_path = task.output_path
-        storage = get_storage()
 
-        # 检查文件是否在 MinIO 中
-        if not storage.file_exists(output_path):
-            logger.warning(f"文件不存在于 MinIO: task_id={task_id}, path={output_path}")
+        # 一次 HEAD 请求同时检查文件是否存在并获取 ETag 和大小；
+        # 数据库和 MinIO 调用都是同步的，放到线程池执行以免阻塞事件循环
+        stat = await asyncio.to_thread(_stat_subtitle_file, output_path)
+        if stat is None:
+            logger.warning(
+                "文件不存在于 MinIO: task_id={}, path={}", task_id, output_path
+            )
             raise HTTPException(status_code=404, detail="文件不存在于 MinIO")
 
-        # 从 MinIO 下载到临时文件
-        logger.info(f"从 MinIO 下载字幕文件: task_id={task_id}, path={output_path}")
-        tmp_file = tempfile.NamedTemporaryFile(
-            mode="w+", delete=False, suffix=".json", encoding="utf-8"
-        )
-        tmp_path = tmp_file.name
-        tmp_file.close()
+        etag = f'"{stat.etag}"'
+        if _etag_matches(if_none_match, etag):
+            logger.info("字幕内容未变化，返回 304: task_id={}", task_id)
+            return Response(status_code=304, headers={"ETag": etag})
 
+        # 文件本身就是 JSON，原样嵌入响应流，不解析也不重新序列化
+        logger.info(
+            "从 MinIO 读取字幕文件: task_id={}, path={}", task_id, output_path
+        )
+        # 在发送响应头之前发起 GET，并用 If-Match 固定到 HEAD 查询到的版本：
+        # Content-Length 与实际内容一致，GET 失败也能返回错误而不是截断的 200
         try:
-            storage.download_file(output_path, tmp_path)
-            logger.info(
-                f"字幕文件已下载到临时文件: task_id={task_id}, tmp_path={tmp_path}"
+            response = await asyncio.to_thread(
+                _open_subtitle_file, output_path, stat.etag
             )
-
-            with open(tmp_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
-
-            logger.info(
-                f"成功从 MinIO 读取 JSON 文件: task_id={task_id}, path={output_path}"
-            )
-            return {
-                "task_id": task_id,
-                "content": content,
-            }
-        finally:
-            # 清理临时文件
-            if tmp_path and Path(tmp_path).exists():
-                Path(tmp_path).unlink(missing_ok=True)
+        except S3Error as e:
+            if e.code != "PreconditionFailed":
+                raise
+            logger.warning("字幕文件在读取期间被更新: task_id={}", task_id)
+            raise HTTPException(status_code=409, detail="字幕文件已更新，请重试")
+
+        prefix = _SUBTITLE_CONTENT_PREFIX % orjson.dumps(task_id)
+        content_length = len(prefix) + stat.size + len(_SUBTITLE_CONTENT_SUFFIX)
+        return StreamingResponse(
+            _iter_subtitle_content(prefix, response),
+            media_type="application/json",
+            headers={"ETag": etag, "Content-Length": str(content_length)},
+            background=BackgroundTask(_close_subtitle_file, response),
+        )
     except HTTPException:
         raise
     except Exception as e:
         logger.error(
-            f"读取字幕文件失败: task_id={task_id}, error={str(e)}",
-            exc_info=True,
+            "读取字幕文件失败: task_id={}, error={}", task_id, e, exc_info=True
         )
         raise HTTPException(status_code=500, detail=f"读取字幕文件失败: {str(e)}")
@@ -14,14 +14,19 @@ from app.schemas.video_download import (
     SubtitleTaskInfo,
 )
 from app.services.task_manager import get_task_manager
-from app.celery.tasks.video_tasks import download_audio_task
-from app.core.constants import TaskStatus
+from app.celery.workflows import start_analyze_workflow
+from app.core.constants import RelationType, TaskStatus, TaskType
 from app.core.utils.logger import setup_logger
 
 router = APIRouter()
 task_manager = get_task_manager()
 logger = setup_logger("video_router")
 
+# 任务进入这些状态后 SSE 停止推送
+_FINAL_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+)
+
 
 @router.post("/video/analyze", response_model=AnalyzeResponse)
 async def start_analysis(url: str):
@@ -33,21 +38,21 @@ async def start_analysis(url: str):
         url: YouTube URL
     """
     try:
-        logger.info(f"收到音频下载请求（通过URL）: url={url}")
+        logger.info("收到音频下载请求（通过URL）: url={}", url)
 
         # 创建下载任务
         task_id = task_manager.create_task(
-            task_type="video_download",
+            task_type=TaskType.VIDEO_DOWNLOAD,
             video_url=url,
         )
-        logger.info(f"创建音频下载任务: task_id={task_id}")
+        logger.info("创建音频下载任务: task_id={}", task_id)
 
         # 构建消息
         message = "Task created, starting audio download..."
 
-        # 发送 Celery 任务到队列
-        download_audio_task.delay(task_id, url, None)
-        logger.info(f"任务 {task_id} 已发送到 Celery 队列")
+        # 以 Celery chain 发送下载 -> 转录 -> 字幕处理任务
+        start_analyze_workflow(task_id, url)
+        logger.info("任务 {} 已发送到 Celery 队列", task_id)
 
         task_response = AnalyzeResponse(
             task_id=task_id,
@@ -57,7 +62,7 @@ async def start_analysis(url: str):
 
         return task_response
     except Exception as e:
-        logger.error(f"创建音频下载任务失败: {str(e)}", exc_info=True)
+        logger.error("创建音频下载任务失败: {}", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -67,7 +72,7 @@ async def get_video_analyze_task_status(task_id: str):
 
     注意：推荐使用 `/video/analyze/{task_id}/stream` SSE 端点以获得更好的性能和实时性。
     """
-    logger.debug(f"查询任务状态: task_id={task_id}")
+    logger.debug("查询任务状态: task_id={}", task_id)
     return await _get_task_status_data(task_id)
 
 
@@ -79,13 +84,16 @@ async def _get_task_status_data(task_id: str) -> AnalyzeResponse:
     - 转录阶段：30-70%
     - 字幕处理阶段：70-100%
     """
-    task = task_manager.get_task(task_id)
-    if not task:
+    # 一次查询取回主任务及关联的转录任务、字幕任务
+    result = task_manager.get_task_with_relations(task_id)
+    if not result:
         raise HTTPException(status_code=404, detail="任务不存在")
+    task, related_tasks = result
 
-    # 从 TaskManager 获取关联的转录任务ID和字幕任务ID（从数据库字段获取）
-    transcribe_task_id = task_manager.get_task_relation(task_id, "transcribe_task_id")
-    subtitle_task_id = task_manager.get_task_relation(task_id, "subtitle_task_id")
+    # 关联的转录任务和字幕任务（从数据库关联关系获取）
+    transcribe_task_obj = related_tasks.get(RelationType.TRANSCRIBE)
+    subtitle_task_obj = related_tasks.get(RelationType.SUBTITLE)
+    subtitle_task_id = subtitle_task_obj.task_id if subtitle_task_obj else None
 
     # 解析 message 中的其他信息（兼容旧格式，但不包含任务ID）
     video_path = task.output_path
@@ -97,28 +105,20 @@ async def _get_task_status_data(task_id: str) -> AnalyzeResponse:
     unified_progress = task.progress
     unified_message = task.message
 
-    # 获取转录任务状态
-    transcribe_task_obj = None
-    if transcribe_task_id:
-        transcribe_task_obj = task_manager.get_task(transcribe_task_id)
-
     # 获取字幕任务状态
-    subtitle_task_obj = None
-    if subtitle_task_id:
-        subtitle_task_obj = task_manager.get_task(subtitle_task_id)
-        if subtitle_task_obj:
-            subtitle_task = SubtitleTaskInfo(
-                task_id=subtitle_task_id,
-                status=subtitle_task_obj.status,
-                progress=subtitle_task_obj.progress,
-                message=subtitle_task_obj.message,
-                output_path=subtitle_task_obj.output_path,
-            )
-            if (
-                subtitle_task_obj.status == TaskStatus.COMPLETED
-                and subtitle_task_obj.output_path
-            ):
-                subtitle_path = subtitle_task_obj.output_path
+    if subtitle_task_obj:
+        subtitle_task = SubtitleTaskInfo(
+            task_id=subtitle_task_id,
+            status=subtitle_task_obj.status,
+            progress=subtitle_task_obj.progress,
+            message=subtitle_task_obj.message,
+            output_path=subtitle_task_obj.output_path,
+        )
+        if (
+            subtitle_task_obj.status == TaskStatus.COMPLETED
+            and subtitle_task_obj.output_path
+        ):
+            subtitle_path = subtitle_task_obj.output_path
 
     # 根据子任务状态统一计算进度
     # 视频下载阶段：0-30%，转录阶段：30-70%，字幕处理阶段：70-100%
@@ -240,13 +240,11 @@ async def _stream_task_status(task_id: str) -> AsyncGenerator[str, None]:
                     last_progress = status_data.progress
 
                     # 如果任务完成或失败，停止推送
-                    if status_data.status in (
-                        TaskStatus.COMPLETED,
-                        TaskStatus.FAILED,
-                        TaskStatus.CANCELLED,
-                    ):
+                    if status_data.status in _FINAL_STATUSES:
                         logger.info(
-                            f"任务 {task_id} 状态为 {status_data.status}，停止 SSE 推送"
+                            "任务 {} 状态为 {}，停止 SSE 推送",
+                            task_id,
+                            status_data.status,
                         )
                         break
 
@@ -259,15 +257,15 @@ async def _stream_task_status(task_id: str) -> AsyncGenerator[str, None]:
                 yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
                 break
             except Exception as e:
-                logger.error(f"SSE 推送错误: {task_id}, error={str(e)}", exc_info=True)
+                logger.error("SSE 推送错误: {}, error={}", task_id, e, exc_info=True)
                 error_data = {"error": str(e)}
                 yield f"data: {json.dumps(error_data, ensure_ascii=False)}\n\n"
                 await asyncio.sleep(1)
 
     except asyncio.CancelledError:
-        logger.info(f"SSE 连接已取消: {task_id}")
+        logger.info("SSE 连接已取消: {}", task_id)
     except Exception as e:
-        logger.error(f"SSE 流异常: {task_id}, error={str(e)}", exc_info=True)
+        logger.error("SSE 流异常: {}, error={}", task_id, e, exc_info=True)
 
 
 @router.get("/video/analyze/{task_id}/stream")
@@ -285,7 +283,7 @@ async def stream_video_analyze_task_status(task_id: str):
     };
     ```
     """
-    logger.info(f"SSE 连接建立: task_id={task_id}")
+    logger.info("SSE 连接建立: task_id={}", task_id)
 
     return StreamingResponse(
         _stream_task_status(task_id),
@@ -6,29 +6,11 @@ from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel, Field
-from app.config import settings
+from app.config import get_settings
 from app.core.translate.types import TargetLanguage
 from app.schemas.common import TaskResponse
 
 
-def _get_default_max_word_count_cjk() -> int:
-    """获取 CJK 最大字数的默认值"""
-    try:
-        return settings.max_word_count_cjk
-    except (ImportError, AttributeError):
-        # 如果配置不可用，使用 core/entities.py 中的默认值
-        return 25
-
-
-def _get_default_max_word_count_english() -> int:
-    """获取英文最大字数的默认值"""
-    try:
-        return settings.max_word_count_english
-    except (ImportError, AttributeError):
-        # 如果配置不可用，使用 core/entities.py 中的默认值
-        return 20
-
-
 class TranslatorService(str, Enum):
     """翻译器服务
 
@@ -76,13 +58,14 @@ class SubtitleConfig(BaseModel):
     subtitle_layout: SubtitleLayout = Field(
         default=SubtitleLayout.ORIGINAL_ON_TOP, description="字幕布局"
     )
+    # 默认值在创建实例时从配置读取（get_settings 已缓存），导入时不构建 Settings
     max_word_count_cjk: int = Field(
-        default_factory=_get_default_max_word_count_cjk,
+        default_factory=lambda: get_settings().max_word_count_cjk,
         ge=1,
         description="CJK 语言最大字数",
     )
     max_word_count_english: int = Field(
-        default_factory=_get_default_max_word_count_english,
+        default_factory=lambda: get_settings().max_word_count_english,
         ge=1,
         description="英文最大字数",
     )
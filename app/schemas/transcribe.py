@@ -45,9 +45,12 @@ class TranscribeConfig(BaseModel):
     whisperx_device: str = Field(
         default="cpu", description="WhisperX 设备（cuda/cpu，默认 cpu）"
     )
-    whisperx_compute_type: str = Field(
-        default="float32",
-        description="WhisperX 计算类型（float16/float32/int8，默认 float32）",
+    whisperx_compute_type: Optional[str] = Field(
+        default=None,
+        description=(
+            "WhisperX 计算类型（float16/float32/int8），"
+            "默认 CPU 使用 WHISPERX_COMPUTE_TYPE 配置（int8），GPU 使用 float16"
+        ),
     )
     whisperx_batch_size: int = Field(default=16, description="WhisperX 批处理大小")
 
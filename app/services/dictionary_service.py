@@ -47,10 +47,10 @@ class DictionaryService:
 
         # 获取模型名称
         if not self.model:
-            config = self.health_checker.get_health_status()
-            if not config or not config.is_healthy:
+            model = self.health_checker.get_healthy_model()
+            if not model:
                 raise ValueError("LLM 配置不健康，无法查询词典")
-            self.model = config.model
+            self.model = model
 
         # 构建查询信息
         word_info = {
@@ -2,18 +2,31 @@
 任务管理服务（使用数据库持久化）
 """
 
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from app.database.base import SessionLocal
 from app.database.models import Task, TaskRelation
 from app.schemas.common import TaskResponse, TaskStatus
+from app.core.constants import RelationType
 from app.core.utils.logger import setup_logger
 
 logger = setup_logger("task_manager")
 
+# get_task 进程内缓存：轮询接口会在短时间内反复查询同一任务
+# 大多数任务只缓存很短时间；已完成或取消的任务状态不再变化，可缓存更久。
+# FAILED 不算最终状态：Celery 自动重试会把任务重新置为 RUNNING
+TASK_CACHE_SIZE = 10_000
+TASK_CACHE_TTL = 0.2
+FINAL_TASK_CACHE_TTL = 60
+_FINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.CANCELLED})
+
 
 def _task_to_response(task: Task) -> TaskResponse:
     """将数据库 Task 模型转换为 TaskResponse"""
@@ -31,16 +44,46 @@ def _task_to_response(task: Task) -> TaskResponse:
 
 
 class TaskManager:
-    """任务管理器（使用数据库持久化）"""
+    """任务管理器（使用数据库持久化）
+
+    每次调用都使用独立的数据库会话，单例可在多个线程中同时使用。
+    """
 
     def __init__(self):
-        self._db: Optional[Session] = None
+        self._task_cache: OrderedDict[str, tuple[float, TaskResponse]] = OrderedDict()
+        self._task_cache_lock = threading.Lock()
+
+    def _get_cached_task(self, task_id: str) -> Optional[TaskResponse]:
+        """从进程内缓存取任务，未命中或已过期返回 None"""
+        with self._task_cache_lock:
+            entry = self._task_cache.get(task_id)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._task_cache[task_id]
+                return None
+            self._task_cache.move_to_end(task_id)
+            return entry[1]
 
-    def _get_db(self) -> Session:
-        """获取数据库会话"""
-        if self._db is None:
-            self._db = SessionLocal()
-        return self._db
+    def _cache_task(self, task: TaskResponse):
+        """写入进程内缓存"""
+        ttl = (
+            FINAL_TASK_CACHE_TTL if task.status in _FINAL_STATUSES else TASK_CACHE_TTL
+        )
+        with self._task_cache_lock:
+            self._task_cache[task.task_id] = (time.monotonic() + ttl, task)
+            self._task_cache.move_to_end(task.task_id)
+            if len(self._task_cache) > TASK_CACHE_SIZE:
+                self._task_cache.popitem(last=False)
+
+    def _invalidate_task(self, task_id: str):
+        """使任务缓存失效
+
+        只作用于当前进程的缓存：其他进程（如 Celery worker 写入、API 读取）
+        的缓存仍要等到过期后才会读到新状态。
+        """
+        with self._task_cache_lock:
+            self._task_cache.pop(task_id, None)
 
     def create_task(
         self,
@@ -49,7 +92,7 @@ class TaskManager:
     ) -> str:
         """创建新任务"""
         task_id = str(uuid.uuid4())
-        db = self._get_db()
+        db = SessionLocal()
         try:
             task = Task(
                 task_id=task_id,
@@ -69,19 +112,26 @@ class TaskManager:
             raise
         finally:
             db.close()
-            self._db = None
 
     def get_task(self, task_id: str) -> Optional[TaskResponse]:
-        """获取任务"""
-        db = self._get_db()
+        """获取任务（带短时进程内缓存）
+
+        update_task 只会清除本进程的缓存，其他进程写入的更新最多延迟一个缓存有效期。
+        """
+        cached = self._get_cached_task(task_id)
+        if cached is not None:
+            return cached
+
+        db = SessionLocal()
         try:
             task = db.query(Task).filter(Task.task_id == task_id).first()
             if task:
-                return _task_to_response(task)
+                response = _task_to_response(task)
+                self._cache_task(response)
+                return response
             return None
         finally:
             db.close()
-            self._db = None
 
     def update_task(
         self,
@@ -93,7 +143,7 @@ class TaskManager:
         output_path: Optional[str] = None,
     ):
         """更新任务状态"""
-        db = self._get_db()
+        db = SessionLocal()
         try:
             task = db.query(Task).filter(Task.task_id == task_id).first()
             if not task:
@@ -125,6 +175,7 @@ class TaskManager:
 
             db.commit()
             db.refresh(task)
+            self._invalidate_task(task_id)
             logger.debug(
                 f"更新任务: task_id={task_id}, status={task.status}, progress={task.progress}"
             )
@@ -134,7 +185,6 @@ class TaskManager:
             raise
         finally:
             db.close()
-            self._db = None
 
     def set_task_relations(self, task_id: str, relations: dict[str, str]):
         """批量设置任务关联关系
@@ -143,7 +193,7 @@ class TaskManager:
             task_id: 主任务ID
             relations: 关联关系字典，格式如 {"transcribe_task_id": "...", "subtitle_task_id": "..."}
         """
-        db = self._get_db()
+        db = SessionLocal()
         try:
             for relation_type, related_task_id in relations.items():
                 # 检查是否已存在相同的关联关系
@@ -172,7 +222,59 @@ class TaskManager:
             raise
         finally:
             db.close()
-            self._db = None
+
+    def cancel_pending_workflow_tasks(self, task_id: str, message: str) -> list[str]:
+        """取消同一工作流中仍处于 pending 的任务
+
+        工作流以视频任务为根，预先创建的转录/字幕任务通过关联关系挂在根任务下；
+        某一步最终失败后 chain 不再继续，其后的任务需要取消，否则会一直停留在 pending。
+
+        Args:
+            task_id: 工作流中任一任务的ID（视频任务或其关联任务）
+            message: 写入被取消任务的消息
+
+        Returns:
+            被取消的任务ID列表
+        """
+        db = SessionLocal()
+        try:
+            # 步骤任务通过 VIDEO 关联找到根任务，根任务自身没有该关联
+            root_task_id = (
+                db.query(TaskRelation.related_task_id)
+                .filter(
+                    TaskRelation.task_id == task_id,
+                    TaskRelation.relation_type == RelationType.VIDEO,
+                )
+                .scalar()
+                or task_id
+            )
+            pending_tasks = (
+                db.query(Task)
+                .join(TaskRelation, TaskRelation.related_task_id == Task.task_id)
+                .filter(
+                    TaskRelation.task_id == root_task_id,
+                    Task.status == TaskStatus.PENDING,
+                )
+                .all()
+            )
+            cancelled = [task.task_id for task in pending_tasks]
+            now = datetime.utcnow()
+            for task in pending_tasks:
+                task.status = TaskStatus.CANCELLED
+                task.message = message
+                task.completed_at = now
+            db.commit()
+            for cancelled_task_id in cancelled:
+                self._invalidate_task(cancelled_task_id)
+            if cancelled:
+                logger.info(f"取消工作流任务: task_id={task_id}, cancelled={cancelled}")
+            return cancelled
+        except Exception as e:
+            db.rollback()
+            logger.error(f"取消工作流任务失败: {str(e)}", exc_info=True)
+            raise
+        finally:
+            db.close()
 
     def get_task_relation(self, task_id: str, relation_type: str) -> Optional[str]:
         """获取任务关联关系
@@ -184,7 +286,7 @@ class TaskManager:
         Returns:
             关联的任务ID，如果不存在返回 None
         """
-        db = self._get_db()
+        db = SessionLocal()
         try:
             relation = (
                 db.query(TaskRelation)
@@ -199,7 +301,38 @@ class TaskManager:
             return None
         finally:
             db.close()
-            self._db = None
+
+    def get_task_with_relations(
+        self, task_id: str
+    ) -> Optional[tuple[TaskResponse, dict[str, TaskResponse]]]:
+        """获取任务及其所有关联任务（一次 JOIN 查询）
+
+        Args:
+            task_id: 主任务ID
+
+        Returns:
+            (主任务, {关联类型: 关联任务})，主任务不存在时返回 None
+        """
+        db = SessionLocal()
+        try:
+            stmt = (
+                select(Task)
+                .options(
+                    joinedload(Task.relations).joinedload(TaskRelation.related_task)
+                )
+                .where(Task.task_id == task_id)
+            )
+            task = db.execute(stmt).unique().scalars().one_or_none()
+            if task is None:
+                return None
+            related_tasks = {
+                relation.relation_type: _task_to_response(relation.related_task)
+                for relation in task.relations
+                if relation.related_task is not None
+            }
+            return _task_to_response(task), related_tasks
+        finally:
+            db.close()
 
 
 # 全局单例实例
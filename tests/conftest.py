@@ -6,8 +6,13 @@ from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
+from app.database.base import Base
+from app.services import task_manager as task_manager_module
 
 
 @pytest.fixture
@@ -16,6 +21,21 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def task_db(monkeypatch):
+    """使用内存 SQLite 数据库替换 TaskManager 的会话工厂，返回该会话工厂"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(task_manager_module, "SessionLocal", session_factory)
+    yield session_factory
+    engine.dispose()
+
+
 @pytest.fixture
 def temp_dir():
     """创建临时目录"""
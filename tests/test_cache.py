@@ -0,0 +1,110 @@
+"""
+缓存工具测试
+"""
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from app.core.utils.cache import _dumps_value, _loads_value, generate_cache_key
+
+
+@dataclass
+class _Segment:
+    text: str
+    start: int
+
+
+class TestCacheValueSerialization:
+    """缓存值序列化测试类"""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            None,
+            "字幕",
+            0,
+            -1.5,
+            True,
+            [1, "a", None],
+            {"text": "hello", "words": [{"start": 0, "end": 1.2}]},
+        ],
+    )
+    def test_json_native_round_trip(self, value):
+        """测试 JSON 原生值以 J 标记写入并原样读回"""
+        data = _dumps_value(value)
+        assert data[:1] == b"J"
+        result = _loads_value(data)
+        assert result == value
+        assert type(result) is type(value)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            (1, 2),
+            [1, (2, 3)],
+            {"pair": ("a", "b")},
+            {1: "int key"},
+            _Segment(text="hello", start=1),
+            2**64,
+        ],
+    )
+    def test_pickle_round_trip(self, value):
+        """测试 orjson 无法原样往返的值以 P 标记写入并原样读回"""
+        data = _dumps_value(value)
+        assert data[:1] == b"P"
+        assert _loads_value(data) == value
+
+    def test_tuple_is_not_turned_into_list(self):
+        """测试 tuple 回退到 pickle，读回后仍是 tuple"""
+        result = _loads_value(_dumps_value(("a", 1)))
+        assert result == ("a", 1)
+        assert type(result) is tuple
+
+    def test_legacy_bare_pickle(self):
+        """测试读取加标记之前写入的裸 pickle 值"""
+        value = {"segments": [("a", 1)], "text": "hello"}
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        assert data[:1] == b"\x80"
+        assert _loads_value(data) == value
+
+    def test_unknown_marker(self):
+        """测试未知格式标记抛出 ValueError"""
+        with pytest.raises(ValueError):
+            _loads_value(b"X{}")
+
+
+class TestGenerateCacheKey:
+    """缓存键生成测试类"""
+
+    def test_deterministic(self):
+        """测试相同数据生成相同的键"""
+        data = {"text": "hello", "segments": [_Segment(text="a", start=0)]}
+        assert generate_cache_key(data) == generate_cache_key(data)
+        assert len(generate_cache_key(data)) == 32
+
+    def test_distinct_values(self):
+        """测试字符串、整数、浮点数、布尔值及拼接后相同的列表生成不同的键"""
+        values = ["1", 1, 1.0, True, ["a", "b"], ["ab"]]
+        keys = {generate_cache_key(value) for value in values}
+        assert len(keys) == len(values)
+
+    def test_dict_key_order_ignored(self):
+        """测试字典键的顺序不影响生成的键"""
+        first = {"a": 1, "b": {"x": [1, 2], "y": None}}
+        second = {"b": {"y": None, "x": [1, 2]}, "a": 1}
+        assert generate_cache_key(first) == generate_cache_key(second)
+
+    def test_dataclass(self):
+        """测试 dataclass 按字段内容生成键"""
+        assert generate_cache_key(_Segment("a", 0)) == generate_cache_key(
+            _Segment("a", 0)
+        )
+        assert generate_cache_key(_Segment("a", 0)) != generate_cache_key(
+            _Segment("a", 1)
+        )
+
+    def test_unsupported_type(self):
+        """测试不支持的类型抛出 TypeError"""
+        with pytest.raises(TypeError):
+            generate_cache_key({"value": object()})
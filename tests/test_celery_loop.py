@@ -0,0 +1,47 @@
+"""
+Celery worker 事件循环测试
+"""
+import asyncio
+
+import pytest
+
+from app.celery.loop import close_loop, get_loop, run
+
+
+class TestWorkerLoop:
+    """worker 事件循环测试类"""
+
+    def teardown_method(self):
+        close_loop()
+
+    def test_run_cancels_leftover_tasks(self):
+        """测试协程失败后，gather 中遗留的兄弟协程被取消，不会带入下一个任务"""
+        cancelled = []
+
+        async def sibling():
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("失败")
+
+        async def job():
+            await asyncio.gather(sibling(), failing())
+
+        with pytest.raises(RuntimeError):
+            run(job())
+
+        assert cancelled == [True]
+        assert not asyncio.all_tasks(get_loop())
+
+    def test_run_reuses_loop(self):
+        """测试多次运行复用同一个事件循环"""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert run(current_loop()) is run(current_loop())
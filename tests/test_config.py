@@ -0,0 +1,141 @@
+"""
+配置读取测试
+"""
+from pathlib import Path
+
+import pytest
+
+from app.config import Settings, _parse_bool, _read_env_file
+
+
+@pytest.fixture
+def env_file(temp_dir):
+    """写入 .env 文件并返回其路径"""
+
+    def write(content: str) -> str:
+        path = temp_dir / ".env"
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+class TestReadEnvFile:
+    """.env 文件解析测试类"""
+
+    def test_missing_file(self, temp_dir):
+        """测试文件不存在时返回空字典"""
+        assert _read_env_file(str(temp_dir / "missing.env")) == {}
+
+    def test_basic_values(self, env_file):
+        """测试普通键值、键名转小写，忽略空行、注释行和无等号的行"""
+        path = env_file(
+            "# 注释\n"
+            "\n"
+            "LOG_LEVEL=DEBUG\n"
+            "  Redis_Url = redis://redis:6379/0  \n"
+            "NOT_A_PAIR\n"
+        )
+        assert _read_env_file(path) == {
+            "log_level": "DEBUG",
+            "redis_url": "redis://redis:6379/0",
+        }
+
+    def test_quoted_values(self, env_file):
+        """测试引号包裹的值去掉引号，且引号内的 # 不视为注释"""
+        path = env_file(
+            "DOUBLE=\"hello world\"\n"
+            "SINGLE='a # not a comment'\n"
+            "EMPTY=\"\"\n"
+            "UNBALANCED=\"abc\n"
+        )
+        assert _read_env_file(path) == {
+            "double": "hello world",
+            "single": "a # not a comment",
+            "empty": "",
+            "unbalanced": "\"abc",
+        }
+
+    def test_inline_comments(self, env_file):
+        """测试只有 ' #' 开头的行尾注释被去掉"""
+        path = env_file(
+            "LOG_LEVEL=INFO # 日志级别\n"
+            "API_KEY=abc#123\n"
+        )
+        assert _read_env_file(path) == {"log_level": "INFO", "api_key": "abc#123"}
+
+    def test_export_prefix(self, env_file):
+        """测试支持 export 前缀"""
+        path = env_file("export LOG_LEVEL=WARNING\nexport  MODEL='large-v3'\n")
+        assert _read_env_file(path) == {"log_level": "WARNING", "model": "large-v3"}
+
+
+class TestParseBool:
+    """布尔值解析测试类"""
+
+    @pytest.mark.parametrize("value", ["1", "true", "True", "YES", "y", "on", " t "])
+    def test_true_values(self, value):
+        """测试真值"""
+        assert _parse_bool(value) is True
+
+    @pytest.mark.parametrize("value", ["0", "false", "FALSE", "no", "n", "off", "f"])
+    def test_false_values(self, value):
+        """测试假值"""
+        assert _parse_bool(value) is False
+
+    @pytest.mark.parametrize("value", ["", "2", "enabled", "nope"])
+    def test_invalid_values(self, value):
+        """测试无效的布尔值抛出 ValueError"""
+        with pytest.raises(ValueError):
+            _parse_bool(value)
+
+
+class TestSettingsFromEnv:
+    """Settings.from_env 测试类"""
+
+    @pytest.fixture(autouse=True)
+    def clear_env(self, monkeypatch):
+        """清除会影响断言的环境变量"""
+        for name in (
+            "LOG_LEVEL",
+            "MINIO_SECURE",
+            "MAX_WORD_COUNT_CJK",
+            "WORK_DIR",
+            "WHISPERX_PRELOAD",
+        ):
+            monkeypatch.delenv(name, raising=False)
+
+    def test_defaults(self, temp_dir):
+        """测试没有 .env 和环境变量时使用字段默认值"""
+        settings = Settings.from_env(str(temp_dir / "missing.env"))
+        assert settings.log_level == "INFO"
+        assert settings.minio_secure is False
+        assert settings.max_word_count_cjk == 25
+
+    def test_type_conversion(self, env_file):
+        """测试按字段类型转换 .env 中的值"""
+        path = env_file(
+            "MINIO_SECURE=true\n"
+            "MAX_WORD_COUNT_CJK=30\n"
+            "WORK_DIR=/data/workspace\n"
+        )
+        settings = Settings.from_env(path)
+        assert settings.minio_secure is True
+        assert settings.max_word_count_cjk == 30
+        assert settings.work_dir == Path("/data/workspace")
+
+    def test_environment_overrides_env_file(self, env_file, monkeypatch):
+        """测试环境变量优先于 .env 文件，且环境变量名不区分大小写"""
+        path = env_file("LOG_LEVEL=INFO\nMAX_WORD_COUNT_CJK=30\n")
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        monkeypatch.setenv("max_word_count_cjk", "40")
+
+        settings = Settings.from_env(path)
+        assert settings.log_level == "DEBUG"
+        assert settings.max_word_count_cjk == 40
+
+    def test_invalid_bool_names_field(self, env_file):
+        """测试无效的布尔值报错信息包含配置项名称"""
+        path = env_file("WHISPERX_PRELOAD=maybe\n")
+        with pytest.raises(ValueError, match="WHISPERX_PRELOAD"):
+            Settings.from_env(path)
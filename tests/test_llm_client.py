@@ -0,0 +1,43 @@
+"""
+LLM 客户端测试
+"""
+import asyncio
+
+import pytest
+
+from app.core.llm.client import get_async_llm_client, normalize_base_url
+
+
+class TestAsyncLLMClient:
+    """异步 LLM 客户端测试类"""
+
+    @pytest.fixture(autouse=True)
+    def llm_env(self, monkeypatch):
+        """设置客户端所需的环境变量"""
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:8000")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    def test_client_shared_within_loop(self):
+        """测试同一事件循环内复用同一个客户端"""
+
+        async def get_clients():
+            return get_async_llm_client(), get_async_llm_client()
+
+        first, second = asyncio.run(get_clients())
+        assert first is second
+        assert str(first.base_url).rstrip("/") == normalize_base_url(
+            "http://localhost:8000"
+        )
+
+    def test_client_per_loop(self):
+        """测试事件循环关闭并重建后使用新的客户端，不复用绑定旧循环的连接"""
+
+        async def get_client():
+            return get_async_llm_client()
+
+        assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+    def test_requires_running_loop(self):
+        """测试没有运行中的事件循环时报错"""
+        with pytest.raises(RuntimeError):
+            get_async_llm_client()
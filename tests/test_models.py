@@ -0,0 +1,97 @@
+"""
+数据库模型测试
+"""
+import pytest
+from sqlalchemy import text
+
+from app.core.constants import RelationType, TaskType
+from app.database.models import RelationKind, RelationTypeColumn, TaskRelation
+from app.services.task_manager import get_task_manager
+
+
+class TestRelationTypeColumn:
+    """关联类型列测试类"""
+
+    @pytest.mark.parametrize(
+        "relation_type, kind",
+        [
+            (RelationType.TRANSCRIBE, RelationKind.TRANSCRIBE),
+            (RelationType.VIDEO, RelationKind.VIDEO),
+            (RelationType.SUBTITLE, RelationKind.SUBTITLE),
+        ],
+    )
+    def test_bind_and_result(self, relation_type, kind):
+        """测试写入时转换为编码、读取时还原为 RelationType，字符串与枚举等价"""
+        column_type = RelationTypeColumn()
+
+        assert column_type.process_bind_param(relation_type, None) == int(kind)
+        assert column_type.process_bind_param(relation_type.value, None) == int(kind)
+
+        value = column_type.process_result_value(int(kind), None)
+        assert value is relation_type
+        assert value == relation_type.value
+
+    def test_none_passthrough(self):
+        """测试 None 原样传递"""
+        column_type = RelationTypeColumn()
+        assert column_type.process_bind_param(None, None) is None
+        assert column_type.process_result_value(None, None) is None
+
+    def test_unknown_type_rejected(self):
+        """测试未知的关联类型不会被写入"""
+        with pytest.raises(ValueError):
+            RelationTypeColumn().process_bind_param("unknown_task_id", None)
+
+    def test_database_round_trip(self, task_db):
+        """测试数据库中存储为整数编码，ORM 读取为 RelationType"""
+        task_manager = get_task_manager()
+        video_task_id = task_manager.create_task(task_type=TaskType.VIDEO_DOWNLOAD)
+        subtitle_task_id = task_manager.create_task(task_type=TaskType.SUBTITLE)
+        task_manager.set_task_relations(
+            video_task_id, {"subtitle_task_id": subtitle_task_id}
+        )
+
+        with task_db() as db:
+            stored = db.execute(
+                text("SELECT relation_type FROM task_relations WHERE task_id = :id"),
+                {"id": video_task_id},
+            ).scalar_one()
+            assert stored == int(RelationKind.SUBTITLE)
+
+            relation = db.query(TaskRelation).filter_by(task_id=video_task_id).one()
+            assert relation.relation_type is RelationType.SUBTITLE
+
+        assert (
+            task_manager.get_task_relation(video_task_id, RelationType.SUBTITLE)
+            == subtitle_task_id
+        )
+
+
+class TestTaskWithRelations:
+    """任务及关联任务查询测试类"""
+
+    def test_relation_keys(self, task_db):
+        """测试返回的关联字典以 RelationType 为键，也可以用原字符串查找"""
+        task_manager = get_task_manager()
+        video_task_id = task_manager.create_task(task_type=TaskType.VIDEO_DOWNLOAD)
+        transcribe_task_id = task_manager.create_task(task_type=TaskType.TRANSCRIBE)
+        subtitle_task_id = task_manager.create_task(task_type=TaskType.SUBTITLE)
+        task_manager.set_task_relations(
+            video_task_id,
+            {
+                RelationType.TRANSCRIBE: transcribe_task_id,
+                RelationType.SUBTITLE: subtitle_task_id,
+            },
+        )
+
+        task, related_tasks = task_manager.get_task_with_relations(video_task_id)
+
+        assert task.task_id == video_task_id
+        assert set(related_tasks) == {RelationType.TRANSCRIBE, RelationType.SUBTITLE}
+        assert all(type(key) is RelationType for key in related_tasks)
+        assert related_tasks[RelationType.TRANSCRIBE].task_id == transcribe_task_id
+        assert related_tasks["subtitle_task_id"].task_id == subtitle_task_id
+
+    def test_missing_task(self, task_db):
+        """测试主任务不存在时返回 None"""
+        assert get_task_manager().get_task_with_relations("missing") is None
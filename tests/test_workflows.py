@@ -0,0 +1,74 @@
+"""
+视频分析工作流测试
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.celery import workflows
+from app.celery.tasks import transcribe_tasks
+from app.core.constants import RelationType, TaskStatus, TaskType
+from app.services.task_manager import get_task_manager
+
+
+@pytest.fixture
+def workflow_tasks(task_db, monkeypatch):
+    """创建一个视频分析工作流（不投递 Celery 任务），返回各步骤的任务ID"""
+    monkeypatch.setattr(
+        workflows, "chain", lambda *tasks: SimpleNamespace(apply_async=lambda: None)
+    )
+    task_manager = get_task_manager()
+    video_task_id = task_manager.create_task(task_type=TaskType.VIDEO_DOWNLOAD)
+    workflows.start_analyze_workflow(video_task_id, "https://example.com/video")
+
+    _, related_tasks = task_manager.get_task_with_relations(video_task_id)
+    return (
+        video_task_id,
+        related_tasks[RelationType.TRANSCRIBE].task_id,
+        related_tasks[RelationType.SUBTITLE].task_id,
+    )
+
+
+class TestWorkflowFailure:
+    """工作流步骤失败测试类"""
+
+    def test_transcribe_failure_cancels_subtitle_task(
+        self, workflow_tasks, monkeypatch
+    ):
+        """测试转录重试次数用尽后，预先创建的字幕任务被取消"""
+        _, transcribe_task_id, subtitle_task_id = workflow_tasks
+
+        async def failing_transcribe(task_id, request):
+            raise RuntimeError("转录失败")
+
+        monkeypatch.setattr(
+            transcribe_tasks.transcribe_service,
+            "process_transcribe_task",
+            failing_transcribe,
+        )
+
+        # 直接从最后一次重试开始执行，失败后不再重试
+        transcribe_task = transcribe_tasks.transcribe_task
+        result = transcribe_task.apply(
+            args=(transcribe_task_id, {}), retries=transcribe_task.max_retries
+        )
+        assert result.failed()
+
+        task_manager = get_task_manager()
+        assert task_manager.get_task(transcribe_task_id).status == TaskStatus.FAILED
+        subtitle_task = task_manager.get_task(subtitle_task_id)
+        assert subtitle_task.status == TaskStatus.CANCELLED
+        assert "转录失败" in subtitle_task.message
+
+    def test_cancel_leaves_finished_tasks_untouched(self, workflow_tasks):
+        """测试取消只影响仍处于 pending 的任务"""
+        video_task_id, transcribe_task_id, subtitle_task_id = workflow_tasks
+        task_manager = get_task_manager()
+        task_manager.update_task(transcribe_task_id, status=TaskStatus.COMPLETED)
+
+        cancelled = task_manager.cancel_pending_workflow_tasks(video_task_id, "取消")
+
+        assert cancelled == [subtitle_task_id]
+        assert (
+            task_manager.get_task(transcribe_task_id).status == TaskStatus.COMPLETED
+        )